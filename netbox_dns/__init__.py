@@ -16,11 +16,25 @@ class DNSConfig(PluginConfig):
         "zone_default_ttl": 86400,
         "zone_soa_serial_auto": True,
         "zone_soa_serial": 1,
+        "zone_soa_serial_scheme": "epoch",
         "zone_soa_refresh": 172800,
         "zone_soa_retry": 7200,
         "zone_soa_expire": 2592000,
         "zone_soa_minimum": 3600,
         "feature_ipam_integration": False,
+        "feature_ipam_provisioning": False,
+        "ipam_provisioning_views": {},
+        "bulk_import_threshold": 1000,
+        "zone_cache_timeout": 300,
+        "feature_metrics": False,
+        "instrumentation_hooks": [],
+        "feature_profiling": False,
+        "profiling_dir": None,
+        "resolver_cache_size": 256,
+        "resolver_max_queries": 10000,
+        "lookup_max_queries": 100000,
+        "dnssec_keys": {},
+        "dnssec_signature_lifetime": 1209600,
         "tolerate_underscores_in_hostnames": False,
         "tolerate_leading_underscore_types": [
             "TXT",
@@ -29,6 +43,14 @@ class DNSConfig(PluginConfig):
         "tolerate_non_rfc1035_types": [],
     }
     base_url = "netbox-dns"
+    middleware = [
+        "netbox_dns.middleware.ProfilingMiddleware",
+    ]
+
+    def ready(self):
+        super().ready()
+
+        import netbox_dns.signals
 
 
 config = DNSConfig
@@ -1,5 +1,10 @@
+from dns import name as dns_name
+from dns import rdatatype
+from dns.exception import DNSException
+from netaddr import AddrFormatError, IPNetwork
 from rest_framework import serializers
 
+from extras.plugins import get_plugin_config
 from netbox.api.serializers import NetBoxModelSerializer
 
 from netbox_dns.api.nested_serializers import (
@@ -8,7 +13,7 @@ from netbox_dns.api.nested_serializers import (
     NestedNameServerSerializer,
     NestedRecordSerializer,
 )
-from netbox_dns.models import View, Zone, NameServer, Record
+from netbox_dns.models import View, Zone, ZoneSnapshot, NameServer, Record
 
 
 class ViewSerializer(NetBoxModelSerializer):
@@ -62,7 +67,7 @@ class ZoneSerializer(NetBoxModelSerializer):
         zone = super().create(validated_data)
 
         if nameservers is not None:
-            zone.nameservers.set(nameservers)
+            zone.set_nameservers(nameservers)
 
         return zone
 
@@ -72,7 +77,7 @@ class ZoneSerializer(NetBoxModelSerializer):
         zone = super().update(instance, validated_data)
 
         if nameservers is not None:
-            zone.nameservers.set(nameservers)
+            zone.set_nameservers(nameservers)
 
         return zone
 
@@ -105,6 +110,180 @@ class ZoneSerializer(NetBoxModelSerializer):
         )
 
 
+class ZoneFileExportSerializer(serializers.Serializer):
+    sign = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Sign the zone with the DNSSEC keys configured for it",
+    )
+
+
+class ZoneFileImportSerializer(serializers.Serializer):
+    zonefile = serializers.CharField(
+        help_text="Contents of the zone file in DNS master file format",
+        trim_whitespace=False,
+    )
+    name = serializers.CharField(
+        required=False,
+        help_text="Name of the zone, if not defined by $ORIGIN in the zone file",
+    )
+    view = serializers.PrimaryKeyRelatedField(
+        queryset=View.objects.all(),
+        required=False,
+        default=None,
+        help_text="View the zone belongs to",
+    )
+
+
+class ZoneSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ZoneSnapshot
+        fields = ("id", "serial", "created", "record_count")
+
+
+class ZoneDiffSerializer(serializers.Serializer):
+    old_serial = serializers.IntegerField(
+        help_text="SOA serial of the snapshot to compare",
+    )
+    new_serial = serializers.IntegerField(
+        required=False,
+        default=None,
+        help_text="SOA serial of the snapshot to compare with, the default is the current records",
+    )
+
+
+class ZoneRestoreSerializer(serializers.Serializer):
+    serial = serializers.IntegerField(
+        help_text="SOA serial of the snapshot to restore the zone to",
+    )
+
+
+class PrefixCoverageSerializer(serializers.Serializer):
+    prefix = serializers.CharField(
+        help_text="Prefix to report the reverse zone coverage for",
+    )
+    view = serializers.PrimaryKeyRelatedField(
+        queryset=View.objects.all(),
+        required=False,
+        default=None,
+        help_text="View of the reverse zones, the default is zones without a view",
+    )
+
+    def validate_prefix(self, value):
+        try:
+            return IPNetwork(value).cidr
+        except (AddrFormatError, ValueError):
+            raise serializers.ValidationError(f"{value} is not a valid prefix")
+
+
+class ReverseZonesSerializer(serializers.Serializer):
+    prefix = serializers.CharField(
+        help_text="Prefix to create the reverse zones for",
+    )
+    prefix_length = serializers.IntegerField(
+        required=False,
+        default=None,
+        min_value=1,
+        max_value=128,
+        help_text="Minimum prefix length of the reverse zones, rounded up to an octet or nibble boundary",
+    )
+    view = serializers.PrimaryKeyRelatedField(
+        queryset=View.objects.all(),
+        required=False,
+        default=None,
+        help_text="View of the reverse zones, the default is zones without a view",
+    )
+    nameservers = serializers.PrimaryKeyRelatedField(
+        queryset=NameServer.objects.all(),
+        many=True,
+        required=False,
+        default=None,
+        help_text="Nameservers for the reverse zones, the default is the zone_nameservers setting",
+    )
+
+    def validate_prefix(self, value):
+        try:
+            return IPNetwork(value).cidr
+        except (AddrFormatError, ValueError):
+            raise serializers.ValidationError(f"{value} is not a valid prefix")
+
+
+class ResolveQuerySerializer(serializers.Serializer):
+    name = serializers.CharField(
+        help_text="Name to resolve",
+    )
+    type = serializers.CharField(
+        required=False,
+        default="A",
+        help_text="Record type to resolve",
+    )
+
+    def validate_name(self, value):
+        try:
+            return dns_name.from_text(value)
+        except DNSException as exc:
+            raise serializers.ValidationError(f"{value} is not a valid name: {exc}")
+
+    def validate_type(self, value):
+        try:
+            return rdatatype.from_text(value)
+        except DNSException:
+            raise serializers.ValidationError(f"{value} is not a valid record type")
+
+
+class ResolveSerializer(serializers.Serializer):
+    view = serializers.PrimaryKeyRelatedField(
+        queryset=View.objects.all(),
+        required=False,
+        default=None,
+        help_text="View to resolve the names in, the default is zones without a view",
+    )
+    queries = ResolveQuerySerializer(
+        many=True,
+        help_text="Names and record types to resolve",
+    )
+
+    def validate_queries(self, value):
+        max_queries = get_plugin_config("netbox_dns", "resolver_max_queries")
+        if len(value) > max_queries:
+            raise serializers.ValidationError(
+                f"At most {max_queries} queries can be resolved at once"
+            )
+
+        return value
+
+
+class RecordLookupSerializer(serializers.Serializer):
+    view = serializers.PrimaryKeyRelatedField(
+        queryset=View.objects.all(),
+        required=False,
+        default=None,
+        allow_null=True,
+        help_text="View to look up the names and addresses in, the default is all views",
+    )
+    names = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        default=list,
+        help_text="Fully qualified names to look up",
+    )
+    addresses = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        default=list,
+        help_text="IP addresses to look up",
+    )
+
+    def validate(self, data):
+        max_queries = get_plugin_config("netbox_dns", "lookup_max_queries")
+        if len(data["names"]) + len(data["addresses"]) > max_queries:
+            raise serializers.ValidationError(
+                f"At most {max_queries} names and addresses can be looked up at once"
+            )
+
+        return data
+
+
 class NameServerSerializer(NetBoxModelSerializer):
     url = serializers.HyperlinkedIdentityField(
         view_name="plugins-api:netbox_dns-api:nameserver-detail"
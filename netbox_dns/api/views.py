@@ -1,18 +1,56 @@
-from rest_framework import serializers
+import logging
+
+from itertools import chain
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Count, Prefetch, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+
+from rest_framework import serializers, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.response import Response
 from rest_framework.routers import APIRootView
+from rest_framework.utils.encoders import JSONEncoder
 
+from netbox.api.authentication import (
+    IsAuthenticatedOrLoginNotRequired,
+    TokenPermissions,
+)
 from netbox.api.viewsets import NetBoxModelViewSet
 
+from netbox_dns.api.nested_serializers import (
+    NestedRecordSerializer,
+    NestedZoneSerializer,
+)
 from netbox_dns.api.serializers import (
     ViewSerializer,
     ZoneSerializer,
+    ZoneFileExportSerializer,
+    ZoneFileImportSerializer,
+    ZoneDiffSerializer,
+    ZoneRestoreSerializer,
+    ZoneSnapshotSerializer,
+    PrefixCoverageSerializer,
+    RecordLookupSerializer,
+    ReverseZonesSerializer,
+    ResolveSerializer,
     NameServerSerializer,
     RecordSerializer,
 )
+from netbox_dns.dnssec import ZoneSigner
 from netbox_dns.filters import ViewFilter, ZoneFilter, NameServerFilter, RecordFilter
-from netbox_dns.models import View, Zone, NameServer, Record
+from netbox_dns.importer import create_reverse_zones
+from netbox_dns.lookup import RecordLookup
+from netbox_dns.models import View, Zone, ZoneSnapshot, NameServer, Record
+from netbox_dns.resolver import Resolver
+from netbox_dns.snapshot import SnapshotRestorer, create_snapshot, diff_zone
+from netbox_dns.utilities import get_prefix_gaps
+from netbox_dns.zonefile import ZoneFileExporter, ZoneFileImporter
+
+
+logger = logging.getLogger("netbox_dns")
 
 
 class NetboxDNSRootView(APIRootView):
@@ -25,7 +63,7 @@ class NetboxDNSRootView(APIRootView):
 
 
 class ViewViewSet(NetBoxModelViewSet):
-    queryset = View.objects.all()
+    queryset = View.objects.all().prefetch_related("tags")
     serializer_class = ViewSerializer
     filterset_class = ViewFilter
 
@@ -36,9 +74,22 @@ class ViewViewSet(NetBoxModelViewSet):
         return Response(serializer.data)
 
 
+class ZoneChangePermissions(TokenPermissions):
+    """
+    Permissions for POST actions that change an existing zone: they require
+    the permission to change zones instead of adding them, and like all
+    write requests an API token with write access
+    """
+
+    perms_map = {
+        **TokenPermissions.perms_map,
+        "POST": ["%(app_label)s.change_%(model_name)s"],
+    }
+
+
 class ZoneViewSet(NetBoxModelViewSet):
     queryset = Zone.objects.all().prefetch_related(
-        "view", "nameservers", "tags", "soa_mname", "record_set"
+        "view", "nameservers", "tags", "soa_mname"
     )
     serializer_class = ZoneSerializer
     filterset_class = ZoneFilter
@@ -57,9 +108,242 @@ class ZoneViewSet(NetBoxModelViewSet):
         )
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def zonefile(self, request, pk=None):
+        zone = self.get_object()
+
+        serializer = ZoneFileExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        signer = None
+        if serializer.validated_data["sign"]:
+            try:
+                signer = ZoneSigner(zone)
+            except ImproperlyConfigured as exc:
+                logger.error(str(exc))
+                raise serializers.ValidationError(
+                    {"sign": f"The DNSSEC keys for zone {zone} cannot be loaded"}
+                )
+            if not signer.keys:
+                raise serializers.ValidationError(
+                    {"sign": f"No DNSSEC keys are configured for zone {zone}"}
+                )
+
+        return HttpResponse(
+            ZoneFileExporter(zone, signer=signer, user=request.user).to_text(),
+            content_type="text/dns; charset=utf-8",
+        )
+
+    @action(
+        detail=True,
+        methods=["get", "post"],
+        permission_classes=[ZoneChangePermissions],
+    )
+    def snapshots(self, request, pk=None):
+        if request.method == "POST":
+            # A snapshot at the current serial replaces an existing one
+            if not request.user.has_perm("netbox_dns.add_zonesnapshot"):
+                raise PermissionDenied(
+                    "Creating snapshots requires permission to add zone snapshots"
+                )
+
+            zone = get_object_or_404(
+                Zone.objects.restrict(request.user, "change"), pk=pk
+            )
+            return Response(
+                ZoneSnapshotSerializer(create_snapshot(zone)).data,
+                status=status.HTTP_201_CREATED,
+            )
+
+        zone = get_object_or_404(Zone.objects.restrict(request.user, "view"), pk=pk)
+        return Response(
+            ZoneSnapshotSerializer(zone.snapshots.defer("data"), many=True).data
+        )
+
+    @action(detail=True, methods=["get"])
+    def diff(self, request, pk=None):
+        zone = self.get_object()
+
+        serializer = ZoneDiffSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        old_serial = serializer.validated_data["old_serial"]
+        new_serial = serializer.validated_data["new_serial"]
+        try:
+            diff = diff_zone(zone, old_serial, new_serial)
+        except ZoneSnapshot.DoesNotExist:
+            raise NotFound("No snapshot found for the serial")
+
+        return Response(
+            {
+                "old_serial": old_serial,
+                "new_serial": new_serial,
+                **diff.to_dict(),
+            }
+        )
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[ZoneChangePermissions],
+    )
+    def restore(self, request, pk=None):
+        if not request.user.has_perms(
+            (
+                "netbox_dns.add_record",
+                "netbox_dns.change_record",
+                "netbox_dns.delete_record",
+            )
+        ):
+            raise PermissionDenied(
+                "Restoring a zone requires the permissions to add, change and delete records"
+            )
+
+        zone = get_object_or_404(Zone.objects.restrict(request.user, "change"), pk=pk)
+
+        serializer = ZoneRestoreSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        restorer = SnapshotRestorer(zone)
+        try:
+            restorer.restore(serializer.validated_data["serial"])
+        except ZoneSnapshot.DoesNotExist:
+            raise NotFound("No snapshot found for the serial")
+
+        return Response(
+            {
+                "soa_serial": zone.soa_serial,
+                "created": restorer.created,
+                "updated": restorer.updated,
+                "deleted": restorer.deleted,
+            }
+        )
+
+    @action(detail=False, methods=["post"], url_path="import-zonefile")
+    def import_zonefile(self, request):
+        if not request.user.has_perm("netbox_dns.add_record"):
+            raise PermissionDenied(
+                "Importing a zone requires permission to add records"
+            )
+
+        serializer = ZoneFileImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        importer = ZoneFileImporter(
+            origin=serializer.validated_data.get("name"),
+            view=serializer.validated_data.get("view"),
+        )
+        try:
+            zone = importer.import_zonefile(serializer.validated_data["zonefile"])
+        except ValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+
+        zone = self.get_queryset().get(pk=zone.pk)
+        return Response(
+            ZoneSerializer(zone, context={"request": request}).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=["get"], url_path="prefix-coverage")
+    def prefix_coverage(self, request):
+        serializer = PrefixCoverageSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        prefix = serializer.validated_data["prefix"]
+        view = serializer.validated_data["view"]
+
+        zones = list(
+            Zone.objects.restrict(request.user, "view")
+            .filter(
+                Q(arpa_network__net_contains_or_equals=prefix)
+                | Q(arpa_network__net_contained=prefix),
+                view=view,
+            )
+            .select_related("view")
+            .order_by("arpa_network")
+        )
+        gaps = get_prefix_gaps(prefix, [zone.arpa_network for zone in zones])
+
+        record_counts = (
+            Record.objects.restrict(request.user, "view")
+            .filter(ip_address__net_contained_or_equal=prefix, zone__view=view)
+            .values("type")
+            .annotate(count=Count("pk"))
+        )
+
+        return Response(
+            {
+                "prefix": str(prefix),
+                "view": view.pk if view is not None else None,
+                "zones": NestedZoneSerializer(
+                    zones, many=True, context={"request": request}
+                ).data,
+                "gaps": [str(gap) for gap in gaps],
+                "uncovered_addresses": sum(gap.size for gap in gaps),
+                "records": {entry["type"]: entry["count"] for entry in record_counts},
+            }
+        )
+
+    @action(detail=False, methods=["post"], url_path="reverse-zones")
+    def reverse_zones(self, request):
+        serializer = ReverseZonesSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        nameservers = serializer.validated_data["nameservers"]
+        try:
+            zones = create_reverse_zones(
+                serializer.validated_data["prefix"],
+                prefixlen=serializer.validated_data["prefix_length"],
+                view=serializer.validated_data["view"],
+                nameservers=(
+                    [nameserver.name for nameserver in nameservers]
+                    if nameservers is not None
+                    else None
+                ),
+                user=request.user,
+                request_id=getattr(request, "id", None),
+            )
+        except ValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+
+        return Response(
+            NestedZoneSerializer(zones, many=True, context={"request": request}).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticatedOrLoginNotRequired],
+    )
+    def resolve(self, request):
+        if not request.user.has_perm("netbox_dns.view_record"):
+            raise PermissionDenied(
+                "Resolving names requires permission to view records"
+            )
+
+        serializer = ResolveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        resolver = Resolver(
+            view=serializer.validated_data["view"],
+            zones=Zone.objects.restrict(request.user, "view"),
+            user=request.user,
+        )
+        resolutions = resolver.resolve_many(
+            (query["name"], query["type"])
+            for query in serializer.validated_data["queries"]
+        )
+
+        return Response(
+            {"results": [resolution.to_dict() for resolution in resolutions]}
+        )
+
 
 class NameServerViewSet(NetBoxModelViewSet):
-    queryset = NameServer.objects.all().prefetch_related("zones")
+    queryset = NameServer.objects.all().prefetch_related(
+        Prefetch("zones", queryset=Zone.objects.select_related("view")), "tags"
+    )
     serializer_class = NameServerSerializer
     filterset_class = NameServerFilter
 
@@ -71,7 +355,12 @@ class NameServerViewSet(NetBoxModelViewSet):
 
 
 class RecordViewSet(NetBoxModelViewSet):
-    queryset = Record.objects.all().prefetch_related("zone", "zone__view")
+    queryset = Record.objects.all().prefetch_related(
+        "zone__view",
+        "ptr_record__zone__view",
+        "address_record__zone__view",
+        "tags",
+    )
     serializer_class = RecordSerializer
     filterset_class = RecordFilter
 
@@ -90,3 +379,54 @@ class RecordViewSet(NetBoxModelViewSet):
             raise serializers.ValidationError(f"{v_object} is managed, refusing update")
 
         return super().update(request, *args, **kwargs)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticatedOrLoginNotRequired],
+    )
+    def lookup(self, request):
+        if not request.user.has_perm("netbox_dns.view_record"):
+            raise PermissionDenied(
+                "Looking up records requires permission to view records"
+            )
+
+        serializer = RecordLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        lookup = RecordLookup(view=serializer.validated_data["view"], user=request.user)
+        results = chain(
+            lookup.lookup_names(serializer.validated_data["names"]),
+            lookup.lookup_addresses(serializer.validated_data["addresses"]),
+        )
+
+        return StreamingHttpResponse(
+            self.stream_lookup_results(results, request),
+            content_type="application/json",
+        )
+
+    @staticmethod
+    def stream_lookup_results(results, request):
+        context = {"request": request}
+        encoder = JSONEncoder()
+
+        yield '{"results": ['
+        for index, result in enumerate(results):
+            data = {
+                "query": result.query,
+                "type": result.query_type,
+                "zones": NestedZoneSerializer(
+                    result.zones, many=True, context=context
+                ).data,
+                "records": NestedRecordSerializer(
+                    result.records, many=True, context=context
+                ).data,
+                "ptr_records": NestedRecordSerializer(
+                    result.ptr_records, many=True, context=context
+                ).data,
+            }
+            if result.error is not None:
+                data["error"] = result.error
+
+            yield f"{',' if index else ''}{encoder.encode(data)}"
+        yield "]}"
@@ -0,0 +1,23 @@
+from rest_framework.exceptions import AuthenticationFailed
+
+from netbox.api.authentication import TokenAuthentication
+
+
+def get_user(request):
+    """
+    Return the logged in user of a request or, for requests authenticated
+    with a NetBox API token, the user of the token. Returns None if the
+    request is not authenticated.
+    """
+    if request.user.is_authenticated:
+        return request.user
+
+    try:
+        authenticated = TokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+
+    if authenticated is None:
+        return None
+
+    return authenticated[0]
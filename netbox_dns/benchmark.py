@@ -0,0 +1,456 @@
+from statistics import median
+from time import perf_counter
+
+from netaddr import IPNetwork
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+
+from netbox_dns import __version__
+from netbox_dns.bulk import update_ptr_records
+from netbox_dns.filters import RecordFilter, ZoneFilter
+from netbox_dns.importer import RecordImporter
+from netbox_dns.management.commands import cleanup_database
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, View, Zone
+from netbox_dns.utilities import arpa_to_prefix, prefix_to_arpa_names
+from netbox_dns.validators import get_validator, validate_extended_hostname
+
+
+TRIGRAM_INDEXES = (
+    "netbox_dns_zone_name_trgm",
+    "netbox_dns_record_name_trgm",
+    "netbox_dns_record_value_trgm",
+)
+
+SEARCH_QUERIES = (
+    "host12345",
+    "10.3.7",
+    "zone42",
+    "does-not-exist",
+)
+
+
+BENCHMARKS = (
+    "search",
+    "api_list",
+    "export",
+    "name_validation",
+    "record_save",
+    "record_bulk_import",
+    "reverse_zone_save",
+    "nameserver_rename",
+    "zone_delete",
+    "cleanup_database",
+)
+
+PAGE_SIZES = (50, 250, 1000)
+
+VALIDATION_NAMES = 1000
+
+CLEANUP_PHASES = (
+    "zone_rename_passive_status_to_parked",
+    "zone_cleanup_ns_records",
+    "zone_update_soa_records",
+    "zone_update_arpa_network",
+    "record_cleanup_disable_ptr",
+    "record_update_ptr_records",
+    "record_update_ip_address",
+    "record_update_canonical_values",
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+def timed(function, iterations):
+    """Return the best wall clock time of a number of calls in milliseconds"""
+    timings = []
+    for _ in range(iterations):
+        start = perf_counter()
+        function()
+        timings.append((perf_counter() - start) * 1000)
+
+    return min(timings)
+
+
+def measure(function, iterations):
+    """
+    Call a function with the iteration number as argument and return the
+    minimum, median and maximum wall clock time in milliseconds
+    """
+    timings = []
+    for iteration in range(iterations):
+        start = perf_counter()
+        function(iteration)
+        timings.append((perf_counter() - start) * 1000)
+
+    return {
+        "min": min(timings),
+        "median": median(timings),
+        "max": max(timings),
+    }
+
+
+def get_zone_data(nameserver):
+    return {
+        "default_ttl": 86400,
+        "soa_ttl": 86400,
+        "soa_mname": nameserver,
+        "soa_rname": "hostmaster.benchmark.test",
+        "soa_serial": 1,
+        "soa_serial_auto": False,
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_minimum": 3600,
+    }
+
+
+def get_nameserver():
+    nameserver, _ = NameServer.objects.get_or_create(name="ns1.benchmark.test")
+    return nameserver
+
+
+def generate_views(count, prefix="view"):
+    return View.objects.bulk_create(
+        [View(name=f"{prefix}{index}.benchmark") for index in range(count)]
+    )
+
+
+def generate_zones(count, prefix="zone", views=None):
+    """
+    Generate forward zones, distributed round robin over no view and the
+    given views
+    """
+    zone_data = get_zone_data(get_nameserver())
+    views = [None, *(views or [])]
+
+    zones = [
+        Zone(
+            name=f"{prefix}{index}.benchmark.test",
+            view=views[index % len(views)],
+            **zone_data,
+        )
+        for index in range(count)
+    ]
+    return Zone.objects.bulk_create(zones)
+
+
+def generate_reverse_zones(count, network="10.0.0.0/8"):
+    """Generate /24 reverse zones for the first networks in a prefix"""
+    zone_data = get_zone_data(get_nameserver())
+
+    zones = [
+        Zone(name=name, arpa_network=arpa_to_prefix(name), **zone_data)
+        for name in prefix_to_arpa_names(IPNetwork(network), 24)[:count]
+    ]
+    return Zone.objects.bulk_create(zones)
+
+
+def generate_records(zones, count, ptr_count=None):
+    """
+    Generate A records with the names host<n> and consecutive addresses from
+    10.0.0.0/8, distributed round robin over the zones, in one statement.
+
+    If ptr_count is given, PTR records are disabled for all but the first
+    ptr_count records.
+    """
+    if ptr_count is None:
+        ptr_count = count
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {Record._meta.db_table} ("
+            "created, last_updated, custom_field_data, zone_id, name, type, "
+            "value, status, ttl, managed, disable_ptr, description, ip_address) "
+            "SELECT now(), now(), '{}'::jsonb, "
+            "(%s::bigint[])[1 + i %% %s], 'host' || i, 'A', v, 'active', NULL, "
+            "false, i > %s, '', v::inet "
+            "FROM generate_series(1, %s) AS i, LATERAL (SELECT "
+            "'10.' || (i >> 16 & 255) || '.' || (i >> 8 & 255) || '.' || (i & 255) "
+            "AS v) AS address",
+            [[zone.pk for zone in zones], len(zones), ptr_count, count],
+        )
+        cursor.execute(f"ANALYZE {Record._meta.db_table}")
+        cursor.execute(f"ANALYZE {Zone._meta.db_table}")
+
+
+def search_timings(queries, iterations):
+    results = {}
+
+    for query in queries:
+        records = RecordFilter({"q": query}, Record.objects.all()).qs
+        zones = ZoneFilter({"q": query}, Zone.objects.all()).qs
+
+        results[query] = {
+            "record_count": timed(records.count, iterations),
+            "record_page": timed(lambda: list(records[:50]), iterations),
+            "zone_page": timed(lambda: list(zones[:50]), iterations),
+        }
+
+    return results
+
+
+def search_benchmark(records=1000000, zones=1000, iterations=5, queries=None):
+    """
+    Measure the latency of the record and zone search filters on a synthetic
+    data set with and without the trigram indexes.
+
+    All data is generated and the indexes are dropped inside a transaction
+    that is rolled back at the end, so the database is left unchanged.
+    """
+    queries = queries or SEARCH_QUERIES
+    results = {"records": records, "zones": zones}
+
+    try:
+        with transaction.atomic():
+            generate_records(generate_zones(zones), records)
+
+            results["indexed"] = search_timings(queries, iterations)
+
+            with connection.cursor() as cursor:
+                for index in TRIGRAM_INDEXES:
+                    cursor.execute(f"DROP INDEX {index}")
+
+            results["unindexed"] = search_timings(queries, iterations)
+
+            raise Rollback
+    except Rollback:
+        pass
+
+    return results
+
+
+class DNSBenchmark:
+    """
+    Benchmark suite for the hot paths of NetBox DNS on a synthetic data set.
+
+    All data is generated and all benchmarks run inside a transaction that
+    is rolled back at the end, so the database is left unchanged. The
+    benchmarks that change data run after those that only read it.
+    """
+
+    def __init__(
+        self,
+        views=10,
+        zones=1000,
+        reverse_zones=256,
+        records=1000000,
+        ptr_records=10000,
+        iterations=5,
+        import_size=1000,
+    ):
+        self.parameters = {
+            "views": views,
+            "zones": zones,
+            "reverse_zones": reverse_zones,
+            "records": records,
+            "ptr_records": ptr_records,
+            "iterations": iterations,
+            "import_size": import_size,
+        }
+        self.iterations = iterations
+        self.import_size = import_size
+
+    def setup(self):
+        timings = {}
+
+        start = perf_counter()
+        self.nameserver = get_nameserver()
+        self.views = generate_views(self.parameters["views"])
+        self.zones = generate_zones(self.parameters["zones"], views=self.views)
+        self.reverse_zones = generate_reverse_zones(self.parameters["reverse_zones"])
+        timings["zones"] = (perf_counter() - start) * 1000
+
+        start = perf_counter()
+        generate_records(
+            self.zones, self.parameters["records"], self.parameters["ptr_records"]
+        )
+        timings["records"] = (perf_counter() - start) * 1000
+
+        start = perf_counter()
+        update_ptr_records(
+            Record.objects.filter(
+                zone__in=self.zones, zone__view__isnull=True, disable_ptr=False
+            )
+        )
+        timings["ptr_records"] = (perf_counter() - start) * 1000
+
+        self.user = get_user_model().objects.create(
+            username="dns-benchmark", is_superuser=True, is_staff=True
+        )
+        self.client = Client(HTTP_HOST=self.get_host())
+        self.client.force_login(self.user)
+
+        return timings
+
+    @staticmethod
+    def get_host():
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != "*"]
+        if not hosts:
+            return "localhost"
+
+        return hosts[0].lstrip(".")
+
+    def get(self, url):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned status {response.status_code}")
+
+        return response
+
+    def run(self, benchmarks=BENCHMARKS):
+        results = {
+            "version": __version__,
+            "database": connection.pg_version,
+            "parameters": self.parameters,
+        }
+
+        try:
+            with transaction.atomic():
+                results["setup"] = self.setup()
+                results["results"] = {
+                    benchmark: getattr(self, f"benchmark_{benchmark}")()
+                    for benchmark in BENCHMARKS
+                    if benchmark in benchmarks
+                }
+
+                raise Rollback
+        except Rollback:
+            pass
+
+        return results
+
+    def benchmark_search(self):
+        return search_timings(SEARCH_QUERIES, self.iterations)
+
+    def benchmark_api_list(self):
+        results = {}
+
+        for model in ("record", "zone"):
+            url = reverse(f"plugins-api:netbox_dns-api:{model}-list")
+            for page_size in PAGE_SIZES:
+                results[f"{model}_{page_size}"] = measure(
+                    lambda iteration: self.get(f"{url}?limit={page_size}"),
+                    self.iterations,
+                )
+
+        return results
+
+    def benchmark_export(self):
+        zone = self.zones[0]
+
+        return {
+            "record": measure(
+                lambda iteration: self.get(
+                    f"{reverse('plugins:netbox_dns:record_list')}"
+                    f"?export=table&zone_id={zone.pk}"
+                ),
+                self.iterations,
+            ),
+            "zone": measure(
+                lambda iteration: self.get(
+                    f"{reverse('plugins:netbox_dns:zone_list')}?export=table"
+                ),
+                self.iterations,
+            ),
+        }
+
+    def benchmark_name_validation(self):
+        """
+        Validate VALIDATION_NAMES record names one by one and as a batch, so
+        the timings in milliseconds are the cost per name in microseconds
+        """
+        validator = get_validator()
+        names = [
+            (f"host-{index}.bench-{index % 10}", RecordTypeChoices.A)
+            for index in range(VALIDATION_NAMES)
+        ]
+
+        def validate_single(iteration):
+            for name, _ in names:
+                validate_extended_hostname(name)
+
+        def validate_batch(iteration):
+            validator.validate_many(names, validator.validate_record_name)
+
+        return {
+            "single": measure(validate_single, self.iterations),
+            "batch": measure(validate_batch, self.iterations),
+        }
+
+    def benchmark_record_save(self):
+        zone = self.zones[0]
+        records = []
+
+        def create(iteration):
+            record = Record(
+                zone=zone,
+                name=f"bench-save-{iteration}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.{iteration % 256}.{iteration // 256 % 254 + 1}",
+            )
+            record.save()
+            records.append(record)
+
+        def update(iteration):
+            record = records[iteration]
+            record.value = f"10.0.{(iteration + 1) % 256}.{iteration // 256 % 254 + 1}"
+            record.save()
+
+        return {
+            "create": measure(create, self.iterations),
+            "update": measure(update, self.iterations),
+        }
+
+    def benchmark_record_bulk_import(self):
+        zone = self.zones[0]
+
+        def import_records(iteration):
+            RecordImporter().import_objects(
+                [
+                    {
+                        "zone": zone.name,
+                        "name": f"bench-import-{iteration}-{index}",
+                        "type": "A",
+                        "value": f"10.1.{index >> 8 & 255}.{index & 255}",
+                    }
+                    for index in range(self.import_size)
+                ]
+            )
+
+        return measure(import_records, self.iterations)
+
+    def benchmark_reverse_zone_save(self):
+        zone_data = get_zone_data(self.nameserver)
+
+        def create(iteration):
+            Zone(name=f"{iteration}.254.10.in-addr.arpa", **zone_data).save()
+
+        return measure(create, self.iterations)
+
+    def benchmark_zone_delete(self):
+        zones = self.zones[-self.iterations :]
+
+        return measure(lambda iteration: zones[iteration].delete(), len(zones))
+
+    def benchmark_nameserver_rename(self):
+        def rename(iteration):
+            self.nameserver.name = f"ns{iteration}.renamed.benchmark.test"
+            self.nameserver.save()
+
+        return measure(rename, self.iterations)
+
+    def benchmark_cleanup_database(self):
+        results = {}
+
+        for phase in CLEANUP_PHASES:
+            start = perf_counter()
+            getattr(cleanup_database, phase)()
+            results[phase] = (perf_counter() - start) * 1000
+
+        return results
@@ -0,0 +1,313 @@
+import ipaddress
+
+from dns import name as dns_name
+from dns.exception import DNSException
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Cast
+
+from netaddr import cidr_merge
+
+from netbox_dns.fields import AddressField
+from netbox_dns.models import Record, RecordTypeChoices, Zone
+from netbox_dns.search import cache_objects
+from netbox_dns.utilities import BATCH_SIZE, arpa_to_prefix, batched, canonical_value
+
+
+class PTRZoneIndex:
+    """
+    In-memory index of all reverse zones, used to find the PTR zone for
+    an address without a database query per address.
+    """
+
+    def __init__(self, zones=None):
+        if zones is None:
+            zones = Zone.objects.all()
+
+        self.zones = {}
+        self.prefix_lengths = {4: set(), 6: set()}
+
+        for zone in zones.filter(arpa_network__isnull=False):
+            network = zone.arpa_network
+            self.add(zone.view_id, network.version, network.prefixlen, network, zone)
+
+    def add(self, view_id, version, prefixlen, network, zone):
+        self.zones[(view_id, version, prefixlen, int(network.network))] = (
+            zone,
+            dns_name.from_text(zone.name),
+        )
+        self.prefix_lengths[version].add(prefixlen)
+
+    def get(self, view_id, address):
+        """
+        Return the zone with the longest network strictly containing the
+        address, and its name as a dnspython name
+        """
+        address = ipaddress.ip_address(address)
+        max_prefixlen = address.max_prefixlen
+
+        for prefixlen in sorted(self.prefix_lengths[address.version], reverse=True):
+            if prefixlen >= max_prefixlen:
+                continue
+
+            host_bits = max_prefixlen - prefixlen
+            network = (int(address) >> host_bits) << host_bits
+            entry = self.zones.get((view_id, address.version, prefixlen, network))
+            if entry is not None:
+                return entry
+
+        return None, None
+
+
+def update_ptr_records(records, batch_size=BATCH_SIZE):
+    """
+    Create, update or delete the PTR records for a queryset of address records
+    in batches, with the same semantics as Record.update_ptr_record().
+
+    Each batch needs a constant number of queries, and the SOA serial of each
+    affected reverse zone is updated only once at the end.
+    """
+    ptr_zone_index = PTRZoneIndex()
+    changed_zone_ids = set()
+
+    records = records.filter(
+        type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA)
+    ).select_related("zone", "ptr_record")
+
+    with transaction.atomic():
+        for batch in batched(records.iterator(chunk_size=batch_size), batch_size):
+            changed_zone_ids |= _update_ptr_batch(batch, ptr_zone_index)
+
+        update_serials(changed_zone_ids)
+
+    return changed_zone_ids
+
+
+def _update_ptr_batch(records, ptr_zone_index):
+    changed_zone_ids = set()
+
+    delete_ptr_pks = []
+    create_ptr = []
+    update_ptr = []
+
+    for record in records:
+        ptr_record = record.ptr_record
+
+        ptr_zone = None
+        if not record.disable_ptr and record.is_active and record.name != "*":
+            ptr_zone, ptr_zone_name = ptr_zone_index.get(
+                record.zone.view_id, record.value
+            )
+
+        if ptr_record is not None and (
+            ptr_zone is None or ptr_record.zone_id != ptr_zone.pk
+        ):
+            delete_ptr_pks.append(ptr_record.pk)
+            changed_zone_ids.add(ptr_record.zone_id)
+            record.ptr_record = ptr_record = None
+
+        if ptr_zone is None:
+            continue
+
+        ptr_name = (
+            dns_name.from_text(ipaddress.ip_address(record.value).reverse_pointer)
+            .relativize(ptr_zone_name)
+            .to_text()
+        )
+        ptr_value = record.fqdn
+
+        if ptr_record is None:
+            create_ptr.append(
+                (
+                    record,
+                    Record(
+                        zone_id=ptr_zone.pk,
+                        type=RecordTypeChoices.PTR,
+                        name=ptr_name,
+                        ttl=record.ttl,
+                        value=ptr_value,
+                        canonical_value=canonical_value(
+                            RecordTypeChoices.PTR, ptr_value, ptr_zone_name
+                        ),
+                        ip_address=record.value,
+                        managed=True,
+                    ),
+                )
+            )
+            changed_zone_ids.add(ptr_zone.pk)
+
+        elif (
+            ptr_record.name != ptr_name
+            or ptr_record.value != ptr_value
+            or ptr_record.ttl != record.ttl
+        ):
+            ptr_record.name = ptr_name
+            ptr_record.value = ptr_value
+            ptr_record.canonical_value = canonical_value(
+                RecordTypeChoices.PTR, ptr_value, ptr_zone_name
+            )
+            ptr_record.ttl = record.ttl
+            ptr_record.ip_address = record.value
+            update_ptr.append(ptr_record)
+            changed_zone_ids.add(ptr_zone.pk)
+
+    if delete_ptr_pks:
+        Record.objects.filter(pk__in=delete_ptr_pks).delete()
+
+    if update_ptr:
+        Record.objects.bulk_update(
+            update_ptr, ["name", "value", "canonical_value", "ttl", "ip_address"]
+        )
+
+    if create_ptr:
+        Record.objects.bulk_create([ptr_record for _, ptr_record in create_ptr])
+        for record, ptr_record in create_ptr:
+            record.ptr_record = ptr_record
+        Record.objects.bulk_update([record for record, _ in create_ptr], ["ptr_record"])
+
+    cache_objects(
+        Record.objects.select_related("zone"),
+        [ptr_record.pk for ptr_record in update_ptr]
+        + [ptr_record.pk for _, ptr_record in create_ptr],
+    )
+
+    return changed_zone_ids
+
+
+def update_reverse_zones(zones, batch_size=BATCH_SIZE):
+    """
+    Reconcile the PTR records for all address records in the networks of
+    newly created reverse zones at once instead of once per zone.
+
+    The networks are merged per view, so the address records are selected
+    with one network condition per contiguous block of reverse zones.
+    """
+    networks = {}
+    for zone in zones:
+        if zone.arpa_network is not None:
+            networks.setdefault(zone.view_id, []).append(zone.arpa_network)
+
+    if not networks:
+        return set()
+
+    condition = Q()
+    for view_id, view_networks in networks.items():
+        network_condition = Q()
+        for network in cidr_merge(view_networks):
+            network_condition |= Q(ip_address__net_contained_or_equal=str(network))
+
+        condition |= Q(zone__view_id=view_id) & network_condition
+
+    return update_ptr_records(Record.objects.filter(condition), batch_size=batch_size)
+
+
+def get_active_types(records):
+    """
+    Return the types of the active records with the zones and names of a
+    list of records by zone ID and name
+    """
+    names = {}
+    for zone_id, name, record_type in Record.objects.filter(
+        zone__in={record.zone_id for record in records},
+        name__in={record.name for record in records},
+        active=True,
+    ).values_list("zone_id", "name", "type"):
+        names.setdefault((zone_id, name), []).append(record_type)
+
+    return names
+
+
+def check_conflicts(records, names=None):
+    """
+    Check a list of records against the types of the active records in
+    names, by zone ID and name, and against the preceding records of the
+    list, the same way Record.clean() does for single records. Without
+    names, the active records are read from the database. Returns the
+    error message for the position of each conflicting record.
+    """
+    if names is None:
+        names = get_active_types(records)
+
+    errors = {}
+    for position, record in enumerate(records):
+        if not record.is_active:
+            continue
+
+        types = names.setdefault((record.zone_id, record.name), [])
+
+        if record.type == RecordTypeChoices.CNAME and types:
+            errors[
+                position
+            ] = f"There is already an active record for name {record.name} in zone {record.zone}, CNAME is not allowed."
+        elif RecordTypeChoices.CNAME in types:
+            errors[
+                position
+            ] = f"There is already an active CNAME record for name {record.name} in zone {record.zone}, no other record allowed."
+        elif record.type in RecordTypeChoices.SINGLETONS and record.type in types:
+            errors[
+                position
+            ] = f"There is already an active {record.type} record for name {record.name} in zone {record.zone}, more than one are not allowed."
+        else:
+            types.append(record.type)
+
+    return errors
+
+
+def update_serials(zone_ids):
+    """Update the SOA serial of each zone once"""
+    for zone in Zone.objects.filter(pk__in=zone_ids):
+        zone.update_serial()
+
+
+def update_ip_addresses(records, batch_size=BATCH_SIZE):
+    """
+    Set the IP address of address records from their value with a single UPDATE
+    and of PTR records from their name in batches. Returns the number of
+    updated records.
+    """
+    updated = (
+        records.filter(type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA))
+        .annotate(address=Cast("value", output_field=AddressField()))
+        .filter(Q(ip_address__isnull=True) | ~Q(ip_address=F("address")))
+        .update(ip_address=Cast("value", output_field=AddressField()))
+    )
+
+    ptr_records = records.filter(type=RecordTypeChoices.PTR).select_related("zone")
+    for batch in batched(ptr_records.iterator(chunk_size=batch_size), batch_size):
+        update_records = []
+        for record in batch:
+            prefix = arpa_to_prefix(record.fqdn)
+            ip_address = prefix.ip if prefix is not None else None
+            if record.ip_address != ip_address:
+                record.ip_address = ip_address
+                update_records.append(record)
+
+        Record.objects.bulk_update(update_records, ["ip_address"])
+        updated += len(update_records)
+
+    return updated
+
+
+def update_canonical_values(records, batch_size=BATCH_SIZE):
+    """
+    Set the canonical value of records in batches. Records with values that
+    cannot be parsed keep no canonical value. Returns the number of updated
+    records.
+    """
+    updated = 0
+
+    records = records.select_related("zone").only("pk", "type", "value", "zone__name")
+    for batch in batched(records.iterator(chunk_size=batch_size), batch_size):
+        update_records = []
+        for record in batch:
+            try:
+                record.update_canonical_value()
+            except DNSException:
+                record.canonical_value = None
+            update_records.append(record)
+
+        Record.objects.bulk_update(update_records, ["canonical_value"])
+        updated += len(update_records)
+
+    return updated
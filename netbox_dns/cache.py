@@ -0,0 +1,105 @@
+import hashlib
+import json
+
+from django.core.cache import InvalidCacheBackendError, cache, caches
+from django.core.cache.utils import make_template_fragment_key
+
+from extras.plugins import get_plugin_config
+from netbox.authentication import ObjectPermissionMixin
+
+RECORD_TABLE_FRAGMENT = "netbox_dns_record_table"
+
+
+def get_cache_timeout():
+    return get_plugin_config("netbox_dns", "zone_cache_timeout")
+
+
+def get_zone_cache_key(zone):
+    """
+    Return a cache key for the contents of a zone. Every change to the
+    records of a zone bumps its SOA serial or, for zones with a manual
+    serial, its last content change, so the key changes with each of them.
+    """
+    timestamps = [
+        timestamp.timestamp() if timestamp is not None else None
+        for timestamp in (zone.last_updated, zone.last_content_change)
+    ]
+
+    return (
+        f"netbox_dns:zone:{zone.pk}:{zone.soa_serial}:{timestamps[0]}:{timestamps[1]}"
+    )
+
+
+def get_user_cache_key(user):
+    """
+    Return a hash of the object permissions and preferences of a user, which
+    determine the rows and columns of the tables the user sees
+    """
+    if not user.is_authenticated:
+        return "anonymous"
+
+    if user.is_superuser:
+        permissions = "superuser"
+    else:
+        permissions = {
+            name: constraints
+            for name, constraints in ObjectPermissionMixin()
+            .get_all_permissions(user)
+            .items()
+            if name.startswith("netbox_dns.")
+        }
+
+    config = getattr(user, "config", None)
+    preferences = config.data if config is not None else None
+
+    return hashlib.sha256(
+        json.dumps([permissions, preferences], sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_record_count(zone, managed=False):
+    """Return the number of records in a zone, cached until the zone changes"""
+    timeout = get_cache_timeout()
+    if not timeout:
+        return zone.record_count(managed=managed)
+
+    return cache.get_or_set(
+        f"{get_zone_cache_key(zone)}:record_count:{int(managed)}",
+        lambda: zone.record_count(managed=managed),
+        timeout,
+    )
+
+
+def get_record_table_key(request, zone, table):
+    """
+    Return the key of the rendered record table of a zone, for the {% cache %}
+    template tag with the RECORD_TABLE_FRAGMENT fragment name
+    """
+    parameters = sorted(
+        (name, value) for name, values in request.GET.lists() for value in values
+    )
+
+    return hashlib.sha256(
+        json.dumps(
+            [
+                get_zone_cache_key(zone),
+                table,
+                get_user_cache_key(request.user),
+                parameters,
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def get_fragment_cache():
+    """Return the cache used by the {% cache %} template tag"""
+    try:
+        return caches["template_fragments"]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+def get_record_table_fragment_key(request, zone, table):
+    return make_template_fragment_key(
+        RECORD_TABLE_FRAGMENT, [get_record_table_key(request, zone, table)]
+    )
@@ -0,0 +1,290 @@
+import hashlib
+import os
+import struct
+import time
+from functools import lru_cache
+
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from dns import dnssec
+from dns import name as dns_name
+from dns import rdata, rdataclass, rdatatype
+from dns import rrset as dns_rrset
+from dns.rdtypes.dnskeybase import Flag
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from extras.plugins import get_plugin_config
+
+SIGNATURE_CACHE_PREFIX = "netbox_dns:rrsig"
+
+# Inception times are backdated to tolerate clock skew between validators
+INCEPTION_OFFSET = 3600
+
+# Record types generated by the signer, existing records of these types are
+# not exported with a signed zone
+SIGNER_TYPES = (
+    rdatatype.RRSIG,
+    rdatatype.NSEC,
+    rdatatype.NSEC3,
+    rdatatype.NSEC3PARAM,
+)
+
+
+def get_signature_lifetime():
+    return get_plugin_config("netbox_dns", "dnssec_signature_lifetime")
+
+
+@lru_cache(maxsize=64)
+def load_private_key(path, mtime):
+    with open(path, "rb") as key_file:
+        return load_pem_private_key(key_file.read(), password=None)
+
+
+class SigningKey:
+    """A private key from a local PEM file and its DNSKEY record"""
+
+    def __init__(self, key_file, algorithm, ksk=False):
+        try:
+            self.private_key = load_private_key(key_file, os.stat(key_file).st_mtime)
+        except (OSError, ValueError) as exc:
+            raise ImproperlyConfigured(
+                f"Cannot load DNSSEC key file {key_file}: {exc}"
+            ) from None
+
+        self.ksk = ksk
+        self.dnskey = dnssec.make_dnskey(
+            self.private_key.public_key(),
+            algorithm,
+            flags=Flag.ZONE | Flag.SEP if ksk else Flag.ZONE,
+        )
+        self.key_tag = dnssec.key_id(self.dnskey)
+
+
+def get_signing_keys(zone):
+    """
+    Return the signing keys configured for a zone in the dnssec_keys plugin
+    setting, which maps zone names to lists of keys with a key_file, an
+    algorithm and an optional ksk flag
+    """
+    return [
+        SigningKey(key["key_file"], key["algorithm"], ksk=key.get("ksk", False))
+        for key in get_plugin_config("netbox_dns", "dnssec_keys").get(zone.name, [])
+    ]
+
+
+def get_rrset_digest(rrset, origin, key):
+    """
+    Return a hash of the canonical form of an RRset and the key signing it,
+    which identifies a signature independently of the zone serial
+    """
+    digest = hashlib.sha256()
+    digest.update(origin.to_digestable())
+    digest.update(key.dnskey.to_digestable())
+    digest.update(rrset.name.to_digestable())
+    digest.update(struct.pack(">HHI", rrset.rdtype, rrset.covers, rrset.ttl))
+    for value in sorted(value.to_digestable(origin) for value in rrset):
+        digest.update(struct.pack(">H", len(value)))
+        digest.update(value)
+
+    return digest.hexdigest()
+
+
+class ZoneSigner:
+    """
+    Sign the RRsets of a zone with the keys configured for it.
+
+    The zone is signed with an NSEC chain and the DNSKEY RRset of the
+    configured keys at the apex. The DNSKEY RRset is signed with the key
+    signing keys, all other RRsets with the zone signing keys. Zones with
+    only one kind of key are signed with all keys.
+
+    Signatures are cached by a hash of the content of the RRset and the key,
+    so only RRsets that changed since the zone was last signed, such as the
+    SOA RRset after each serial change and the NSEC records of the names
+    next to changed names, are signed again. Cached signatures are renewed
+    when less than half of their lifetime is left.
+    """
+
+    def __init__(self, zone, keys=None):
+        self.zone = zone
+        self.origin = dns_name.from_text(zone.name)
+        self.keys = keys if keys is not None else get_signing_keys(zone)
+        self.lifetime = get_signature_lifetime()
+
+        self.signed = 0
+        self.cached = 0
+
+    def get_dnskey_rrset(self, rrsets):
+        rrset = next(
+            (
+                rrset
+                for rrset in rrsets
+                if rrset.name == self.origin and rrset.rdtype == rdatatype.DNSKEY
+            ),
+            None,
+        )
+        if rrset is None:
+            rrset = dns_rrset.RRset(self.origin, rdataclass.IN, rdatatype.DNSKEY)
+            rrset.update_ttl(self.zone.default_ttl)
+
+        for key in self.keys:
+            rrset.add(key.dnskey)
+
+        return rrset
+
+    def get_nodes(self, rrsets):
+        """
+        Group the RRsets by owner name and return the names in canonical
+        order with their RRsets, the RRsets to sign and the types for their
+        NSEC record. Names below delegations are occluded and neither signed
+        nor part of the NSEC chain, so they have no types, and only DS RRsets
+        are signed at delegations.
+        """
+        names = {}
+        for rrset in rrsets:
+            names.setdefault(rrset.name, []).append(rrset)
+
+        nodes = []
+        delegation = None
+        for name in sorted(names):
+            if delegation is not None and name.is_subdomain(delegation):
+                nodes.append((name, names[name], [], None))
+                continue
+
+            node_rrsets = names[name]
+            types = {rrset.rdtype for rrset in node_rrsets}
+
+            if name != self.origin and rdatatype.NS in types:
+                delegation = name
+                types &= {rdatatype.NS, rdatatype.DS}
+                signed = [
+                    rrset for rrset in node_rrsets if rrset.rdtype == rdatatype.DS
+                ]
+            else:
+                signed = node_rrsets
+
+            nodes.append((name, node_rrsets, signed, types))
+
+        return nodes
+
+    def get_nsec_rrset(self, name, next_name, types, ttl):
+        bitmap = " ".join(
+            rdatatype.to_text(rdtype)
+            for rdtype in sorted(types | {rdatatype.NSEC, rdatatype.RRSIG})
+        )
+
+        rrset = dns_rrset.RRset(name, rdataclass.IN, rdatatype.NSEC)
+        rrset.add(
+            rdata.from_text(rdataclass.IN, rdatatype.NSEC, f"{next_name} {bitmap}"),
+            ttl,
+        )
+
+        return rrset
+
+    def get_keys(self, rrset):
+        ksks = [key for key in self.keys if key.ksk]
+        zsks = [key for key in self.keys if not key.ksk]
+
+        if rrset.rdtype == rdatatype.DNSKEY:
+            return ksks or zsks
+        return zsks or ksks
+
+    def sign(self, rrsets):
+        """
+        Return the RRsets of the zone with the DNSKEY RRset and the NSEC
+        records added, each followed by the RRSIG RRset covering it
+        """
+        rrsets = [rrset for rrset in rrsets if rrset.rdtype not in SIGNER_TYPES]
+        dnskey_rrset = self.get_dnskey_rrset(rrsets)
+        rrsets = [
+            rrset
+            for rrset in rrsets
+            if rrset.name != self.origin or rrset.rdtype != rdatatype.DNSKEY
+        ] + [dnskey_rrset]
+
+        soa_rrset = next(rrset for rrset in rrsets if rrset.rdtype == rdatatype.SOA)
+        nsec_ttl = min(soa_rrset.ttl, soa_rrset[0].minimum)
+
+        nodes = self.get_nodes(rrsets)
+
+        chain = [name for name, _, _, types in nodes if types is not None]
+        next_names = dict(zip(chain, chain[1:] + chain[:1]))
+
+        output = []
+        signed = []
+        for name, node_rrsets, signed_rrsets, types in nodes:
+            if types is not None:
+                nsec_rrset = self.get_nsec_rrset(
+                    name, next_names[name], types, nsec_ttl
+                )
+                node_rrsets = sorted(
+                    node_rrsets + [nsec_rrset],
+                    key=lambda rrset: (rrset.rdtype != rdatatype.SOA, rrset.rdtype),
+                )
+                signed += signed_rrsets + [nsec_rrset]
+
+            output.append(node_rrsets)
+
+        signatures = self.get_signatures(signed)
+
+        return [
+            rrset
+            for node_rrsets in output
+            for covered in node_rrsets
+            for rrset in (covered, signatures.get((covered.name, covered.rdtype)))
+            if rrset is not None
+        ]
+
+    def get_signatures(self, rrsets):
+        """
+        Return the RRSIG RRsets for a list of RRsets by owner name and
+        covered type, from the cache where possible
+        """
+        now = int(time.time())
+
+        requests = {}
+        for rrset in rrsets:
+            for key in self.get_keys(rrset):
+                digest = get_rrset_digest(rrset, self.origin, key)
+                requests[f"{SIGNATURE_CACHE_PREFIX}:{digest}"] = (rrset, key)
+
+        cached = cache.get_many(list(requests))
+
+        signatures = {}
+        new_signatures = {}
+        for cache_key, (rrset, key) in requests.items():
+            rrsig = None
+            if cache_key in cached:
+                wire = cached[cache_key]
+                rrsig = rdata.from_wire(
+                    rdataclass.IN, rdatatype.RRSIG, wire, 0, len(wire)
+                )
+                if rrsig.expiration - now < self.lifetime // 2:
+                    rrsig = None
+
+            if rrsig is None:
+                rrsig = dnssec.sign(
+                    rrset,
+                    key.private_key,
+                    self.origin,
+                    key.dnskey,
+                    inception=now - INCEPTION_OFFSET,
+                    lifetime=self.lifetime + INCEPTION_OFFSET,
+                )
+                new_signatures[cache_key] = rrsig.to_wire()
+                self.signed += 1
+            else:
+                self.cached += 1
+
+            rrsig_rrset = signatures.get((rrset.name, rrset.rdtype))
+            if rrsig_rrset is None:
+                rrsig_rrset = signatures[(rrset.name, rrset.rdtype)] = dns_rrset.RRset(
+                    rrset.name, rdataclass.IN, rdatatype.RRSIG, rrset.rdtype
+                )
+            rrsig_rrset.add(rrsig, rrset.ttl)
+
+        if new_signatures:
+            cache.set_many(new_signatures, timeout=self.lifetime // 2)
+
+        return signatures
@@ -1,2 +1,3 @@
 from .network import *
 from .address import *
+from .lookups import *
@@ -1,9 +1,36 @@
 from django import forms
 from django.db import models
-from django.db.models import Lookup
 from django.core.exceptions import ValidationError
 
-from netaddr import AddrFormatError, IPAddress
+from netaddr import AddrFormatError, IPAddress, IPNetwork
+
+from .network import NetContained, NetContainedOrEqual
+
+
+class AddressPrefixLookupMixin:
+    """
+    Prepare the right hand side of a lookup on an address field as network
+    instead of as address
+    """
+
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, "resolve_expression"):
+            return self.rhs
+
+        try:
+            return str(IPNetwork(self.rhs).cidr)
+        except (AddrFormatError, TypeError, ValueError) as exc:
+            raise ValidationError(exc)
+
+
+class AddressNetContained(AddressPrefixLookupMixin, NetContained):
+    pass
+
+
+class AddressNetContainedOrEqual(AddressPrefixLookupMixin, NetContainedOrEqual):
+    pass
 
 
 class AddressFormField(forms.Field):
@@ -62,3 +89,7 @@ class AddressField(models.Field):
 
     def db_type(self, connection):
         return "inet"
+
+
+AddressField.register_lookup(AddressNetContained)
+AddressField.register_lookup(AddressNetContainedOrEqual)
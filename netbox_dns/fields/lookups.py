@@ -0,0 +1,24 @@
+from django.db.models import Lookup
+
+
+class ILikeContains(Lookup):
+    """
+    Case insensitive containment test using ILIKE on the plain column.
+
+    Unlike icontains, which PostgreSQL evaluates as UPPER(column) LIKE, this
+    can be answered from a pg_trgm GIN index on the column. The lookup is
+    not registered on any field class, it is used as an expression such as
+    ILikeContains(F("name"), value) in the search filters of the plugin.
+    """
+
+    lookup_name = "ilike_contains"
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        return ("%s", [f"%{connection.ops.prep_for_like_query(value)}%"])
+
+    def as_sql(self, qn, connection):
+        lhs, lhs_params = self.process_lhs(qn, connection)
+        rhs, rhs_params = self.process_rhs(qn, connection)
+        params = lhs_params + rhs_params
+        return "%s ILIKE %s" % (lhs, rhs), params
@@ -1,8 +1,10 @@
 import django_filters
-from django.db.models import Q
+from django.db.models import F, Q
+from netaddr import AddrFormatError, IPNetwork
 
 from netbox.filtersets import NetBoxModelFilterSet
 
+from netbox_dns.fields import ILikeContains
 from netbox_dns.models import View, Zone, Record, RecordTypeChoices
 
 
@@ -35,6 +37,14 @@ class RecordFilter(NetBoxModelFilterSet):
         label="View the Parent Zone belongs to",
     )
     managed = django_filters.BooleanFilter()
+    ip_address__net_contained = django_filters.CharFilter(
+        method="filter_ip_address_net_contained",
+        label="IP address is contained in prefix",
+    )
+    ip_address__net_contained_or_equal = django_filters.CharFilter(
+        method="filter_ip_address_net_contained",
+        label="IP address is contained in or equal to prefix",
+    )
 
     class Meta:
         model = Record
@@ -45,8 +55,20 @@ class RecordFilter(NetBoxModelFilterSet):
         if not value.strip():
             return queryset
         qs_filter = (
-            Q(name__icontains=value)
-            | Q(value__icontains=value)
-            | Q(zone__name__icontains=value)
+            Q(ILikeContains(F("name"), value))
+            | Q(ILikeContains(F("value"), value))
+            | Q(
+                zone__in=Zone.objects.filter(ILikeContains(F("name"), value)).values(
+                    "pk"
+                )
+            )
         )
         return queryset.filter(qs_filter)
+
+    def filter_ip_address_net_contained(self, queryset, name, value):
+        try:
+            prefix = IPNetwork(value.strip())
+        except (AddrFormatError, ValueError):
+            return queryset.none()
+
+        return queryset.filter(**{name: prefix})
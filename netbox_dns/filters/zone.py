@@ -1,8 +1,9 @@
 import django_filters
-from django.db.models import Q
+from django.db.models import F, Q
 
 from netbox.filtersets import NetBoxModelFilterSet
 
+from netbox_dns.fields import ILikeContains
 from netbox_dns.models import View, Zone, ZoneStatusChoices
 
 
@@ -35,7 +36,7 @@ class ZoneFilter(NetBoxModelFilterSet):
         if not value.strip():
             return queryset
         qs_filter = (
-            Q(name__icontains=value)
+            Q(ILikeContains(F("name"), value))
             | Q(status__icontains=value)
             | Q(view__name__icontains=value)
         )
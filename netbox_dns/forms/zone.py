@@ -9,6 +9,7 @@ from django.forms import (
     NullBooleanField,
 )
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 
 from netbox.forms import (
     NetBoxModelBulkEditForm,
@@ -23,6 +24,7 @@ from utilities.forms import (
     StaticSelect,
     CSVChoiceField,
     CSVModelChoiceField,
+    CSVModelMultipleChoiceField,
     DynamicModelChoiceField,
     APISelect,
     add_blank_choice,
@@ -176,6 +178,14 @@ class ZoneForm(NetBoxModelForm):
             else self.initial["default_ttl"]
         )
 
+    def _save_m2m(self):
+        nameservers = self.cleaned_data.pop("nameservers", None)
+
+        super()._save_m2m()
+
+        if nameservers is not None:
+            self.instance.set_nameservers(nameservers)
+
     class Meta:
         model = Zone
 
@@ -270,6 +280,12 @@ class ZoneImportForm(NetBoxModelImportForm):
         required=False,
         help_text="Mailbox of the zone's administrator",
     )
+    nameservers = CSVModelMultipleChoiceField(
+        queryset=NameServer.objects.all(),
+        required=False,
+        to_field_name="name",
+        help_text="Name servers for the zone",
+    )
     soa_serial_auto = BooleanField(
         required=False,
         help_text="Generate the SOA serial",
@@ -295,14 +311,19 @@ class ZoneImportForm(NetBoxModelImportForm):
         help_text="Minimum TTL for negative results, e.g. NXRRSET",
     )
 
-    def _get_default_value(self, field):
-        _default_values = settings.PLUGINS_CONFIG.get("netbox_dns", {})
-        if _default_values.get("zone_soa_ttl", None) is None:
-            _default_values["zone_soa_ttl"] = _default_values.get(
-                "zone_default_ttl", None
-            )
+    @cached_property
+    def _default_values(self):
+        default_values = settings.PLUGINS_CONFIG.get("netbox_dns", {})
+        if default_values.get("zone_soa_ttl", None) is None:
+            default_values = {
+                **default_values,
+                "zone_soa_ttl": default_values.get("zone_default_ttl", None),
+            }
 
-        return _default_values.get(f"zone_{field}", None)
+        return default_values
+
+    def _get_default_value(self, field):
+        return self._default_values.get(f"zone_{field}", None)
 
     def _clean_field_with_defaults(self, field):
         if self.cleaned_data[field]:
@@ -378,6 +399,7 @@ class ZoneImportForm(NetBoxModelImportForm):
             "soa_ttl",
             "soa_mname",
             "soa_rname",
+            "nameservers",
             "soa_serial_auto",
             "soa_serial",
             "soa_refresh",
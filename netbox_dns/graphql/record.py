@@ -10,7 +10,7 @@ from netbox_dns.filters import RecordFilter
 class RecordType(NetBoxObjectType):
     class Meta:
         model = Record
-        fields = "__all__"
+        exclude = ("canonical_value",)
         filterset_class = RecordFilter
 
 
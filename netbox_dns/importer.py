@@ -0,0 +1,594 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.functional import cached_property
+
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
+from extras.plugins import get_plugin_config
+
+from netbox_dns.bulk import (
+    check_conflicts,
+    update_ptr_records,
+    update_reverse_zones,
+    update_serials,
+)
+from netbox_dns.models import (
+    NameServer,
+    Record,
+    RecordStatusChoices,
+    RecordTypeChoices,
+    View,
+    Zone,
+    ZoneStatusChoices,
+)
+from netbox_dns.search import cache_objects
+from netbox_dns.utilities import (
+    ARPA_ADDRESS_BITS,
+    BATCH_SIZE,
+    NameFormatError,
+    batched,
+    canonical_value,
+    get_arpa_prefixlen,
+    normalize_name,
+    prefix_to_arpa_names,
+)
+from netbox_dns.validators import get_validator, validate_domain_name
+
+
+def use_bulk_import(rows, fields):
+    """
+    Return True if an import is large enough for the bulk import path and
+    only creates objects with the given fields
+    """
+    return len(rows) >= get_plugin_config(
+        "netbox_dns", "bulk_import_threshold"
+    ) and all(not row.get("id") and set(row.keys()) <= fields for row in rows)
+
+
+def parse_boolean(value):
+    if isinstance(value, bool):
+        return value
+
+    return str(value).strip().lower() in ("true", "1", "yes", "on")
+
+
+def log_changes(queryset, pks, user, request_id, batch_size=BATCH_SIZE):
+    """Create change log entries for newly created objects in bulk"""
+    for batch in batched(pks, batch_size):
+        object_changes = []
+        for obj in queryset.filter(pk__in=batch).prefetch_related("tags"):
+            object_change = obj.to_objectchange(ObjectChangeActionChoices.ACTION_CREATE)
+            object_change.user = user
+            object_change.request_id = request_id
+            object_changes.append(object_change)
+
+        ObjectChange.objects.bulk_create(object_changes)
+
+
+class BulkImportViewMixin:
+    """
+    Mixin for bulk import views that processes large imports creating new
+    objects with an importer instead of one model form per row
+    """
+
+    importer = None
+
+    def create_and_update_objects(self, form, request):
+        rows = list(form.cleaned_data["data"])
+        if not use_bulk_import(rows, self.importer.FIELDS):
+            return super().create_and_update_objects(form, request)
+
+        try:
+            return self.importer().import_objects(
+                rows, user=request.user, request_id=getattr(request, "id", None)
+            )
+        except ValidationError as exc:
+            for message in exc.messages:
+                form.add_error(None, message)
+            raise ValidationError("")
+
+
+class BulkImporter:
+    object_name = None
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.errors = []
+
+    def add_error(self, index, field, message):
+        self.errors.append((index, field, message))
+
+    def add_validation_error(self, index, exc, field=None):
+        if field is not None:
+            exc = ValidationError({field: exc.messages})
+
+        for field, messages in exc.message_dict.items():
+            for message in messages:
+                self.add_error(index, field, message)
+
+    def check_errors(self):
+        if self.errors:
+            raise ValidationError(
+                [
+                    f"{self.object_name} {index} {field}: {message}"
+                    for index, field, message in self.errors
+                ]
+            )
+
+
+class RecordImporter(BulkImporter):
+    """
+    Create records from import rows in bulk.
+
+    All zones are resolved with one query, all rows are validated in memory
+    including the CNAME and singleton checks against existing records, and
+    the records are created with bulk inserts, followed by one PTR update and
+    one SOA serial update per zone.
+    """
+
+    object_name = "Record"
+
+    FIELDS = {
+        "zone",
+        "view",
+        "type",
+        "name",
+        "value",
+        "ttl",
+        "status",
+        "disable_ptr",
+        "description",
+    }
+
+    def get_zones(self, rows):
+        zone_names = {row.get("zone") for row in rows}
+
+        return {
+            (zone.view.name if zone.view else None, zone.name): zone
+            for zone in Zone.objects.filter(name__in=zone_names).select_related("view")
+        }
+
+    def build_records(self, rows):
+        zones = self.get_zones(rows)
+        records = []
+
+        for index, row in enumerate(rows, start=1):
+            view_name = row.get("view") or None
+            zone = zones.get((view_name, row.get("zone")))
+            if zone is None:
+                self.add_error(
+                    index,
+                    "zone",
+                    f"Zone {row.get('zone')} not found in view {view_name or 'none'}",
+                )
+                continue
+
+            record_type = str(row.get("type") or "").upper()
+            if record_type not in RecordTypeChoices.values():
+                self.add_error(index, "type", f"{record_type} is not a valid type")
+                continue
+
+            status = row.get("status") or RecordStatusChoices.STATUS_ACTIVE
+            if status not in RecordStatusChoices.values():
+                self.add_error(index, "status", f"{status} is not a valid status")
+                continue
+
+            record = Record(
+                zone=zone,
+                name=str(row.get("name") or ""),
+                type=record_type,
+                value=str(row.get("value") or ""),
+                ttl=row.get("ttl") or None,
+                status=status,
+                disable_ptr=parse_boolean(row.get("disable_ptr", False)),
+                description=row.get("description") or "",
+            )
+
+            try:
+                record.clean_fields(exclude=("zone", "ptr_record"))
+                record.validate_name(validate_hostname=False)
+                record.validate_value()
+            except ValidationError as exc:
+                self.add_validation_error(index, exc)
+                continue
+
+            records.append((index, record))
+
+        validator = get_validator()
+        errors = validator.validate_many(
+            [(record.name, record.type) for _, record in records],
+            validator.validate_record_name,
+        )
+        for position, exc in errors.items():
+            self.add_validation_error(records[position][0], exc, field="name")
+
+        return [
+            (index, record)
+            for position, (index, record) in enumerate(records)
+            if position not in errors
+        ]
+
+    def check_conflicts(self, records):
+        """
+        Check the records against existing active records and the records
+        of preceding rows, the same way Record.clean() does for single
+        records
+        """
+        errors = check_conflicts([record for _, record in records])
+        for position, message in errors.items():
+            self.add_error(records[position][0], "type", message)
+
+    def import_objects(self, rows, user=None, request_id=None):
+        """
+        Validate and create the records for a list of rows. Raises a
+        ValidationError without changing the database if any row is invalid.
+        """
+        records = self.build_records(rows)
+        if not self.errors:
+            self.check_conflicts(records)
+
+        self.check_errors()
+
+        records = [record for _, record in records]
+        for record in records:
+            if record.is_ptr_record:
+                record.ip_address = record.address_from_name
+            elif record.is_address_record:
+                record.ip_address = record.value
+
+        with transaction.atomic():
+            Record.objects.bulk_create(records, batch_size=self.batch_size)
+            record_pks = [record.pk for record in records]
+
+            update_ptr_records(
+                Record.objects.filter(pk__in=record_pks), batch_size=self.batch_size
+            )
+            update_serials({record.zone_id for record in records})
+
+            queryset = Record.objects.select_related("zone")
+            log_changes(queryset, record_pks, user, request_id, self.batch_size)
+            cache_objects(queryset, record_pks, batch_size=self.batch_size)
+
+        return records
+
+
+class ZoneImporter(BulkImporter):
+    """
+    Create zones from import rows in bulk.
+
+    The default values are read once, all views and name servers are resolved
+    with one query each, and the zones, their name server assignments and
+    their SOA and NS records are created with bulk inserts. The PTR records
+    for all new reverse zones are reconciled once at the end.
+    """
+
+    object_name = "Zone"
+
+    FIELDS = {
+        "view",
+        "name",
+        "status",
+        "nameservers",
+        "default_ttl",
+        "description",
+        "soa_ttl",
+        "soa_mname",
+        "soa_rname",
+        "soa_serial_auto",
+        "soa_serial",
+        "soa_refresh",
+        "soa_retry",
+        "soa_expire",
+        "soa_minimum",
+    }
+
+    DEFAULT_FIELDS = (
+        "default_ttl",
+        "soa_ttl",
+        "soa_mname",
+        "soa_rname",
+        "soa_serial_auto",
+        "soa_serial",
+        "soa_refresh",
+        "soa_retry",
+        "soa_expire",
+        "soa_minimum",
+    )
+
+    @cached_property
+    def defaults(self):
+        defaults = {
+            field: get_plugin_config("netbox_dns", f"zone_{field}")
+            for field in self.DEFAULT_FIELDS
+        }
+        if defaults["soa_ttl"] is None:
+            defaults["soa_ttl"] = defaults["default_ttl"]
+
+        return defaults
+
+    def get_value(self, row, field):
+        value = row.get(field)
+        if value in (None, ""):
+            return self.defaults[field]
+
+        return value
+
+    @staticmethod
+    def get_nameserver_names(row):
+        return [
+            name.strip()
+            for name in (row.get("nameservers") or "").split(",")
+            if name.strip()
+        ]
+
+    def get_nameservers(self, rows):
+        names = set()
+        for row in rows:
+            names.add(self.get_value(row, "soa_mname"))
+            names.update(self.get_nameserver_names(row))
+
+        return {
+            nameserver.name: nameserver
+            for nameserver in NameServer.objects.filter(name__in=names)
+        }
+
+    def get_views(self, rows):
+        names = {row.get("view") for row in rows if row.get("view")}
+
+        return {view.name: view for view in View.objects.filter(name__in=names)}
+
+    def build_zones(self, rows):
+        nameservers = self.get_nameservers(rows)
+        views = self.get_views(rows)
+        zones = []
+
+        for index, row in enumerate(rows, start=1):
+            view = None
+            if row.get("view"):
+                view = views.get(row.get("view"))
+                if view is None:
+                    self.add_error(index, "view", f"View {row.get('view')} not found")
+                    continue
+
+            soa_mname = nameservers.get(self.get_value(row, "soa_mname"))
+            if soa_mname is None:
+                self.add_error(
+                    index,
+                    "soa_mname",
+                    f"Name server {self.get_value(row, 'soa_mname')} not found",
+                )
+                continue
+
+            zone_nameservers = []
+            for name in self.get_nameserver_names(row):
+                if name not in nameservers:
+                    self.add_error(
+                        index, "nameservers", f"Name server {name} not found"
+                    )
+                    continue
+                zone_nameservers.append(nameservers[name])
+
+            soa_serial_auto = self.get_value(row, "soa_serial_auto")
+            zone = Zone(
+                view=view,
+                name=str(row.get("name") or ""),
+                status=row.get("status") or ZoneStatusChoices.STATUS_ACTIVE,
+                description=row.get("description") or "",
+                soa_mname=soa_mname,
+                soa_serial_auto=(
+                    parse_boolean(soa_serial_auto)
+                    if soa_serial_auto is not None
+                    else False
+                ),
+                **{
+                    field: self.get_value(row, field)
+                    for field in (
+                        "default_ttl",
+                        "soa_ttl",
+                        "soa_rname",
+                        "soa_serial",
+                        "soa_refresh",
+                        "soa_retry",
+                        "soa_expire",
+                        "soa_minimum",
+                    )
+                },
+            )
+
+            try:
+                zone.name = normalize_name(zone.name)
+                validate_domain_name(zone.name)
+            except NameFormatError as exc:
+                self.add_error(index, "name", str(exc))
+                continue
+            except ValidationError as exc:
+                self.add_validation_error(index, exc, field="name")
+                continue
+
+            try:
+                zone.clean_fields(
+                    exclude=(
+                        "view",
+                        "soa_mname",
+                        "arpa_network",
+                        "last_content_change",
+                    )
+                )
+            except ValidationError as exc:
+                self.add_validation_error(index, exc)
+                continue
+
+            if zone.soa_serial is None and not zone.soa_serial_auto:
+                self.add_error(
+                    index,
+                    "soa_serial",
+                    f"soa_serial is not defined and soa_serial_auto is disabled for zone {zone.name}.",
+                )
+                continue
+
+            zones.append((index, zone, zone_nameservers))
+
+        return zones
+
+    def check_conflicts(self, zones):
+        """
+        Check the zones for name conflicts with existing zones and the zones
+        of preceding rows in the same view
+        """
+        names = set(
+            Zone.objects.filter(
+                name__in={zone.name for _, zone, _ in zones}
+            ).values_list("view_id", "name")
+        )
+
+        for index, zone, _ in zones:
+            if (zone.view_id, zone.name) in names:
+                self.add_error(
+                    index,
+                    "name",
+                    f"A zone with name {zone.name} already exists in view {zone.view or 'none'}.",
+                )
+            else:
+                names.add((zone.view_id, zone.name))
+
+    def import_objects(self, rows, user=None, request_id=None):
+        """
+        Validate and create the zones for a list of rows. Raises a
+        ValidationError without changing the database if any row is invalid.
+        """
+        zones = self.build_zones(rows)
+        if not self.errors:
+            self.check_conflicts(zones)
+
+        self.check_errors()
+
+        for _, zone, _ in zones:
+            if zone.soa_serial_auto:
+                zone.soa_serial = zone.get_auto_serial()
+
+            if zone.is_reverse_zone:
+                zone.arpa_network = zone.network_from_name
+
+        with transaction.atomic():
+            Zone.objects.bulk_create(
+                [zone for _, zone, _ in zones], batch_size=self.batch_size
+            )
+
+            ZoneNameServer = Zone.nameservers.through
+            ZoneNameServer.objects.bulk_create(
+                [
+                    ZoneNameServer(zone_id=zone.pk, nameserver_id=nameserver.pk)
+                    for _, zone, zone_nameservers in zones
+                    for nameserver in zone_nameservers
+                ],
+                batch_size=self.batch_size,
+            )
+
+            records = []
+            for _, zone, zone_nameservers in zones:
+                records.append(
+                    Record(
+                        zone_id=zone.pk,
+                        type=RecordTypeChoices.SOA,
+                        name="@",
+                        ttl=zone.soa_ttl,
+                        value=zone.soa_value,
+                        canonical_value=canonical_value(
+                            RecordTypeChoices.SOA, zone.soa_value, zone.name
+                        ),
+                        managed=True,
+                    )
+                )
+                records.extend(
+                    Record(
+                        zone_id=zone.pk,
+                        type=RecordTypeChoices.NS,
+                        name="@",
+                        value=f"{nameserver.name}.",
+                        canonical_value=canonical_value(
+                            RecordTypeChoices.NS, f"{nameserver.name}.", zone.name
+                        ),
+                        managed=True,
+                    )
+                    for nameserver in sorted(
+                        zone_nameservers, key=lambda nameserver: nameserver.name
+                    )
+                )
+            Record.objects.bulk_create(records, batch_size=self.batch_size)
+
+            zones = [zone for _, zone, _ in zones]
+            update_reverse_zones(zones, batch_size=self.batch_size)
+
+            zone_pks = [zone.pk for zone in zones]
+            log_changes(
+                Zone.objects.prefetch_related("nameservers"),
+                zone_pks,
+                user,
+                request_id,
+                self.batch_size,
+            )
+            cache_objects(Zone.objects.all(), zone_pks, batch_size=self.batch_size)
+            cache_objects(
+                Record.objects.select_related("zone"),
+                [record.pk for record in records],
+                batch_size=self.batch_size,
+            )
+
+        return zones
+
+
+MAX_REVERSE_ZONES = 65536
+
+
+def create_reverse_zones(
+    prefix,
+    prefixlen=None,
+    view=None,
+    nameservers=None,
+    user=None,
+    request_id=None,
+    batch_size=BATCH_SIZE,
+):
+    """
+    Create the reverse zones on octet or nibble boundaries that are needed to
+    cover a prefix and do not exist yet, using the zone default settings.
+
+    All zones are created with one bulk import, so the PTR records for the
+    whole prefix are reconciled only once. Returns the new zones.
+    """
+    zone_prefixlen = get_arpa_prefixlen(prefix, prefixlen)
+    if zone_prefixlen > ARPA_ADDRESS_BITS[prefix.version]:
+        raise ValidationError(
+            f"Prefix length {prefixlen} is not valid for IPv{prefix.version}"
+        )
+
+    zone_count = 1 << (zone_prefixlen - prefix.prefixlen)
+    if zone_count > MAX_REVERSE_ZONES:
+        raise ValidationError(
+            f"Covering {prefix} requires {zone_count} reverse zones, more than the maximum of {MAX_REVERSE_ZONES}"
+        )
+
+    if nameservers is None:
+        nameservers = get_plugin_config("netbox_dns", "zone_nameservers", [])
+
+    existing_names = set(
+        Zone.objects.filter(
+            view=view, arpa_network__net_contained_or_equal=prefix
+        ).values_list("name", flat=True)
+    )
+
+    rows = [
+        {
+            "name": name,
+            "view": view.name if view is not None else "",
+            "nameservers": ",".join(nameservers),
+        }
+        for name in prefix_to_arpa_names(prefix, zone_prefixlen)
+        if name not in existing_names
+    ]
+    if not rows:
+        return []
+
+    return ZoneImporter(batch_size=batch_size).import_objects(
+        rows, user=user, request_id=request_id
+    )
@@ -0,0 +1,77 @@
+from contextlib import nullcontext
+from functools import lru_cache
+from time import perf_counter
+
+from django.utils.module_loading import import_string
+
+from extras.plugins import get_plugin_config
+
+METRICS_HOOK = "netbox_dns.metrics.observe"
+
+_hooks = []
+_no_span = nullcontext()
+
+
+def register_hook(hook):
+    """
+    Register a callable that is called as hook(name, duration, labels) at the
+    end of every span, with the duration in seconds and the span labels.
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def unregister_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+@lru_cache(maxsize=None)
+def load_hooks(paths):
+    return tuple(import_string(path) for path in paths)
+
+
+def get_hooks():
+    paths = tuple(get_plugin_config("netbox_dns", "instrumentation_hooks") or ())
+    if get_plugin_config("netbox_dns", "feature_metrics"):
+        paths += (METRICS_HOOK,)
+
+    if not paths:
+        return tuple(_hooks)
+
+    return tuple(_hooks) + load_hooks(paths)
+
+
+class Span:
+    __slots__ = ("name", "labels", "hooks", "start")
+
+    def __init__(self, name, labels, hooks):
+        self.name = name
+        self.labels = labels
+        self.hooks = hooks
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = perf_counter() - self.start
+        labels = {**self.labels, "error": exc_type is not None}
+
+        for hook in self.hooks:
+            hook(self.name, duration, labels)
+
+        return False
+
+
+def span(name, **labels):
+    """
+    Time the enclosed block and pass the duration to all registered and
+    configured hooks. Without any hooks a shared no-op context manager is
+    returned, so the spans on the hot paths cost next to nothing.
+    """
+    hooks = get_hooks()
+    if not hooks:
+        return _no_span
+
+    return Span(name, labels, hooks)
@@ -0,0 +1,620 @@
+import logging
+import uuid
+
+from dns import name as dns_name
+from dns.exception import DNSException
+from netaddr import IPAddress as Address
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
+from extras.plugins import get_plugin_config
+from ipam.choices import IPAddressStatusChoices
+from ipam.models import IPAddress, VRF
+
+from netbox_dns.bulk import (
+    BATCH_SIZE,
+    check_conflicts,
+    update_ptr_records,
+    update_serials,
+)
+from netbox_dns.models import (
+    Record,
+    RecordStatusChoices,
+    RecordTypeChoices,
+    View,
+    Zone,
+)
+from netbox_dns.search import cache_objects
+from netbox_dns.utilities import batched
+
+
+logger = logging.getLogger("netbox_dns")
+
+IPAM_ACTIVE_STATUS_LIST = (
+    IPAddressStatusChoices.STATUS_ACTIVE,
+    IPAddressStatusChoices.STATUS_DHCP,
+    IPAddressStatusChoices.STATUS_SLAAC,
+)
+
+
+class SyncDiff:
+    """Changes computed by a synchronization run, and the conflicts found"""
+
+    def __init__(self):
+        self.create = []
+        self.update = []
+        self.conflicts = []
+
+    def __bool__(self):
+        return bool(self.create or self.update)
+
+    def report(self):
+        lines = []
+        for obj, description in self.create:
+            lines.append(f"+ {description}")
+        for obj, description in self.update:
+            lines.append(f"~ {description}")
+        for description in self.conflicts:
+            lines.append(f"! {description}")
+
+        return lines
+
+
+def address_record_type(address):
+    return RecordTypeChoices.A if address.version == 4 else RecordTypeChoices.AAAA
+
+
+def find_zone(zones, fqdn):
+    """
+    Return the zone with the longest name containing the FQDN from a
+    dictionary of zones by name
+    """
+    name = fqdn
+    while len(name) > 1:
+        name = name.parent()
+        zone = zones.get(name.to_text(omit_final_dot=True))
+        if zone is not None:
+            return zone
+
+    return None
+
+
+class IPAMDNSSync:
+    """
+    Synchronize the DNS names of IPAM IP addresses in a VRF with the address
+    records of the zones in a view.
+
+    All data is read with a constant number of queries and joined in memory,
+    and changes are applied in batches.
+    """
+
+    def __init__(self, vrf=None, view=None, overwrite=False, batch_size=BATCH_SIZE):
+        self.vrf = vrf
+        self.view = view
+        self.overwrite = overwrite
+        self.batch_size = batch_size
+
+    @property
+    def ip_addresses(self):
+        if self.vrf is None:
+            return IPAddress.objects.filter(vrf__isnull=True)
+
+        return IPAddress.objects.filter(vrf=self.vrf)
+
+    @property
+    def zones(self):
+        if self.view is None:
+            return Zone.objects.filter(view__isnull=True)
+
+        return Zone.objects.filter(view=self.view)
+
+    def get_address_records(self):
+        address_records = {}
+
+        for record in Record.objects.filter(
+            zone__in=self.zones,
+            type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA),
+            managed=False,
+        ).select_related("zone"):
+            address_records.setdefault((record.type, record.ip_address), []).append(
+                record
+            )
+
+        return address_records
+
+    def diff_dns(self):
+        """Compute the changes to address records for the DNS names in IPAM"""
+        diff = SyncDiff()
+
+        zones = {zone.name: zone for zone in self.zones}
+        address_records = self.get_address_records()
+        planned = set()
+
+        for ip_address in self.ip_addresses.exclude(dns_name=""):
+            address = ip_address.address.ip
+            record_type = address_record_type(address)
+
+            try:
+                fqdn = dns_name.from_text(ip_address.dns_name, origin=dns_name.root)
+            except DNSException:
+                diff.conflicts.append(
+                    f"{ip_address}: {ip_address.dns_name} is not a valid DNS name"
+                )
+                continue
+
+            zone = find_zone(zones, fqdn)
+            if zone is None:
+                diff.conflicts.append(
+                    f"{ip_address}: no zone found for {ip_address.dns_name}"
+                )
+                continue
+
+            name = fqdn.relativize(dns_name.from_text(zone.name)).to_text()
+
+            records = address_records.get((record_type, address), [])
+            if len(records) > 1:
+                diff.conflicts.append(
+                    f"{ip_address}: multiple {record_type} records found"
+                )
+                continue
+
+            if not records:
+                key = (zone.pk, name, record_type, str(address))
+                if key in planned:
+                    continue
+                planned.add(key)
+
+                record = Record(
+                    zone=zone,
+                    name=name,
+                    type=record_type,
+                    value=str(address),
+                    ip_address=address,
+                )
+                try:
+                    record.validate_name()
+                except ValidationError as exc:
+                    diff.conflicts.append(f"{ip_address}: {exc.messages[0]}")
+                    continue
+                record.update_canonical_value()
+
+                diff.create.append(
+                    (record, f"{record_type} record {fqdn} for {ip_address}")
+                )
+                continue
+
+            record = records[0]
+            if record.fqdn == fqdn.to_text():
+                continue
+
+            if not self.overwrite:
+                diff.conflicts.append(
+                    f"{ip_address}: not overwriting {record_type} record "
+                    f"{record.fqdn} with {fqdn}"
+                )
+                continue
+
+            diff.update.append(
+                (
+                    (record, zone, name),
+                    f"{record_type} record {record.fqdn} for {ip_address} to {fqdn}",
+                )
+            )
+
+        self.check_conflicts(diff)
+
+        return diff
+
+    def check_conflicts(self, diff):
+        """
+        Move the planned creates and updates that conflict with active
+        records, or with each other, to the conflicts of the diff
+        """
+        records = [record for record, _ in diff.create] + [
+            Record(zone=zone, name=name, type=record.type, status=record.status)
+            for (record, zone, name), _ in diff.update
+        ]
+        errors = check_conflicts(records)
+        if not errors:
+            return
+
+        changes = diff.create + diff.update
+        for position, message in sorted(errors.items()):
+            diff.conflicts.append(f"{changes[position][1]}: {message}")
+
+        offset = len(diff.create)
+        diff.create = [
+            change
+            for position, change in enumerate(diff.create)
+            if position not in errors
+        ]
+        diff.update = [
+            change
+            for position, change in enumerate(diff.update, offset)
+            if position not in errors
+        ]
+
+    def apply_dns(self, diff):
+        changed_zone_ids = set()
+
+        with transaction.atomic():
+            create_records = [record for record, _ in diff.create]
+            Record.objects.bulk_create(create_records, batch_size=self.batch_size)
+            changed_zone_ids |= {record.zone_id for record in create_records}
+
+            update_records = []
+            for (record, zone, name), _ in diff.update:
+                changed_zone_ids |= {record.zone_id, zone.pk}
+                record.zone = zone
+                record.name = name
+                update_records.append(record)
+            Record.objects.bulk_update(
+                update_records, ["zone", "name"], batch_size=self.batch_size
+            )
+
+            record_pks = [record.pk for record in create_records + update_records]
+            update_ptr_records(
+                Record.objects.filter(pk__in=record_pks), batch_size=self.batch_size
+            )
+            update_serials(changed_zone_ids)
+
+            cache_objects(
+                Record.objects.select_related("zone"),
+                record_pks,
+                batch_size=self.batch_size,
+            )
+
+    def diff_ipam(self):
+        """Compute the changes to DNS names in IPAM for the address records"""
+        diff = SyncDiff()
+
+        address_records = self.get_address_records()
+
+        for ip_address in self.ip_addresses:
+            address = ip_address.address.ip
+            record_type = address_record_type(address)
+
+            records = address_records.get((record_type, address), [])
+            if not records:
+                continue
+
+            if len(records) > 1:
+                diff.conflicts.append(
+                    f"{ip_address}: multiple {record_type} records found"
+                )
+                continue
+
+            hostname = records[0].fqdn.rstrip(".")
+            if hostname == ip_address.dns_name:
+                continue
+
+            if ip_address.dns_name and not self.overwrite:
+                diff.conflicts.append(
+                    f"{ip_address}: not overwriting DNS name "
+                    f"{ip_address.dns_name} with {hostname}"
+                )
+                continue
+
+            try:
+                IPAddress._meta.get_field("dns_name").run_validators(hostname)
+            except ValidationError:
+                diff.conflicts.append(f"{ip_address}: invalid DNS name {hostname}")
+                continue
+
+            diff.update.append(
+                (
+                    (ip_address, hostname),
+                    f"DNS name of {ip_address} to {hostname}",
+                )
+            )
+
+        return diff
+
+    def apply_ipam(self, diff, user=None, request_id=None):
+        """
+        Set the DNS names of the IP addresses in batches with bulk_update and
+        create their change log entries with bulk_create, so the changes are
+        recorded in the NetBox change log without saving each IP address
+        """
+        hostnames = {
+            ip_address.pk: hostname for (ip_address, hostname), _ in diff.update
+        }
+        if request_id is None:
+            request_id = uuid.uuid4()
+
+        with transaction.atomic():
+            for batch in batched(list(hostnames), self.batch_size):
+                now = timezone.now()
+                ip_addresses = list(
+                    IPAddress.objects.filter(pk__in=batch).prefetch_related("tags")
+                )
+
+                object_changes = []
+                for ip_address in ip_addresses:
+                    ip_address.snapshot()
+                    ip_address.dns_name = hostnames[ip_address.pk]
+                    ip_address.last_updated = now
+
+                    object_change = ip_address.to_objectchange(
+                        ObjectChangeActionChoices.ACTION_UPDATE
+                    )
+                    object_change.user = user
+                    object_change.request_id = request_id
+                    object_changes.append(object_change)
+
+                IPAddress.objects.bulk_update(
+                    ip_addresses, ["dns_name", "last_updated"]
+                )
+                ObjectChange.objects.bulk_create(object_changes)
+
+            cache_objects(
+                IPAddress.objects.all(),
+                list(hostnames),
+                batch_size=self.batch_size,
+            )
+
+
+def get_provisioning_state(ip_address):
+    """Return the attributes of an IP address that determine its address record"""
+    return (
+        ip_address.vrf_id,
+        str(ip_address.address.ip) if ip_address.address else None,
+        ip_address.dns_name,
+        ip_address.status,
+    )
+
+
+class IPAMProvisioner:
+    """
+    Collect changes to IP addresses and create, update or delete the address
+    records for their DNS names in one batch.
+
+    Only records with the FQDN and address of the previous state of an IP
+    address are changed or deleted, and the SOA serial of each affected zone
+    is updated once per batch.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.changes = {}
+
+    def add(self, pk, old_state, new_state):
+        if pk in self.changes:
+            old_state = self.changes[pk][0]
+
+        self.changes[pk] = (old_state, new_state)
+
+    def process(self):
+        changes, self.changes = self.changes, {}
+
+        try:
+            with transaction.atomic():
+                self.apply(changes)
+        except (ValidationError, DatabaseError):
+            logger.exception("Provisioning address records for IP addresses failed")
+
+    def get_vrf_views(self, vrf_ids):
+        """
+        Return the view for each VRF as configured in ipam_provisioning_views.
+        IP addresses without a VRF are provisioned in zones without a view.
+        """
+        vrf_views = {None: None}
+
+        view_map = get_plugin_config("netbox_dns", "ipam_provisioning_views")
+        if not view_map:
+            return vrf_views
+
+        views = {
+            view.name: view.pk
+            for view in View.objects.filter(name__in=view_map.values())
+        }
+        for vrf in VRF.objects.filter(pk__in=vrf_ids, name__in=view_map.keys()):
+            if view_map[vrf.name] in views:
+                vrf_views[vrf.pk] = views[view_map[vrf.name]]
+
+        return vrf_views
+
+    def get_target(self, vrf_views, state):
+        if state is None:
+            return None
+
+        vrf_id, address, name, status = state
+        if not name or address is None or vrf_id not in vrf_views:
+            return None
+
+        try:
+            fqdn = dns_name.from_text(name, origin=dns_name.root)
+        except DNSException:
+            return None
+
+        return (vrf_views[vrf_id], fqdn, address, status in IPAM_ACTIVE_STATUS_LIST)
+
+    def pop_record(self, records, target):
+        view_id, fqdn, address, _ = target
+        matching_records = records.get((view_id, fqdn.to_text(), address))
+        if matching_records:
+            return matching_records.pop()
+
+        return None
+
+    def apply(self, changes):
+        vrf_ids = {
+            state[0]
+            for change in changes.values()
+            for state in change
+            if state is not None and state[0] is not None
+        }
+        vrf_views = self.get_vrf_views(vrf_ids)
+
+        targets = []
+        for old_state, new_state in changes.values():
+            old_target = self.get_target(vrf_views, old_state)
+            new_target = self.get_target(vrf_views, new_state)
+            if old_target != new_target:
+                targets.append((old_target, new_target))
+
+        if not targets:
+            return
+
+        view_ids = {target[0] for change in targets for target in change if target}
+        zone_filter = Q(view__in=view_ids - {None})
+        if None in view_ids:
+            zone_filter |= Q(view__isnull=True)
+
+        zones = {}
+        for zone in Zone.objects.filter(zone_filter):
+            zones.setdefault(zone.view_id, {})[zone.name] = zone
+
+        records = {}
+        for record in Record.objects.filter(
+            zone__in=Zone.objects.filter(zone_filter),
+            type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA),
+            managed=False,
+            ip_address__in={
+                target[2] for change in targets for target in change if target
+            },
+        ).select_related("zone", "ptr_record"):
+            records.setdefault(
+                (record.zone.view_id, record.fqdn, str(record.ip_address)), []
+            ).append(record)
+
+        create_records = []
+        update_records = []
+        delete_records = []
+        changed_zone_ids = set()
+        previous_zone_ids = {}
+        planned = set()
+
+        for old_target, new_target in targets:
+            record = None
+            if old_target is not None:
+                record = self.pop_record(records, old_target)
+
+            zone = None
+            if new_target is not None:
+                view_id, fqdn, address, active = new_target
+                zone = find_zone(zones.get(view_id, {}), fqdn)
+
+            if zone is None:
+                if record is not None:
+                    delete_records.append(record)
+                continue
+
+            if record is None:
+                record = self.pop_record(records, new_target)
+
+            name = fqdn.relativize(dns_name.from_text(zone.name)).to_text()
+            record_type = address_record_type(Address(address))
+            status = (
+                RecordStatusChoices.STATUS_ACTIVE
+                if active
+                else RecordStatusChoices.STATUS_INACTIVE
+            )
+
+            if record is None:
+                key = (zone.pk, name, record_type, address)
+                if key in planned:
+                    continue
+                planned.add(key)
+
+                record = Record(
+                    zone=zone,
+                    name=name,
+                    type=record_type,
+                    value=address,
+                    ip_address=address,
+                    status=status,
+                )
+                try:
+                    record.validate_name()
+                except ValidationError as exc:
+                    logger.warning(
+                        f"Not provisioning {record_type} record {fqdn}: "
+                        f"{exc.messages[0]}"
+                    )
+                    continue
+                record.update_canonical_value()
+
+                create_records.append(record)
+                continue
+
+            if (record.zone_id, record.name, record.value, record.status) != (
+                zone.pk,
+                name,
+                address,
+                status,
+            ):
+                previous_zone_ids[record.pk] = record.zone_id
+                record.zone = zone
+                record.name = name
+                record.type = record_type
+                record.value = address
+                record.update_canonical_value()
+                record.ip_address = address
+                record.status = status
+                update_records.append(record)
+
+        errors = check_conflicts(create_records + update_records)
+        for position, message in sorted(errors.items()):
+            record = (create_records + update_records)[position]
+            logger.warning(
+                f"Not provisioning {record.type} record {record.name} "
+                f"in zone {record.zone}: {message}"
+            )
+        offset = len(create_records)
+        create_records = [
+            record
+            for position, record in enumerate(create_records)
+            if position not in errors
+        ]
+        update_records = [
+            record
+            for position, record in enumerate(update_records, offset)
+            if position not in errors
+        ]
+        changed_zone_ids |= {record.zone_id for record in create_records}
+        for record in update_records:
+            changed_zone_ids |= {previous_zone_ids[record.pk], record.zone_id}
+
+        if delete_records:
+            delete_pks = []
+            for record in delete_records:
+                delete_pks.append(record.pk)
+                changed_zone_ids.add(record.zone_id)
+                if record.ptr_record is not None:
+                    delete_pks.append(record.ptr_record.pk)
+                    changed_zone_ids.add(record.ptr_record.zone_id)
+
+            Record.objects.filter(pk__in=delete_pks).delete()
+
+        Record.objects.bulk_create(create_records, batch_size=self.batch_size)
+        Record.objects.bulk_update(
+            update_records,
+            [
+                "zone",
+                "name",
+                "type",
+                "value",
+                "canonical_value",
+                "ip_address",
+                "status",
+            ],
+            batch_size=self.batch_size,
+        )
+
+        record_pks = [record.pk for record in create_records + update_records]
+        update_ptr_records(
+            Record.objects.filter(pk__in=record_pks), batch_size=self.batch_size
+        )
+        update_serials(changed_zone_ids)
+
+        cache_objects(
+            Record.objects.select_related("zone"),
+            record_pks,
+            batch_size=self.batch_size,
+        )
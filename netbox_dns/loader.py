@@ -0,0 +1,319 @@
+import csv
+import io
+from itertools import groupby
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+
+from netbox_dns.bulk import (
+    BATCH_SIZE,
+    check_conflicts,
+    update_ptr_records,
+    update_serials,
+)
+from netbox_dns.models import Record, RecordStatusChoices, Zone
+from netbox_dns.search import cache_objects, uncache_objects
+from netbox_dns.utilities import arpa_to_prefix
+
+
+STAGING_TABLE = "netbox_dns_record_staging"
+
+STAGING_COLUMNS = (
+    "zone_id",
+    "name",
+    "type",
+    "value",
+    "canonical_value",
+    "status",
+    "ttl",
+    "disable_ptr",
+    "description",
+    "ip_address",
+)
+
+MATCH_CONDITION = (
+    "r.zone_id = s.zone_id AND r.name = s.name "
+    "AND r.type = s.type AND r.canonical_value = s.canonical_value "
+    "AND NOT r.managed"
+)
+
+
+class IteratorFile(io.TextIOBase):
+    """Read-only file object returning the strings produced by an iterator"""
+
+    def __init__(self, iterator):
+        self.iterator = iterator
+        self.buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            try:
+                self.buffer += next(self.iterator)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self.buffer)
+
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+class RecordLoader:
+    """
+    Load large numbers of records using PostgreSQL COPY.
+
+    The records are validated in Python and streamed into a temporary staging
+    table with COPY FROM STDIN. The staging table is then merged into the
+    record table with one UPDATE, one INSERT and, when replacing the records
+    of the zones, one DELETE statement. PTR records and SOA serials are fixed
+    up afterwards once per batch and zone instead of once per record.
+    """
+
+    def __init__(self, replace=False, batch_size=BATCH_SIZE):
+        self.replace = replace
+        self.batch_size = batch_size
+
+        self.zone_ids = set()
+        self.changed_pks = []
+        self.errors = []
+        self.loaded = 0
+        self.created = 0
+        self.updated = 0
+        self.deleted = 0
+
+    def load(self, records):
+        """
+        Load an iterable of unsaved Record instances, which must have their
+        zone set
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {STAGING_TABLE} ("
+                    "zone_id bigint NOT NULL, "
+                    "name varchar(255) NOT NULL, "
+                    "type varchar(10) NOT NULL, "
+                    "value varchar(1000) NOT NULL, "
+                    "canonical_value bytea NOT NULL, "
+                    "status varchar(50) NOT NULL, "
+                    "ttl integer, "
+                    "disable_ptr boolean NOT NULL, "
+                    "description varchar(200) NOT NULL, "
+                    "ip_address inet"
+                    ") ON COMMIT DROP"
+                )
+
+                cursor.copy_expert(
+                    f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) "
+                    "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (description))",
+                    IteratorFile(self.rows(records)),
+                )
+
+                if self.errors:
+                    raise ValidationError(self.errors)
+
+                cursor.execute(f"ANALYZE {STAGING_TABLE}")
+                self.merge(cursor)
+
+            self.check_conflicts()
+            if self.errors:
+                raise ValidationError(self.errors)
+
+            update_ptr_records(
+                Record.objects.filter(pk__in=self.changed_pks),
+                batch_size=self.batch_size,
+            )
+
+            update_serials(self.zone_ids)
+
+            cache_objects(
+                Record.objects.select_related("zone"),
+                self.changed_pks,
+                batch_size=self.batch_size,
+            )
+
+    def rows(self, records):
+        line = io.StringIO()
+        writer = csv.writer(line)
+
+        for record in records:
+            try:
+                self.validate(record)
+            except ValidationError as exc:
+                self.errors.append(f"{record}: {', '.join(exc.messages)}")
+                continue
+
+            self.zone_ids.add(record.zone_id)
+            self.loaded += 1
+
+            writer.writerow(
+                (
+                    record.zone_id,
+                    record.name,
+                    record.type,
+                    record.value,
+                    f"\\x{bytes(record.canonical_value).hex()}",
+                    record.status,
+                    "" if record.ttl is None else record.ttl,
+                    record.disable_ptr,
+                    record.description,
+                    "" if record.ip_address is None else record.ip_address,
+                )
+            )
+            yield line.getvalue()
+
+            line.seek(0)
+            line.truncate()
+
+    def validate(self, record):
+        record.type = record.type.upper()
+        if not record.status:
+            record.status = RecordStatusChoices.STATUS_ACTIVE
+
+        record.validate_name()
+        record.validate_value()
+
+        if record.is_address_record:
+            record.ip_address = record.value
+        elif record.is_ptr_record:
+            prefix = arpa_to_prefix(record.fqdn)
+            record.ip_address = prefix.ip if prefix is not None else None
+        else:
+            record.ip_address = None
+
+    def check_conflicts(self):
+        """
+        Check the active records with the names of the loaded records after
+        the merge, which contain both the existing and the loaded records,
+        the same way Record.clean() does for single records. The records of
+        each name are checked in the order they were created, so conflicts
+        are reported for the loaded records.
+        """
+        table = Record._meta.db_table
+        records = (
+            Record.objects.filter(active=True)
+            .annotate(
+                loaded=RawSQL(
+                    f"EXISTS (SELECT 1 FROM {STAGING_TABLE} s "
+                    f"WHERE s.zone_id = {table}.zone_id AND s.name = {table}.name)",
+                    [],
+                    output_field=BooleanField(),
+                )
+            )
+            .filter(loaded=True)
+            .select_related("zone")
+            .only("pk", "zone", "name", "type", "status")
+            .order_by("zone_id", "name", "pk")
+        )
+
+        for _, name_records in groupby(
+            records.iterator(chunk_size=self.batch_size),
+            key=lambda record: (record.zone_id, record.name),
+        ):
+            name_records = list(name_records)
+            for position, message in check_conflicts(name_records, {}).items():
+                self.errors.append(f"{name_records[position]}: {message}")
+
+    def merge(self, cursor):
+        table = Record._meta.db_table
+
+        cursor.execute(
+            f"UPDATE {table} r SET "
+            "value = s.value, ttl = s.ttl, status = s.status, "
+            "disable_ptr = s.disable_ptr, description = s.description, "
+            "ip_address = s.ip_address, "
+            "last_updated = now() "
+            f"FROM {STAGING_TABLE} s WHERE {MATCH_CONDITION} AND ("
+            "r.value <> s.value OR r.ttl IS DISTINCT FROM s.ttl "
+            "OR r.status <> s.status "
+            "OR r.disable_ptr <> s.disable_ptr OR r.description <> s.description "
+            "OR r.ip_address IS DISTINCT FROM s.ip_address) "
+            "RETURNING r.id"
+        )
+        self.changed_pks = [pk for pk, in cursor.fetchall()]
+        self.updated = len(self.changed_pks)
+
+        cursor.execute(
+            f"INSERT INTO {table} ("
+            "created, last_updated, custom_field_data, managed, "
+            f"{', '.join(STAGING_COLUMNS)}) "
+            "SELECT DISTINCT ON (s.zone_id, s.name, s.type, s.canonical_value) "
+            "now(), now(), '{}'::jsonb, false, "
+            f"{', '.join('s.' + column for column in STAGING_COLUMNS)} "
+            f"FROM {STAGING_TABLE} s WHERE NOT EXISTS ("
+            f"SELECT 1 FROM {table} r WHERE {MATCH_CONDITION}) "
+            "RETURNING id"
+        )
+        created_pks = [pk for pk, in cursor.fetchall()]
+        self.changed_pks += created_pks
+        self.created = len(created_pks)
+
+        if not self.replace:
+            return
+
+        cursor.execute(
+            f"WITH deleted AS (DELETE FROM {table} r "
+            f"WHERE r.zone_id IN (SELECT DISTINCT zone_id FROM {STAGING_TABLE}) "
+            "AND NOT r.managed AND NOT EXISTS ("
+            f"SELECT 1 FROM {STAGING_TABLE} s WHERE {MATCH_CONDITION}) "
+            "RETURNING r.id, r.ptr_record_id), "
+            f"deleted_ptr AS (DELETE FROM {table} p "
+            "WHERE p.id IN (SELECT ptr_record_id FROM deleted) "
+            "RETURNING p.id, p.zone_id) "
+            "SELECT id, NULL FROM deleted "
+            "UNION ALL SELECT id, zone_id FROM deleted_ptr"
+        )
+        deleted = cursor.fetchall()
+        self.deleted = sum(1 for _, ptr_zone_id in deleted if ptr_zone_id is None)
+        self.zone_ids |= {
+            ptr_zone_id for _, ptr_zone_id in deleted if ptr_zone_id is not None
+        }
+
+        if deleted:
+            deleted_pks = [pk for pk, _ in deleted]
+            cursor.execute(
+                "DELETE FROM extras_taggeditem "
+                "WHERE content_type_id = %s AND object_id = ANY(%s)",
+                [ContentType.objects.get_for_model(Record).pk, deleted_pks],
+            )
+            uncache_objects(Record, deleted_pks)
+
+
+def read_csv_records(csvfile):
+    """
+    Read records from a CSV file with the columns zone, view, name, type,
+    value and optionally ttl, status, disable_ptr and description.
+
+    All zones are resolved with a single query.
+    """
+    zones = {
+        (zone.view.name if zone.view else None, zone.name): zone
+        for zone in Zone.objects.select_related("view")
+    }
+
+    for row in csv.DictReader(csvfile):
+        try:
+            zone = zones[(row.get("view") or None, row["zone"])]
+        except KeyError:
+            raise ValidationError(
+                f"Zone {row['zone']} not found in view {row.get('view') or 'none'}"
+            ) from None
+
+        yield Record(
+            zone=zone,
+            name=row["name"],
+            type=row["type"],
+            value=row["value"],
+            ttl=int(row["ttl"]) if row.get("ttl") else None,
+            status=row.get("status") or RecordStatusChoices.STATUS_ACTIVE,
+            disable_ptr=row.get("disable_ptr", "").lower() in ("true", "1", "yes"),
+            description=row.get("description") or "",
+        )
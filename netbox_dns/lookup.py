@@ -0,0 +1,154 @@
+import ipaddress
+
+from dns import name as dns_name
+from dns.exception import DNSException
+
+from netbox_dns.bulk import PTRZoneIndex
+from netbox_dns.models import Record, RecordTypeChoices, View, Zone
+from netbox_dns.utilities import BATCH_SIZE, batched
+
+
+class LookupResult:
+    """The zones, records and PTR records found for one name or address"""
+
+    def __init__(self, query, query_type, error=None):
+        self.query = query
+        self.query_type = query_type
+        self.error = error
+        self.zones = []
+        self.records = []
+        self.ptr_records = []
+
+
+class RecordLookup:
+    """
+    Look up the records for large numbers of names and IP addresses with a
+    constant number of queries per batch instead of one query per name.
+
+    Names are matched against the records at that name in the closest
+    enclosing zone of each view, addresses against the address and PTR
+    records for the address. Without a view, all views are searched.
+    """
+
+    def __init__(self, view=None, user=None, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+
+        self.zones = Zone.objects.all()
+        self.records = Record.objects.all()
+        if user is not None:
+            self.zones = self.zones.restrict(user, "view")
+            self.records = self.records.restrict(user, "view")
+
+        if view is not None:
+            self.zones = self.zones.filter(view=view)
+            self.records = self.records.filter(zone__view=view)
+            self.view_ids = [view.pk]
+        else:
+            self.view_ids = [None, *View.objects.values_list("pk", flat=True)]
+
+        self.records = self.records.select_related(
+            "zone__view", "ptr_record__zone__view"
+        )
+        self.ptr_zone_index = None
+
+    def lookup_names(self, names):
+        """Yield a LookupResult for each name of an iterable of names"""
+        for batch in batched(names, self.batch_size):
+            yield from self.lookup_name_batch(batch)
+
+    def lookup_addresses(self, addresses):
+        """Yield a LookupResult for each address of an iterable of addresses"""
+        for batch in batched(addresses, self.batch_size):
+            yield from self.lookup_address_batch(batch)
+
+    def lookup_name_batch(self, names):
+        results = []
+        fqdns = {}
+        for name in names:
+            try:
+                fqdn = dns_name.from_text(name).canonicalize()
+            except DNSException as exc:
+                results.append(LookupResult(name, "name", error=str(exc)))
+                continue
+
+            results.append(LookupResult(name, "name"))
+            fqdns[name] = fqdn
+
+        zone_names = set()
+        for fqdn in fqdns.values():
+            while fqdn != dns_name.root:
+                zone_names.add(fqdn.to_text(omit_final_dot=True))
+                fqdn = fqdn.parent()
+
+        zones = {}
+        for zone in self.zones.filter(name__in=zone_names).select_related("view"):
+            zones.setdefault(dns_name.from_text(zone.name), []).append(zone)
+
+        matches = {}
+        for name, fqdn in fqdns.items():
+            matches[name] = []
+            views = set()
+            parent = fqdn
+            while parent != dns_name.root:
+                for zone in zones.get(parent, []):
+                    if zone.view_id not in views:
+                        views.add(zone.view_id)
+                        matches[name].append((zone, fqdn.relativize(parent).to_text()))
+                parent = parent.parent()
+
+        keys = {(zone.pk, name) for match in matches.values() for zone, name in match}
+        records = {}
+        for record in self.records.filter(
+            zone__in={zone_pk for zone_pk, _ in keys},
+            name__in={name for _, name in keys},
+        ):
+            if (record.zone_id, record.name) in keys:
+                records.setdefault((record.zone_id, record.name), []).append(record)
+
+        for result in results:
+            for zone, name in matches.get(result.query, []):
+                result.zones.append(zone)
+                for record in records.get((zone.pk, name), []):
+                    result.records.append(record)
+                    if record.ptr_record is not None:
+                        result.ptr_records.append(record.ptr_record)
+
+        return results
+
+    def lookup_address_batch(self, addresses):
+        if self.ptr_zone_index is None:
+            self.ptr_zone_index = PTRZoneIndex(self.zones.select_related("view"))
+
+        results = []
+        ips = {}
+        for address in addresses:
+            try:
+                ip = str(ipaddress.ip_address(address))
+            except ValueError as exc:
+                results.append(LookupResult(address, "address", error=str(exc)))
+                continue
+
+            results.append(LookupResult(address, "address"))
+            ips[address] = ip
+
+        records = {}
+        for record in self.records.filter(ip_address__in=set(ips.values())):
+            records.setdefault(str(record.ip_address), []).append(record)
+
+        for result in results:
+            ip = ips.get(result.query)
+            if ip is None:
+                continue
+
+            for view_id in self.view_ids:
+                zone, _ = self.ptr_zone_index.get(view_id, ip)
+                if zone is not None:
+                    result.zones.append(zone)
+
+            for record in records.get(ip, []):
+                if record.type == RecordTypeChoices.PTR:
+                    result.ptr_records.append(record)
+                else:
+                    result.records.append(record)
+
+        return results
@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from netbox_dns.benchmark import SEARCH_QUERIES, search_benchmark
+
+
+class Command(BaseCommand):
+    help = "Measure search latency with and without trigram indexes on synthetic data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--records",
+            type=int,
+            default=1000000,
+            help="Number of synthetic records to generate",
+        )
+        parser.add_argument(
+            "--zones",
+            type=int,
+            default=1000,
+            help="Number of synthetic zones to generate",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Number of runs per query, the best time is reported",
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help=f"Search term to measure (default: {', '.join(SEARCH_QUERIES)})",
+        )
+        parser.add_argument("--output", help="Write the results as JSON to a file")
+
+    def handle(self, *model_names, **options):
+        results = search_benchmark(
+            records=options["records"],
+            zones=options["zones"],
+            iterations=options["iterations"],
+            queries=options["queries"],
+        )
+
+        for query, indexed in results["indexed"].items():
+            unindexed = results["unindexed"][query]
+            for measurement, duration in indexed.items():
+                self.stdout.write(
+                    f"{query:20} {measurement:15} "
+                    f"{duration:10.2f} ms {unindexed[measurement]:10.2f} ms"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=4)
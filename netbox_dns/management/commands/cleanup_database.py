@@ -1,16 +1,15 @@
-import dns
-from dns import rdtypes, rdata, rdatatype, rdataclass
-
-from netaddr import IPAddress, IPNetwork, AddrFormatError
-
 from django.core.management.base import BaseCommand
 
+from netbox_dns.bulk import (
+    update_canonical_values,
+    update_ip_addresses,
+    update_ptr_records,
+)
 from netbox_dns.models import (
     Zone,
     ZoneStatusChoices,
     Record,
     RecordTypeChoices,
-    RecordClassChoices,
 )
 
 
@@ -97,30 +96,7 @@ def zone_update_soa_records(verbose=False):
 
 def zone_update_arpa_network(verbose=False):
     for zone in Zone.objects.filter(name__endswith=".arpa"):
-        name = zone.name
-
-        # TODO: Rewrite with utility function
-        if name.endswith(".in-addr.arpa"):
-            address = ".".join(reversed(name.replace(".in-addr.arpa", "").split(".")))
-            mask = len(address.split(".")) * 8
-
-            try:
-                prefix = IPNetwork(f"{address}/{mask}")
-            except AddrFormatError:
-                prefix = None
-
-        elif name.endswith("ip6.arpa"):
-            address = "".join(reversed(name.replace(".ip6.arpa", "").split(".")))
-            mask = len(address)
-            address = address + "0" * (32 - mask)
-
-            try:
-                prefix = IPNetwork(
-                    f"{':'.join([(address[i:i+4]) for i in range(0, 32, 4)])}/{mask*4}"
-                )
-            except AddrFormatError:
-                prefix = None
-        # TODO: End
+        prefix = zone.network_from_name
 
         if zone.arpa_network != prefix:
             if verbose:
@@ -138,32 +114,21 @@ def record_cleanup_disable_ptr(verbose=False):
 
 
 def record_update_ptr_records(verbose=False):
-    for record in Record.objects.filter(
-        type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA)
-    ):
-        record.update_ptr_record()
+    changed_zone_ids = update_ptr_records(Record.objects.all())
+    if verbose and changed_zone_ids:
+        print(f"Updated PTR records in {len(changed_zone_ids)} zones")
 
 
 def record_update_ip_address(verbose=False):
-    for record in Record.objects.filter(
-        type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA, RecordTypeChoices.PTR)
-    ):
-        if record.is_ptr_record:
-            if record.ip_address != record.address_from_name:
-                if verbose:
-                    print(
-                        f"Updating IP address of pointer record {record} to {record.address_from_name}"
-                    )
-                record.ip_address = record.address_from_name
-                record.save()
-        else:
-            if record.ip_address != IPAddress(record.value):
-                if verbose:
-                    print(
-                        f"Updating IP address of address record {record} to {IPAddress(record.value)}"
-                    )
-                record.ip_address = record.value
-                record.save()
+    updated = update_ip_addresses(Record.objects.all())
+    if verbose and updated:
+        print(f"Updated IP addresses of {updated} address and pointer records")
+
+
+def record_update_canonical_values(verbose=False):
+    updated = update_canonical_values(Record.objects.filter(canonical_value=None))
+    if verbose and updated:
+        print(f"Updated canonical values of {updated} records")
 
 
 class Command(BaseCommand):
@@ -182,5 +147,6 @@ class Command(BaseCommand):
         record_cleanup_disable_ptr(options["verbose"])
         record_update_ptr_records(options["verbose"])
         record_update_ip_address(options["verbose"])
+        record_update_canonical_values(options["verbose"])
 
         self.stdout.write("Database cleanup completed.")
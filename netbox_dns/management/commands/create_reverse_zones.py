@@ -0,0 +1,81 @@
+from netaddr import AddrFormatError, IPNetwork
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dns.importer import create_reverse_zones
+from netbox_dns.models import View
+from netbox_dns.utilities import BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Create the reverse zones covering IP prefixes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "prefixes",
+            nargs="+",
+            metavar="PREFIX",
+            help="Prefix to create the reverse zones for",
+        )
+        parser.add_argument(
+            "--prefix-length",
+            type=int,
+            help="Minimum prefix length of the reverse zones, rounded up to an octet or nibble boundary",
+        )
+        parser.add_argument(
+            "--view",
+            help="Name of the view for the reverse zones",
+        )
+        parser.add_argument(
+            "--nameserver",
+            action="append",
+            dest="nameservers",
+            help="Name server for the reverse zones (default: the zone_nameservers setting)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of objects per batch",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Increase output verbosity"
+        )
+
+    def handle(self, *model_names, **options):
+        view = None
+        if options["view"]:
+            try:
+                view = View.objects.get(name=options["view"])
+            except View.DoesNotExist:
+                raise CommandError(f"View {options['view']} does not exist")
+
+        prefixes = []
+        for prefix in options["prefixes"]:
+            try:
+                prefixes.append(IPNetwork(prefix).cidr)
+            except (AddrFormatError, ValueError):
+                raise CommandError(f"{prefix} is not a valid prefix")
+
+        created = 0
+        for prefix in prefixes:
+            try:
+                zones = create_reverse_zones(
+                    prefix,
+                    prefixlen=options["prefix_length"],
+                    view=view,
+                    nameservers=options["nameservers"],
+                    batch_size=options["batch_size"],
+                )
+            except ValidationError as exc:
+                raise CommandError("\n".join(exc.messages))
+
+            if options["verbose"]:
+                self.stdout.write(f"Created {len(zones)} reverse zones for {prefix}")
+                for zone in zones:
+                    self.stdout.write(f"+ {zone.name}")
+
+            created += len(zones)
+
+        self.stdout.write(f"{created} reverse zones have been created.")
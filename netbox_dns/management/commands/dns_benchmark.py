@@ -0,0 +1,104 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dns.benchmark import BENCHMARKS, DNSBenchmark
+
+
+class Command(BaseCommand):
+    help = "Measure the performance of NetBox DNS operations on synthetic data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "benchmarks",
+            nargs="*",
+            metavar="BENCHMARK",
+            help=f"Benchmark to run (default: all of {', '.join(BENCHMARKS)})",
+        )
+        parser.add_argument(
+            "--views",
+            type=int,
+            default=10,
+            help="Number of synthetic views to generate",
+        )
+        parser.add_argument(
+            "--zones",
+            type=int,
+            default=1000,
+            help="Number of synthetic forward zones to generate",
+        )
+        parser.add_argument(
+            "--reverse-zones",
+            type=int,
+            default=256,
+            help="Number of synthetic /24 reverse zones to generate",
+        )
+        parser.add_argument(
+            "--records",
+            type=int,
+            default=1000000,
+            help="Number of synthetic records to generate",
+        )
+        parser.add_argument(
+            "--ptr-records",
+            type=int,
+            default=10000,
+            help="Number of synthetic records with PTR records enabled",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Number of runs per benchmark",
+        )
+        parser.add_argument(
+            "--import-size",
+            type=int,
+            default=1000,
+            help="Number of records per bulk import",
+        )
+        parser.add_argument("--output", help="Write the results as JSON to a file")
+
+    def handle(self, *model_names, **options):
+        benchmarks = options["benchmarks"] or BENCHMARKS
+        for benchmark in benchmarks:
+            if benchmark not in BENCHMARKS:
+                raise CommandError(f"Unknown benchmark {benchmark}")
+
+        if options["iterations"] > options["zones"]:
+            raise CommandError("The number of iterations exceeds the number of zones")
+
+        results = DNSBenchmark(
+            views=options["views"],
+            zones=options["zones"],
+            reverse_zones=options["reverse_zones"],
+            records=options["records"],
+            ptr_records=options["ptr_records"],
+            iterations=options["iterations"],
+            import_size=options["import_size"],
+        ).run(benchmarks)
+
+        for step, duration in results["setup"].items():
+            self.stdout.write(f"{'setup':20} {step:40} {duration:10.2f} ms")
+
+        for benchmark, result in results["results"].items():
+            for name, timings in self.flatten(result):
+                if isinstance(timings, dict):
+                    self.stdout.write(
+                        f"{benchmark:20} {name:40} {timings['min']:10.2f} ms "
+                        f"{timings['median']:10.2f} ms {timings['max']:10.2f} ms"
+                    )
+                else:
+                    self.stdout.write(f"{benchmark:20} {name:40} {timings:10.2f} ms")
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=4)
+
+    def flatten(self, result, prefix=""):
+        if not isinstance(result, dict) or set(result) == {"min", "median", "max"}:
+            yield prefix or "-", result
+            return
+
+        for key, value in result.items():
+            yield from self.flatten(value, f"{prefix}.{key}" if prefix else key)
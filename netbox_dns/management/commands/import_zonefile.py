@@ -0,0 +1,55 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dns.bulk import BATCH_SIZE
+from netbox_dns.models import View
+from netbox_dns.zonefile import ZoneFileImporter
+
+
+class Command(BaseCommand):
+    help = "Import a zone from a DNS master file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("zonefile", help="Path of the zone file to import")
+        parser.add_argument(
+            "--origin",
+            help="Name of the zone, if not defined by $ORIGIN in the zone file",
+        )
+        parser.add_argument("--view", help="Name of the view to create the zone in")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of records inserted per batch",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Increase output verbosity"
+        )
+
+    def handle(self, *model_names, **options):
+        view = None
+        if options["view"] is not None:
+            try:
+                view = View.objects.get(name=options["view"])
+            except View.DoesNotExist:
+                raise CommandError(f"View {options['view']} does not exist")
+
+        importer = ZoneFileImporter(
+            origin=options["origin"], view=view, batch_size=options["batch_size"]
+        )
+
+        try:
+            with open(options["zonefile"]) as zonefile:
+                zone = importer.import_zonefile(zonefile)
+        except OSError as exc:
+            raise CommandError(f"Cannot read zone file: {exc}")
+        except ValidationError as exc:
+            raise CommandError("\n".join(exc.messages))
+
+        if options["verbose"]:
+            self.stdout.write(
+                f"Imported {importer.record_count} records and "
+                f"{len(importer.nameservers)} nameservers"
+            )
+
+        self.stdout.write(f"Zone {zone} has been imported")
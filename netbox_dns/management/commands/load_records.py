@@ -0,0 +1,51 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dns.bulk import BATCH_SIZE
+from netbox_dns.loader import RecordLoader, read_csv_records
+
+
+class Command(BaseCommand):
+    help = "Bulk load records from a CSV file using PostgreSQL COPY"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "csvfile",
+            help="CSV file with the columns zone, view, name, type, value and optionally ttl, status, disable_ptr and description",
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Delete records of the loaded zones that are not contained in the CSV file",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of records per batch for updating PTR records",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Increase output verbosity"
+        )
+
+    def handle(self, *model_names, **options):
+        loader = RecordLoader(
+            replace=options["replace"], batch_size=options["batch_size"]
+        )
+
+        try:
+            with open(options["csvfile"], newline="") as csvfile:
+                loader.load(read_csv_records(csvfile))
+        except OSError as exc:
+            raise CommandError(f"Cannot read CSV file: {exc}")
+        except ValidationError as exc:
+            raise CommandError("\n".join(exc.messages))
+
+        if options["verbose"]:
+            self.stdout.write(
+                f"Loaded {loader.loaded} records into {len(loader.zone_ids)} zones: "
+                f"{loader.created} created, {loader.updated} updated, "
+                f"{loader.deleted} deleted"
+            )
+
+        self.stdout.write("Records have been loaded.")
@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dns.models import NameServer, Record, View, Zone
+from netbox_dns.search import cache_objects
+from netbox_dns.utilities import BATCH_SIZE
+
+
+SEARCH_MODELS = {
+    "view": View.objects.all(),
+    "nameserver": NameServer.objects.all(),
+    "zone": Zone.objects.select_related("view", "soa_mname"),
+    "record": Record.objects.select_related("zone"),
+}
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search cache for NetBox DNS objects in resumable batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help=f"Models to reindex: {', '.join(SEARCH_MODELS.keys())} (default: all)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of objects per batch, each batch is committed separately",
+        )
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            help="Resume after the object with this ID, requires a single model",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Increase output verbosity"
+        )
+
+    def handle(self, *args, **options):
+        models = options["models"] or list(SEARCH_MODELS.keys())
+        start_after = options["start_after"]
+
+        for model in models:
+            if model not in SEARCH_MODELS:
+                raise CommandError(f"Unknown model {model}")
+
+        if start_after is not None and len(models) != 1:
+            raise CommandError("--start-after can only be used with a single model")
+
+        for model in models:
+            count = 0
+            for last_pk, cached in self.reindex(
+                SEARCH_MODELS[model], options["batch_size"], start_after
+            ):
+                count += cached
+                if options["verbose"]:
+                    self.stdout.write(
+                        f"{model}: {count} values cached, last ID {last_pk}"
+                    )
+
+            self.stdout.write(f"{model}: {count} values cached")
+
+        self.stdout.write("The search cache has been rebuilt.")
+
+    def reindex(self, queryset, batch_size, start_after):
+        """
+        Cache the objects in batches ordered by primary key, so an interrupted
+        run can be resumed with --start-after and the last ID reported
+        """
+        pks = queryset.order_by("pk").values_list("pk", flat=True)
+
+        while True:
+            if start_after is not None:
+                batch = list(pks.filter(pk__gt=start_after)[:batch_size])
+            else:
+                batch = list(pks[:batch_size])
+
+            if not batch:
+                break
+
+            yield batch[-1], cache_objects(queryset, batch, batch_size=batch_size)
+            start_after = batch[-1]
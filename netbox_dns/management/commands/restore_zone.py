@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dns.bulk import BATCH_SIZE
+from netbox_dns.models import View, Zone, ZoneSnapshot
+from netbox_dns.snapshot import SnapshotRestorer
+
+
+class Command(BaseCommand):
+    help = "Restore the records of a zone to a snapshot at an earlier SOA serial"
+
+    def add_arguments(self, parser):
+        parser.add_argument("zone", help="Name of the zone to restore")
+        parser.add_argument("serial", type=int, help="SOA serial of the snapshot")
+        parser.add_argument("--view", help="Name of the view of the zone")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of records written per batch",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Increase output verbosity"
+        )
+
+    def handle(self, *model_names, **options):
+        view = None
+        if options["view"] is not None:
+            try:
+                view = View.objects.get(name=options["view"])
+            except View.DoesNotExist:
+                raise CommandError(f"View {options['view']} does not exist")
+
+        try:
+            zone = Zone.objects.get(name=options["zone"], view=view)
+        except Zone.DoesNotExist:
+            raise CommandError(f"Zone {options['zone']} does not exist")
+
+        restorer = SnapshotRestorer(zone, batch_size=options["batch_size"])
+        try:
+            restorer.restore(options["serial"])
+        except ZoneSnapshot.DoesNotExist:
+            raise CommandError(
+                f"No snapshot of zone {zone} at serial {options['serial']}"
+            )
+
+        if options["verbose"]:
+            self.stdout.write(
+                f"Created {restorer.created}, updated {restorer.updated} and "
+                f"deleted {restorer.deleted} records"
+            )
+
+        self.stdout.write(
+            f"Zone {zone} has been restored to serial {options['serial']}, "
+            f"the new serial is {zone.soa_serial}"
+        )
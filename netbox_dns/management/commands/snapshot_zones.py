@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dns.models import View, Zone
+from netbox_dns.snapshot import create_snapshot
+
+
+class Command(BaseCommand):
+    help = "Store snapshots of the records of zones at their current SOA serial"
+
+    def add_arguments(self, parser):
+        parser.add_argument("zones", nargs="*", help="Names of the zones to snapshot")
+        parser.add_argument("--view", help="Name of the view of the zones")
+        parser.add_argument(
+            "--verbose", action="store_true", help="Increase output verbosity"
+        )
+
+    def handle(self, *model_names, **options):
+        zones = Zone.objects.all()
+
+        if options["view"] is not None:
+            try:
+                zones = zones.filter(view=View.objects.get(name=options["view"]))
+            except View.DoesNotExist:
+                raise CommandError(f"View {options['view']} does not exist")
+
+        if options["zones"]:
+            zones = zones.filter(name__in=options["zones"])
+
+        count = 0
+        for zone in zones.select_related("view"):
+            snapshot = create_snapshot(zone)
+            count += 1
+
+            if options["verbose"]:
+                self.stdout.write(
+                    f"Stored snapshot of zone {zone} at serial {snapshot.serial} "
+                    f"with {snapshot.record_count} records"
+                )
+
+        self.stdout.write(f"Stored snapshots of {count} zones")
@@ -0,0 +1,102 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ipam.models import VRF
+
+from netbox_dns.bulk import BATCH_SIZE
+from netbox_dns.ipam_sync import IPAMDNSSync
+from netbox_dns.models import View
+
+
+class Command(BaseCommand):
+    help = "Synchronize DNS names in IPAM with address records in NetBox DNS"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "direction",
+            choices=("dns", "ipam"),
+            help="Update address records in DNS from IPAM ('dns') or DNS names in IPAM from DNS ('ipam')",
+        )
+        parser.add_argument(
+            "--map",
+            action="append",
+            dest="mappings",
+            metavar="VRF:VIEW",
+            help="Synchronize the IP addresses in VRF with the zones in VIEW, an empty name stands for the global VRF or no view (default ':')",
+        )
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Overwrite existing address records or DNS names",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the changes, do not apply them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of objects per batch when applying changes",
+        )
+        parser.add_argument(
+            "--verbose", action="store_true", help="Increase output verbosity"
+        )
+
+    def handle(self, *model_names, **options):
+        for vrf, view in self.get_mappings(options["mappings"] or [":"]):
+            sync = IPAMDNSSync(
+                vrf=vrf,
+                view=view,
+                overwrite=options["overwrite"],
+                batch_size=options["batch_size"],
+            )
+
+            if options["direction"] == "dns":
+                diff = sync.diff_dns()
+            else:
+                diff = sync.diff_ipam()
+
+            if options["verbose"] or options["dry_run"]:
+                self.stdout.write(
+                    f"VRF {vrf or 'global'} -> view {view or 'none'}: "
+                    f"{len(diff.create)} to create, {len(diff.update)} to update, "
+                    f"{len(diff.conflicts)} conflicts"
+                )
+                for line in diff.report():
+                    self.stdout.write(line)
+
+            if options["dry_run"]:
+                continue
+
+            if options["direction"] == "dns":
+                sync.apply_dns(diff)
+            else:
+                sync.apply_ipam(diff)
+
+        if not options["dry_run"]:
+            self.stdout.write("IPAM and DNS have been synchronized.")
+
+    def get_mappings(self, mappings):
+        for mapping in mappings:
+            vrf_name, separator, view_name = mapping.partition(":")
+            if not separator:
+                raise CommandError(f"Invalid mapping {mapping}, expected VRF:VIEW")
+
+            vrf = None
+            if vrf_name:
+                try:
+                    vrf = VRF.objects.get(name=vrf_name)
+                except VRF.DoesNotExist:
+                    raise CommandError(f"VRF {vrf_name} does not exist")
+                except VRF.MultipleObjectsReturned:
+                    raise CommandError(f"VRF name {vrf_name} is not unique")
+
+            view = None
+            if view_name:
+                try:
+                    view = View.objects.get(name=view_name)
+                except View.DoesNotExist:
+                    raise CommandError(f"View {view_name} does not exist")
+
+            yield vrf, view
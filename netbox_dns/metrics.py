@@ -0,0 +1,112 @@
+import os
+
+from django.db import connection
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from netbox_dns.models import View, Zone
+
+COUNTER_TABLE = "netbox_dns_zonerecordcount"
+
+DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+registry = CollectorRegistry()
+
+operations = Counter(
+    "netbox_dns_operations",
+    "Number of instrumented NetBox DNS operations",
+    ["operation", "error"],
+    registry=registry,
+)
+durations = Histogram(
+    "netbox_dns_operation_duration_seconds",
+    "Duration of instrumented NetBox DNS operations",
+    ["operation"],
+    buckets=DURATION_BUCKETS,
+    registry=registry,
+)
+
+
+def observe(name, duration, labels):
+    """Instrumentation hook recording a span in the metrics"""
+    operations.labels(
+        operation=name, error=str(labels.get("error", False)).lower()
+    ).inc()
+    durations.labels(operation=name).observe(duration)
+
+
+def get_object_counts():
+    """
+    Return (view name, zone count, record count) for all views with zones.
+
+    The record counts are read from the per-zone counters maintained by
+    database triggers, so the query only touches the zone table and never
+    scans the records.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT dns_view.name, COUNT(dns_zone.id), COALESCE(SUM(counter.count), 0) "
+            f"FROM {Zone._meta.db_table} AS dns_zone "
+            f"LEFT JOIN {View._meta.db_table} AS dns_view "
+            "ON dns_view.id = dns_zone.view_id "
+            f"LEFT JOIN {COUNTER_TABLE} AS counter ON counter.zone_id = dns_zone.id "
+            "GROUP BY dns_view.name ORDER BY dns_view.name NULLS FIRST"
+        )
+        return cursor.fetchall()
+
+
+class ObjectCountCollector:
+    def collect(self):
+        zones = GaugeMetricFamily(
+            "netbox_dns_zones", "Number of zones per view", labels=["view"]
+        )
+        records = GaugeMetricFamily(
+            "netbox_dns_records", "Number of records per view", labels=["view"]
+        )
+
+        for view, zone_count, record_count in get_object_counts():
+            zones.add_metric([view or ""], zone_count)
+            records.add_metric([view or ""], record_count)
+
+        yield zones
+        yield records
+
+
+registry.register(ObjectCountCollector())
+
+
+def get_metrics():
+    """
+    Return the metrics in the Prometheus text format. With multiple worker
+    processes the operation metrics are collected from the files in
+    PROMETHEUS_MULTIPROC_DIR, the same way NetBox collects its own metrics.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(registry)
+
+    multiprocess_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(multiprocess_registry)
+    multiprocess_registry.register(ObjectCountCollector())
+
+    return generate_latest(multiprocess_registry)
@@ -0,0 +1,81 @@
+import json
+import os
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.text import slugify
+
+from extras.plugins import get_plugin_config
+
+from netbox_dns.authentication import get_user
+from netbox_dns.profiling import Profile
+
+PROFILE_HEADER = "HTTP_X_NETBOX_DNS_PROFILE"
+PROFILE_PARAMETER = "dns_profile"
+
+UI_PREFIX = f"/{settings.BASE_PATH}plugins/netbox-dns/"
+API_PREFIX = f"/{settings.BASE_PATH}api/plugins/netbox-dns/"
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests for the NetBox DNS views and API endpoints on demand.
+
+    Profiling is enabled by the feature_profiling setting and requested
+    with the X-NetBox-DNS-Profile header or the dns_profile query parameter.
+    Only staff users can profile requests. The report replaces the response
+    or, with profiling_dir set, is stored together with the cProfile data.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.profiling_requested(request):
+            return self.get_response(request)
+
+        with Profile() as profile:
+            response = self.get_response(request)
+
+        report = {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status_code": response.status_code,
+            **profile.get_report(),
+        }
+
+        profiling_dir = get_plugin_config("netbox_dns", "profiling_dir")
+        if profiling_dir is None:
+            return JsonResponse(report)
+
+        filename = os.path.join(
+            profiling_dir,
+            f"{timezone.now():%Y%m%d%H%M%S%f}-{request.method}-{slugify(request.path)}",
+        )
+        with open(f"{filename}.json", "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        profile.dump_stats(f"{filename}.prof")
+
+        response["X-NetBox-DNS-Profile"] = f"{filename}.json"
+        return response
+
+    @staticmethod
+    def profiling_requested(request):
+        if not get_plugin_config("netbox_dns", "feature_profiling"):
+            return False
+
+        if PROFILE_HEADER not in request.META and PROFILE_PARAMETER not in request.GET:
+            return False
+
+        path = request.path_info
+        if path.startswith(UI_PREFIX):
+            return request.user.is_staff
+
+        if path.startswith(API_PREFIX):
+            # API tokens are only authenticated by the view, so the token is
+            # authenticated here before profiling is started
+            user = get_user(request)
+            return user is not None and user.is_staff
+
+        return False
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def update_last_content_change(apps, schema_editor):
+    Zone = apps.get_model("netbox_dns", "Zone")
+    Record = apps.get_model("netbox_dns", "Record")
+
+    last_record_change = (
+        Record.objects.filter(zone=OuterRef("pk"))
+        .exclude(type="SOA")
+        .values("zone")
+        .annotate(last_change=Max("last_updated"))
+        .values("last_change")
+    )
+    Zone.objects.update(last_content_change=Subquery(last_record_change))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dns", "0022_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="zone",
+            name="last_content_change",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Time of the last change to a record in the zone",
+                null=True,
+                verbose_name="Last Content Change",
+            ),
+        ),
+        migrations.RunPython(
+            code=update_last_content_change, reverse_code=migrations.RunPython.noop
+        ),
+    ]
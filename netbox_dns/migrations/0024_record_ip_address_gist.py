@@ -0,0 +1,19 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dns", "0023_zone_last_content_change"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="record",
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=["ip_address"],
+                name="netbox_dns_record_ip_gist",
+                opclasses=["inet_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dns", "0024_record_ip_address_gist"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="zone",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="netbox_dns_zone_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="record",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="netbox_dns_record_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="record",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["value"],
+                name="netbox_dns_record_value_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
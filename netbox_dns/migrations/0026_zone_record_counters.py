@@ -0,0 +1,110 @@
+from django.db import migrations
+
+COUNTER_TABLE = "netbox_dns_zonerecordcount"
+
+CREATE_COUNTERS = f"""
+CREATE TABLE {COUNTER_TABLE} (
+    zone_id bigint PRIMARY KEY,
+    count bigint NOT NULL DEFAULT 0
+);
+
+INSERT INTO {COUNTER_TABLE} (zone_id, count)
+    SELECT zone_id, COUNT(*) FROM netbox_dns_record GROUP BY zone_id;
+
+CREATE FUNCTION netbox_dns_record_count_insert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO {COUNTER_TABLE} AS counter (zone_id, count)
+        SELECT zone_id, COUNT(*) FROM new_records GROUP BY zone_id ORDER BY zone_id
+        ON CONFLICT (zone_id) DO UPDATE SET count = counter.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION netbox_dns_record_count_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO {COUNTER_TABLE} AS counter (zone_id, count)
+        SELECT zone_id, -COUNT(*) FROM old_records GROUP BY zone_id ORDER BY zone_id
+        ON CONFLICT (zone_id) DO UPDATE SET count = counter.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION netbox_dns_record_count_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO {COUNTER_TABLE} AS counter (zone_id, count)
+        SELECT zone_id, SUM(delta) FROM (
+            SELECT new_records.zone_id, 1 AS delta
+                FROM old_records JOIN new_records ON old_records.id = new_records.id
+                WHERE old_records.zone_id <> new_records.zone_id
+            UNION ALL
+            SELECT old_records.zone_id, -1 AS delta
+                FROM old_records JOIN new_records ON old_records.id = new_records.id
+                WHERE old_records.zone_id <> new_records.zone_id
+        ) AS moved GROUP BY zone_id ORDER BY zone_id
+        ON CONFLICT (zone_id) DO UPDATE SET count = counter.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION netbox_dns_zone_count_delete() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM {COUNTER_TABLE} WHERE zone_id IN (SELECT id FROM old_zones);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION netbox_dns_count_truncate() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM {COUNTER_TABLE};
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER netbox_dns_record_count_insert
+    AFTER INSERT ON netbox_dns_record
+    REFERENCING NEW TABLE AS new_records
+    FOR EACH STATEMENT EXECUTE PROCEDURE netbox_dns_record_count_insert();
+
+CREATE TRIGGER netbox_dns_record_count_delete
+    AFTER DELETE ON netbox_dns_record
+    REFERENCING OLD TABLE AS old_records
+    FOR EACH STATEMENT EXECUTE PROCEDURE netbox_dns_record_count_delete();
+
+CREATE TRIGGER netbox_dns_record_count_update
+    AFTER UPDATE ON netbox_dns_record
+    REFERENCING OLD TABLE AS old_records NEW TABLE AS new_records
+    FOR EACH STATEMENT EXECUTE PROCEDURE netbox_dns_record_count_update();
+
+CREATE TRIGGER netbox_dns_zone_count_delete
+    AFTER DELETE ON netbox_dns_zone
+    REFERENCING OLD TABLE AS old_zones
+    FOR EACH STATEMENT EXECUTE PROCEDURE netbox_dns_zone_count_delete();
+
+CREATE TRIGGER netbox_dns_record_count_truncate
+    AFTER TRUNCATE ON netbox_dns_record
+    FOR EACH STATEMENT EXECUTE PROCEDURE netbox_dns_count_truncate();
+"""
+
+DROP_COUNTERS = f"""
+DROP TRIGGER netbox_dns_record_count_truncate ON netbox_dns_record;
+DROP TRIGGER netbox_dns_zone_count_delete ON netbox_dns_zone;
+DROP TRIGGER netbox_dns_record_count_update ON netbox_dns_record;
+DROP TRIGGER netbox_dns_record_count_delete ON netbox_dns_record;
+DROP TRIGGER netbox_dns_record_count_insert ON netbox_dns_record;
+DROP FUNCTION netbox_dns_count_truncate();
+DROP FUNCTION netbox_dns_zone_count_delete();
+DROP FUNCTION netbox_dns_record_count_update();
+DROP FUNCTION netbox_dns_record_count_delete();
+DROP FUNCTION netbox_dns_record_count_insert();
+DROP TABLE {COUNTER_TABLE};
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dns", "0025_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_COUNTERS, DROP_COUNTERS),
+    ]
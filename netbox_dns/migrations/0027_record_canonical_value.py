@@ -0,0 +1,58 @@
+from dns import name as dns_name
+from dns import rdata, rdataclass
+from dns.exception import DNSException
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def update_canonical_values(apps, schema_editor):
+    Record = apps.get_model("netbox_dns", "Record")
+
+    records = Record.objects.select_related("zone").only(
+        "pk", "type", "value", "zone__name"
+    )
+
+    batch = []
+    for record in records.iterator(chunk_size=BATCH_SIZE):
+        try:
+            record.canonical_value = rdata.from_text(
+                rdataclass.IN, record.type, record.value
+            ).to_digestable(dns_name.from_text(record.zone.name, origin=dns_name.root))
+        except DNSException:
+            record.canonical_value = None
+
+        batch.append(record)
+        if len(batch) >= BATCH_SIZE:
+            Record.objects.bulk_update(batch, ["canonical_value"])
+            batch = []
+
+    Record.objects.bulk_update(batch, ["canonical_value"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dns", "0026_zone_record_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="record",
+            name="canonical_value",
+            field=models.BinaryField(
+                editable=False, null=True, verbose_name="Canonical Value"
+            ),
+        ),
+        migrations.RunPython(
+            code=update_canonical_values, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="record",
+            index=models.Index(
+                fields=["zone", "name", "type", "canonical_value"],
+                name="netbox_dns_record_canonical",
+            ),
+        ),
+    ]
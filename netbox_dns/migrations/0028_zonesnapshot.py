@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dns", "0027_record_canonical_value"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ZoneSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False
+                    ),
+                ),
+                ("serial", models.BigIntegerField(verbose_name="SOA Serial")),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("record_count", models.PositiveIntegerField(default=0)),
+                ("data", models.BinaryField()),
+                (
+                    "zone",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="netbox_dns.zone",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("zone", "-serial"),
+                "unique_together": {("zone", "serial")},
+            },
+        ),
+    ]
@@ -1,7 +1,6 @@
 import ipaddress
 
 from math import ceil
-from datetime import datetime
 
 import dns
 from dns import rdata, rdatatype, rdataclass
@@ -15,32 +14,43 @@ from django.core.validators import (
     MaxValueValidator,
 )
 
+from django.contrib.postgres.indexes import GinIndex, GistIndex
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.db import models, transaction
-from django.db.models import Q, Max, ExpressionWrapper, BooleanField
+from django.db import connection, models, transaction
+from django.db.models import Q, ExpressionWrapper, BooleanField
 from django.db.models.functions import Length
 from django.urls import reverse
+from django.utils import timezone
 
 from django.db.models.signals import m2m_changed
 from django.dispatch import receiver
 
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
 from utilities.querysets import RestrictedQuerySet
 from utilities.choices import ChoiceSet
 
+from netbox.context import current_request
 from netbox.models import NetBoxModel
 from netbox.search import SearchIndex, register_search
 
 from netbox_dns.fields import NetworkField, AddressField
+from netbox_dns.instrumentation import span
+from netbox_dns.search import cache_objects
 from netbox_dns.utilities import (
+    BATCH_SIZE,
     arpa_to_prefix,
+    batched,
+    canonical_value,
     name_to_unicode,
     normalize_name,
     NameFormatError,
+    parse_rdata,
 )
 from netbox_dns.validators import (
+    get_validator,
     validate_fqdn,
     validate_domain_name,
-    validate_extended_hostname,
 )
 
 from extras.plugins import get_plugin_config
@@ -119,7 +129,11 @@ class NameServer(NetBoxModel):
                 Record.objects.filter(
                     Q(zone=zone),
                     Q(managed=True),
-                    Q(value=f"{self.name}."),
+                    Q(
+                        canonical_value=canonical_value(
+                            RecordTypeChoices.NS, f"{self.name}.", zone.name
+                        )
+                    ),
                     Q(type=RecordTypeChoices.NS),
                 ).delete()
 
@@ -169,6 +183,23 @@ class ZoneStatusChoices(ChoiceSet):
 class Zone(NetBoxModel):
     ACTIVE_STATUS_LIST = (ZoneStatusChoices.STATUS_ACTIVE,)
 
+    # Changes to these fields change the data served for the zone, so they
+    # need a new SOA serial
+    SERIAL_FIELDS = (
+        "name",
+        "view_id",
+        "status",
+        "default_ttl",
+        "soa_ttl",
+        "soa_mname_id",
+        "soa_rname",
+        "soa_refresh",
+        "soa_retry",
+        "soa_expire",
+        "soa_minimum",
+        "soa_serial_auto",
+    )
+
     view = models.ForeignKey(
         to="View",
         on_delete=models.PROTECT,
@@ -259,6 +290,13 @@ class Zone(NetBoxModel):
         blank=True,
         null=True,
     )
+    last_content_change = models.DateTimeField(
+        verbose_name="Last Content Change",
+        help_text="Time of the last change to a record in the zone",
+        blank=True,
+        null=True,
+        editable=False,
+    )
 
     objects = ZoneManager()
 
@@ -287,6 +325,13 @@ class Zone(NetBoxModel):
             "view",
             "name",
         )
+        indexes = (
+            GinIndex(
+                fields=("name",),
+                opclasses=("gin_trgm_ops",),
+                name="netbox_dns_zone_name_trgm",
+            ),
+        )
 
     def __str__(self):
         try:
@@ -329,10 +374,9 @@ class Zone(NetBoxModel):
     def record_count(self, managed=False):
         return Record.objects.filter(zone=self, managed=managed).count()
 
-    def update_soa_record(self):
-        soa_name = "@"
-        soa_ttl = self.soa_ttl
-        soa_rdata = SOA.SOA(
+    @property
+    def soa_value(self):
+        return SOA.SOA(
             rdclass=RecordClassChoices.IN,
             rdtype=RecordTypeChoices.SOA,
             mname=self.soa_mname.name,
@@ -342,14 +386,23 @@ class Zone(NetBoxModel):
             retry=self.soa_retry,
             expire=self.soa_expire,
             minimum=self.soa_minimum,
-        )
+        ).to_text()
+
+    def update_soa_record(self):
+        with span("zone.update_soa_record"):
+            self._update_soa_record()
+
+    def _update_soa_record(self):
+        soa_name = "@"
+        soa_ttl = self.soa_ttl
+        soa_value = self.soa_value
 
         try:
             soa_record = self.record_set.get(type=RecordTypeChoices.SOA, name=soa_name)
 
-            if soa_record.ttl != soa_ttl or soa_record.value != soa_rdata.to_text():
+            if soa_record.ttl != soa_ttl or soa_record.value != soa_value:
                 soa_record.ttl = soa_ttl
-                soa_record.value = soa_rdata.to_text()
+                soa_record.value = soa_value
                 soa_record.managed = True
                 soa_record.save()
 
@@ -359,27 +412,88 @@ class Zone(NetBoxModel):
                 type=RecordTypeChoices.SOA,
                 name=soa_name,
                 ttl=soa_ttl,
-                value=soa_rdata.to_text(),
+                value=soa_value,
                 managed=True,
             )
 
     def update_ns_records(self):
+        with span("zone.update_ns_records"):
+            self._update_ns_records()
+
+    def _update_ns_records(self):
         ns_name = "@"
 
-        nameservers = [f"{nameserver.name}." for nameserver in self.nameservers.all()]
+        nameservers = {}
+        for nameserver in self.nameservers.all():
+            value = f"{nameserver.name}."
+            nameservers[canonical_value(RecordTypeChoices.NS, value, self.name)] = value
 
-        self.record_set.filter(type=RecordTypeChoices.NS, managed=True).exclude(
-            value__in=nameservers
-        ).delete()
+        ns_records = self.record_set.filter(type=RecordTypeChoices.NS, managed=True)
+        existing = {
+            bytes(value)
+            for value in ns_records.values_list("canonical_value", flat=True)
+            if value is not None
+        }
 
-        for ns in nameservers:
-            Record.raw_objects.update_or_create(
-                zone_id=self.pk,
-                type=RecordTypeChoices.NS,
-                name=ns_name,
-                value=ns,
-                managed=True,
-            )
+        delete_ns = existing - set(nameservers)
+        create_ns = set(nameservers) - existing
+
+        if not delete_ns and not create_ns:
+            return
+
+        with transaction.atomic():
+            if delete_ns:
+                ns_records.filter(canonical_value__in=delete_ns).delete()
+
+            if create_ns:
+                ns_records = Record.objects.bulk_create(
+                    [
+                        Record(
+                            zone_id=self.pk,
+                            type=RecordTypeChoices.NS,
+                            name=ns_name,
+                            value=nameservers[ns],
+                            canonical_value=ns,
+                            managed=True,
+                        )
+                        for ns in sorted(create_ns)
+                    ]
+                )
+                cache_objects(
+                    Record.objects.select_related("zone"),
+                    [record.pk for record in ns_records],
+                )
+
+                # bulk_create sends no signals, so the change log entries
+                # NetBox writes for a request are created here
+                request = current_request.get()
+                if request is not None:
+                    object_changes = []
+                    for record in ns_records:
+                        object_change = record.to_objectchange(
+                            ObjectChangeActionChoices.ACTION_CREATE
+                        )
+                        object_change.user = request.user
+                        object_change.user_name = request.user.username
+                        object_change.request_id = request.id
+                        object_changes.append(object_change)
+
+                    ObjectChange.objects.bulk_create(object_changes)
+
+            self.update_serial()
+
+    def set_nameservers(self, nameservers):
+        """
+        Replace the nameservers of the zone and reconcile the NS records once
+        instead of once per m2m_changed signal sent by set()
+        """
+        self._ns_update_deferred = True
+        try:
+            self.nameservers.set(nameservers)
+        finally:
+            self._ns_update_deferred = False
+
+        self.update_ns_records()
 
     def check_nameservers(self):
         nameservers = self.nameservers.all()
@@ -421,27 +535,104 @@ class Zone(NetBoxModel):
 
         return ns_warnings, ns_errors
 
+    def get_update_fields(self, update_fields=None):
+        """
+        Return the fields written when an existing zone is saved. The SOA
+        serial of zones with an automatic serial and the last content change
+        are only written by allocate_serial() and update_serial(), so a stale
+        instance cannot overwrite a serial allocated concurrently.
+        """
+        excluded = {"last_content_change"}
+        if self.soa_serial_auto:
+            excluded.add("soa_serial")
+
+        if update_fields is None:
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+            ]
+
+        return [field for field in update_fields if field not in excluded]
+
+    @staticmethod
+    def get_serial_base(timestamp):
+        if get_plugin_config("netbox_dns", "zone_soa_serial_scheme") == "date":
+            return int(timestamp.strftime("%Y%m%d")) * 100
+
+        return ceil(timestamp.timestamp())
+
     def get_auto_serial(self):
-        records = Record.objects.filter(zone=self).exclude(type=RecordTypeChoices.SOA)
-        if records:
-            soa_serial = (
-                records.aggregate(Max("last_updated"))
-                .get("last_updated__max")
-                .timestamp()
-            )
-        else:
-            soa_serial = ceil(datetime.now().timestamp())
+        timestamps = [
+            timestamp
+            for timestamp in (self.last_content_change, self.last_updated)
+            if timestamp is not None
+        ]
+        soa_serial = self.get_serial_base(max(timestamps, default=timezone.now()))
 
-        if self.last_updated:
-            soa_serial = ceil(max(soa_serial, self.last_updated.timestamp()))
+        if self.soa_serial is not None:
+            soa_serial = max(soa_serial, self.soa_serial + 1)
 
         return soa_serial
 
     def update_serial(self):
-        self.last_updated = datetime.now()
-        self.soa_serial = ceil(datetime.now().timestamp())
-        self.update_soa_record()
-        super().save()
+        """
+        Allocate the next SOA serial with a single atomic UPDATE on the zone row.
+
+        The serial is incremented by at least one, so concurrent writers always
+        get distinct and monotonically increasing serials. The row lock is held
+        until the SOA record has been written, so the SOA record never falls
+        behind the serial stored in the zone.
+        """
+        now = timezone.now()
+        self.last_content_change = now
+
+        if not self.soa_serial_auto:
+            Zone.objects.filter(pk=self.pk).update(last_content_change=now)
+            return
+
+        with transaction.atomic():
+            self.allocate_serial(now, last_content_change=now)
+            self.update_soa_record()
+
+    def allocate_serial(self, now, last_content_change=None):
+        """
+        Set the SOA serial of the zone to the next serial with an atomic
+        UPDATE on the zone row, which is locked until the end of the
+        transaction. The last content change is only set if it is given.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {Zone._meta.db_table} "
+                "SET soa_serial = GREATEST(soa_serial + 1, %s), "
+                "last_content_change = COALESCE(%s, last_content_change), "
+                "last_updated = %s "
+                "WHERE id = %s RETURNING soa_serial, last_content_change",
+                [self.get_serial_base(now), last_content_change, now, self.pk],
+            )
+            self.soa_serial, self.last_content_change = cursor.fetchone()
+
+        self.last_updated = now
+
+    def update_canonical_values(self, batch_size=BATCH_SIZE):
+        """
+        Recompute the canonical values of all records in the zone, which
+        depend on the zone name for values containing relative names.
+        Records with values that cannot be parsed get no canonical value.
+        """
+        records = self.record_set.only("pk", "type", "value")
+        for batch in batched(records.iterator(), batch_size):
+            update_records = []
+            for record in batch:
+                try:
+                    record.canonical_value = canonical_value(
+                        record.type, record.value, self.name
+                    )
+                except dns.exception.DNSException:
+                    record.canonical_value = None
+                update_records.append(record)
+
+            Record.objects.bulk_update(update_records, ["canonical_value"])
 
     @property
     def network_from_name(self):
@@ -489,7 +680,12 @@ class Zone(NetBoxModel):
             )
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        with span("zone.save"):
+            self._save(*args, **kwargs)
+
+    def _save(self, *args, **kwargs):
+        with span("zone.save.validate"):
+            self.full_clean()
 
         new_zone = self.pk is None
         if not new_zone:
@@ -499,36 +695,67 @@ class Zone(NetBoxModel):
         view_changed = not new_zone and old_zone.view != self.view
         status_changed = not new_zone and old_zone.status != self.status
 
-        if self.soa_serial_auto:
+        if new_zone and self.soa_serial_auto:
             self.soa_serial = self.get_auto_serial()
 
         if self.is_reverse_zone:
             self.arpa_network = self.network_from_name
 
-        super().save(*args, **kwargs)
-
-        if (
-            new_zone or name_changed or view_changed or status_changed
-        ) and self.is_reverse_zone:
-            zones = Zone.objects.filter(
-                self.view_filter,
-                arpa_network__net_contains_or_equals=self.arpa_network,
-            )
-            address_records = Record.objects.filter(
-                Q(ptr_record__isnull=True) | Q(ptr_record__zone__in=zones),
-                type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA),
-                disable_ptr=False,
+        if not new_zone:
+            kwargs["update_fields"] = self.get_update_fields(
+                kwargs.get("update_fields")
             )
-            for record in address_records:
-                record.update_ptr_record()
 
-        elif name_changed or view_changed or status_changed:
-            for record in self.record_set.filter(
-                type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA)
-            ):
-                record.update_ptr_record()
+        with transaction.atomic():
+            with span("zone.save.write"):
+                super().save(*args, **kwargs)
+
+            if not new_zone and self.soa_serial_auto:
+                with span("zone.save.serial"):
+                    if any(
+                        getattr(old_zone, field) != getattr(self, field)
+                        for field in Zone.SERIAL_FIELDS
+                    ):
+                        self.allocate_serial(timezone.now())
+                    else:
+                        self.soa_serial = (
+                            Zone.objects.filter(pk=self.pk)
+                            .values_list("soa_serial", flat=True)
+                            .get()
+                        )
 
-        self.update_soa_record()
+            with span("zone.save.ptr"):
+                if (
+                    new_zone or name_changed or view_changed or status_changed
+                ) and self.is_reverse_zone:
+                    zones = Zone.objects.filter(
+                        self.view_filter,
+                        arpa_network__net_contains_or_equals=self.arpa_network,
+                    )
+                    address_records = Record.objects.filter(
+                        Q(ptr_record__isnull=True) | Q(ptr_record__zone__in=zones),
+                        type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA),
+                        disable_ptr=False,
+                    )
+                    for record in address_records:
+                        record.update_ptr_record()
+
+                elif name_changed or view_changed or status_changed:
+                    for record in self.record_set.filter(
+                        type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA)
+                    ):
+                        record.update_ptr_record()
+
+            if name_changed:
+                self.update_canonical_values()
+
+                with span("zone.save.search_cache"):
+                    cache_objects(
+                        self.record_set.select_related("zone"),
+                        self.record_set.values_list("pk", flat=True),
+                    )
+
+            self.update_soa_record()
 
     def delete(self, *args, **kwargs):
         with transaction.atomic():
@@ -550,11 +777,35 @@ class Zone(NetBoxModel):
 
 @receiver(m2m_changed, sender=Zone.nameservers.through)
 def update_ns_records(**kwargs):
-    if kwargs.get("action") not in ["post_add", "post_remove"]:
+    action = kwargs.get("action")
+    instance = kwargs.get("instance")
+
+    if action == "pre_clear" and kwargs.get("reverse"):
+        # post_clear has no pk_set, so the zones of a nameserver are
+        # collected before they are removed
+        instance._ns_cleared_zone_pks = list(
+            instance.zones.values_list("pk", flat=True)
+        )
+        return
+
+    if action not in ["post_add", "post_remove", "post_clear"]:
         return
 
-    zone = kwargs.get("instance")
-    zone.update_ns_records()
+    if kwargs.get("reverse"):
+        if action == "post_clear":
+            pk_set = getattr(instance, "_ns_cleared_zone_pks", [])
+            instance._ns_cleared_zone_pks = []
+        else:
+            pk_set = kwargs.get("pk_set") or []
+        zones = Zone.objects.filter(pk__in=pk_set)
+    else:
+        zones = [instance]
+
+    for zone in zones:
+        if getattr(zone, "_ns_update_deferred", False):
+            continue
+
+        zone.update_ns_records()
 
 
 @register_search
@@ -694,6 +945,11 @@ class Record(NetBoxModel):
         blank=True,
         null=True,
     )
+    canonical_value = models.BinaryField(
+        verbose_name="Canonical Value",
+        editable=False,
+        null=True,
+    )
 
     objects = RecordManager()
     raw_objects = RestrictedQuerySet.as_manager()
@@ -711,6 +967,27 @@ class Record(NetBoxModel):
 
     class Meta:
         ordering = ("zone", "name", "type", "value", "status")
+        indexes = (
+            GistIndex(
+                fields=("ip_address",),
+                opclasses=("inet_ops",),
+                name="netbox_dns_record_ip_gist",
+            ),
+            GinIndex(
+                fields=("name",),
+                opclasses=("gin_trgm_ops",),
+                name="netbox_dns_record_name_trgm",
+            ),
+            GinIndex(
+                fields=("value",),
+                opclasses=("gin_trgm_ops",),
+                name="netbox_dns_record_value_trgm",
+            ),
+            models.Index(
+                fields=("zone", "name", "type", "canonical_value"),
+                name="netbox_dns_record_canonical",
+            ),
+        )
 
     def __str__(self):
         try:
@@ -778,7 +1055,12 @@ class Record(NetBoxModel):
         return None
 
     def update_ptr_record(self):
-        ptr_zone = self.ptr_zone
+        with span("record.update_ptr_record"):
+            self._update_ptr_record()
+
+    def _update_ptr_record(self):
+        with span("record.ptr_zone"):
+            ptr_zone = self.ptr_zone
 
         if (
             ptr_zone is None
@@ -798,7 +1080,7 @@ class Record(NetBoxModel):
         ptr_value = self.fqdn
         ptr_record = self.ptr_record
 
-        with transaction.atomic():
+        with span("record.ptr_write"), transaction.atomic():
             if ptr_record is not None:
                 if ptr_record.zone.pk != ptr_zone.pk:
                     ptr_record.delete()
@@ -829,7 +1111,12 @@ class Record(NetBoxModel):
         if self.pk:
             super().save()
 
-    def validate_name(self):
+    def validate_name(self, validate_hostname=True):
+        """
+        Validate and normalize the name of the record. Bulk operations can
+        skip the host name rules and validate all names at once with
+        NameValidator.validate_many() instead.
+        """
         try:
             zone = dns_name.from_text(self.zone.name, origin=dns_name.root)
             name = dns_name.from_text(self.name, origin=None)
@@ -854,25 +1141,17 @@ class Record(NetBoxModel):
                 }
             )
 
-        if self.type not in get_plugin_config(
-            "netbox_dns", "tolerate_non_rfc1035_types"
-        ):
-            try:
-                validate_extended_hostname(
-                    self.name,
-                    (
-                        self.type
-                        in get_plugin_config(
-                            "netbox_dns", "tolerate_leading_underscore_types"
-                        )
-                    ),
-                )
-            except ValidationError as exc:
-                raise ValidationError(
-                    {
-                        "name": exc,
-                    }
-                ) from None
+        if not validate_hostname:
+            return
+
+        try:
+            get_validator().validate_record_name(self.name, self.type)
+        except ValidationError as exc:
+            raise ValidationError(
+                {
+                    "name": exc,
+                }
+            ) from None
 
     def validate_value(self):
         if self.type in (RecordTypeChoices.PTR):
@@ -886,7 +1165,7 @@ class Record(NetBoxModel):
                 ) from None
 
         try:
-            rdata.from_text(RecordClassChoices.IN, self.type, self.value)
+            value = parse_rdata(self.type, self.value)
         except dns.exception.SyntaxError as exc:
             raise ValidationError(
                 {
@@ -894,6 +1173,13 @@ class Record(NetBoxModel):
                 }
             ) from None
 
+        self.canonical_value = value.to_digestable(
+            dns_name.from_text(self.zone.name, origin=dns_name.root)
+        )
+
+    def update_canonical_value(self):
+        self.canonical_value = canonical_value(self.type, self.value, self.zone.name)
+
     def clean_fields(self, *args, **kwargs):
         self.type = self.type.upper()
         super().clean_fields(*args, **kwargs)
@@ -935,7 +1221,12 @@ class Record(NetBoxModel):
                 ) from None
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        with span("record.save", type=self.type):
+            self._save(*args, **kwargs)
+
+    def _save(self, *args, **kwargs):
+        with span("record.save.validate", type=self.type):
+            self.full_clean()
 
         if self.is_ptr_record:
             self.ip_address = self.address_from_name
@@ -950,11 +1241,12 @@ class Record(NetBoxModel):
             self.ptr_record.delete()
             self.ptr_record = None
 
-        super().save(*args, **kwargs)
+        with span("record.save.write", type=self.type):
+            super().save(*args, **kwargs)
 
-        zone = self.zone
-        if self.type != RecordTypeChoices.SOA and zone.soa_serial_auto:
-            zone.update_serial()
+        if self.type != RecordTypeChoices.SOA:
+            with span("record.save.serial", type=self.type):
+                self.zone.update_serial()
 
     def delete(self, *args, **kwargs):
         if self.ptr_record:
@@ -962,9 +1254,7 @@ class Record(NetBoxModel):
 
         super().delete(*args, **kwargs)
 
-        zone = self.zone
-        if zone.soa_serial_auto:
-            zone.update_serial()
+        self.zone.update_serial()
 
 
 @register_search
@@ -1007,3 +1297,28 @@ class ViewIndex(SearchIndex):
         ("name", 100),
         ("description", 500),
     )
+
+
+class ZoneSnapshot(models.Model):
+    zone = models.ForeignKey(
+        Zone,
+        on_delete=models.CASCADE,
+        related_name="snapshots",
+    )
+    serial = models.BigIntegerField(
+        verbose_name="SOA Serial",
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+    )
+    record_count = models.PositiveIntegerField(
+        default=0,
+    )
+    data = models.BinaryField()
+
+    class Meta:
+        ordering = ("zone", "-serial")
+        unique_together = ("zone", "serial")
+
+    def __str__(self):
+        return f"{self.zone} @ {self.serial}"
@@ -0,0 +1,110 @@
+import cProfile
+import pstats
+
+from collections import defaultdict
+from time import perf_counter
+
+from django.db import connection
+
+TOP_FUNCTIONS = 30
+TOP_QUERIES = 10
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper recording the SQL and duration of all queries,
+    independent of the DEBUG setting
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, perf_counter() - start))
+
+    def get_report(self):
+        statements = defaultdict(lambda: [0, 0.0])
+        for sql, duration in self.queries:
+            statements[sql][0] += 1
+            statements[sql][1] += duration
+
+        duplicates = sorted(
+            (
+                {"sql": sql, "count": count, "time": time}
+                for sql, (count, time) in statements.items()
+                if count > 1
+            ),
+            key=lambda query: (query["count"], query["time"]),
+            reverse=True,
+        )
+
+        return {
+            "count": len(self.queries),
+            "time": sum(duration for _, duration in self.queries),
+            "duplicates": duplicates[:TOP_QUERIES],
+            "slowest": [
+                {"sql": sql, "time": duration}
+                for sql, duration in sorted(
+                    self.queries, key=lambda query: query[1], reverse=True
+                )[:TOP_QUERIES]
+            ],
+        }
+
+
+class Profile:
+    """
+    Profile a block of code with cProfile and record its database queries
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.queries = QueryRecorder()
+        self.duration = None
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self.queries)
+        self._wrapper.__enter__()
+        self.start = perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.disable()
+        self.duration = perf_counter() - self.start
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+        return False
+
+    @property
+    def stats(self):
+        return pstats.Stats(self.profiler)
+
+    def get_functions(self):
+        functions = sorted(
+            self.stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )
+
+        return [
+            {
+                "function": pstats.func_std_string(function),
+                "calls": calls,
+                "total_time": total_time,
+                "cumulative_time": cumulative_time,
+            }
+            for function, (_, calls, total_time, cumulative_time, _) in functions[
+                :TOP_FUNCTIONS
+            ]
+        ]
+
+    def get_report(self):
+        return {
+            "duration": self.duration,
+            "queries": self.queries.get_report(),
+            "functions": self.get_functions(),
+        }
+
+    def dump_stats(self, filename):
+        self.profiler.dump_stats(filename)
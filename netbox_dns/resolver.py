@@ -0,0 +1,298 @@
+import threading
+
+from collections import OrderedDict
+
+from dns import name as dns_name
+from dns import rcode, rdatatype
+from dns import rrset as dns_rrset
+
+from extras.plugins import get_plugin_config
+from utilities.permissions import permission_is_exempt
+
+from netbox_dns.cache import get_zone_cache_key
+from netbox_dns.models import Zone
+from netbox_dns.zonefile import ZoneFileExporter
+
+MAX_CNAME_CHAIN = 16
+
+
+class Resolution:
+    """
+    The answer of the authoritative name servers for a query, with the
+    records in the answer, authority and additional sections
+    """
+
+    def __init__(self, qname, rdtype):
+        self.qname = qname
+        self.rdtype = rdtype
+        self.rcode = rcode.NOERROR
+        self.zone = None
+        self.answer = []
+        self.authority = []
+        self.additional = []
+
+    @staticmethod
+    def section_data(rrsets):
+        return [
+            {
+                "name": rrset.name.to_text(),
+                "ttl": rrset.ttl,
+                "type": rdatatype.to_text(rrset.rdtype),
+                "value": value.to_text(),
+            }
+            for rrset in rrsets
+            for value in rrset
+        ]
+
+    def to_dict(self):
+        return {
+            "name": self.qname.to_text(),
+            "type": rdatatype.to_text(self.rdtype),
+            "rcode": rcode.to_text(self.rcode),
+            "zone": self.zone.name if self.zone is not None else None,
+            "answer": self.section_data(self.answer),
+            "authority": self.section_data(self.authority),
+            "additional": self.section_data(self.additional),
+        }
+
+
+class ZoneIndex:
+    """
+    In-memory index of the active RRsets of a zone. With a user, only the
+    records the user is permitted to view are indexed.
+    """
+
+    def __init__(self, zone, user=None):
+        self.origin = dns_name.from_text(zone.name)
+        self.nodes = {}
+
+        for rrset in ZoneFileExporter(zone, user=user).get_rrsets():
+            self.nodes.setdefault(rrset.name, {})[rrset.rdtype] = rrset
+
+        # Names that exist in the zone, including empty non-terminals
+        self.names = set()
+        for name in self.nodes:
+            while name not in self.names and name.is_subdomain(self.origin):
+                self.names.add(name)
+                if name == self.origin:
+                    break
+                name = name.parent()
+
+        self.delegations = {
+            name
+            for name, node in self.nodes.items()
+            if name != self.origin and rdatatype.NS in node
+        }
+
+    def get_delegation(self, qname, rdtype):
+        if not self.delegations:
+            return None
+
+        ancestors = []
+        name = qname
+        while name != self.origin:
+            ancestors.append(name)
+            name = name.parent()
+
+        for name in reversed(ancestors):
+            # DS records are served by the parent side of the delegation
+            if name == qname and rdtype == rdatatype.DS:
+                break
+
+            if name in self.delegations:
+                return name
+
+        return None
+
+    def get_closest_encloser(self, qname):
+        name = qname
+        while name not in self.names:
+            name = name.parent()
+
+        return name
+
+    def get_glue(self, rrset):
+        glue = []
+        for value in rrset:
+            node = self.nodes.get(value.target, {})
+            glue += [
+                node[rdtype]
+                for rdtype in (rdatatype.A, rdatatype.AAAA)
+                if rdtype in node
+            ]
+
+        return glue
+
+    def lookup(self, qname, rdtype, resolution):
+        """
+        Add the answer for a name in the zone to a resolution. Returns the
+        target of a CNAME record that needs to be followed, if any.
+        """
+        delegation = self.get_delegation(qname, rdtype)
+        if delegation is not None:
+            ns_rrset = self.nodes[delegation][rdatatype.NS]
+            resolution.authority.append(ns_rrset)
+            resolution.additional += self.get_glue(ns_rrset)
+            return None
+
+        owner = qname
+        node = self.nodes.get(qname)
+        if node is None and qname not in self.names:
+            owner = dns_name.from_text("*", origin=self.get_closest_encloser(qname))
+            node = self.nodes.get(owner)
+
+        if node is None:
+            if qname not in self.names:
+                resolution.rcode = rcode.NXDOMAIN
+            self.add_soa(resolution)
+            return None
+
+        if rdatatype.CNAME in node and rdtype != rdatatype.CNAME:
+            rrset = self.synthesize(node[rdatatype.CNAME], qname, owner)
+            resolution.answer.append(rrset)
+            return next(iter(rrset)).target
+
+        if rdtype in node:
+            resolution.answer.append(self.synthesize(node[rdtype], qname, owner))
+        else:
+            self.add_soa(resolution)
+
+        return None
+
+    def add_soa(self, resolution):
+        # The SOA record is missing if the user may not view it
+        soa_rrset = self.nodes.get(self.origin, {}).get(rdatatype.SOA)
+        if soa_rrset is not None:
+            resolution.authority.append(soa_rrset)
+
+    @staticmethod
+    def synthesize(rrset, qname, owner):
+        if owner == qname:
+            return rrset
+
+        return dns_rrset.from_rdata_list(qname, rrset.ttl, list(rrset))
+
+
+class ZoneIndexCache:
+    """
+    LRU cache of zone indexes. An index is rebuilt when the cache key of its
+    zone changes, i.e. with every change of the SOA serial or the content of
+    the zone.
+    """
+
+    def __init__(self):
+        self.indexes = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, zone):
+        key = get_zone_cache_key(zone)
+
+        with self.lock:
+            entry = self.indexes.get(zone.pk)
+            if entry is not None and entry[0] == key:
+                self.indexes.move_to_end(zone.pk)
+                return entry[1]
+
+        index = ZoneIndex(zone)
+
+        with self.lock:
+            self.indexes[zone.pk] = (key, index)
+            self.indexes.move_to_end(zone.pk)
+
+            size = get_plugin_config("netbox_dns", "resolver_cache_size")
+            while len(self.indexes) > size:
+                self.indexes.popitem(last=False)
+
+        return index
+
+    def clear(self):
+        with self.lock:
+            self.indexes.clear()
+
+
+index_cache = ZoneIndexCache()
+
+
+class Resolver:
+    """
+    Resolve names the way the authoritative name servers for the active
+    zones of a view would. The zones are loaded once per resolver, so a
+    resolver should be used for a batch of queries.
+
+    With a user, only the records the user is permitted to view are used.
+    The zone indexes restricted to a user are not shared in the index cache,
+    so they only live as long as the resolver.
+    """
+
+    def __init__(self, view=None, zones=None, user=None):
+        if zones is None:
+            zones = Zone.objects.all()
+
+        zones = zones.filter(view=view, status__in=Zone.ACTIVE_STATUS_LIST).only(
+            "pk",
+            "name",
+            "view",
+            "default_ttl",
+            "soa_serial",
+            "last_updated",
+            "last_content_change",
+        )
+        self.zones = {dns_name.from_text(zone.name): zone for zone in zones}
+
+        self.user = None
+        if user is not None and not (
+            user.is_superuser or permission_is_exempt("netbox_dns.view_record")
+        ):
+            self.user = user
+        self.indexes = {}
+
+    def get_index(self, zone):
+        if self.user is None:
+            return index_cache.get(zone)
+
+        index = self.indexes.get(zone.pk)
+        if index is None:
+            index = self.indexes[zone.pk] = ZoneIndex(zone, user=self.user)
+
+        return index
+
+    def find_zone(self, qname):
+        name = qname
+        while name not in self.zones:
+            if name == dns_name.root:
+                return None
+            name = name.parent()
+
+        return self.zones[name]
+
+    def resolve(self, qname, rdtype=rdatatype.A):
+        if isinstance(qname, str):
+            qname = dns_name.from_text(qname)
+        if isinstance(rdtype, str):
+            rdtype = rdatatype.from_text(rdtype)
+
+        resolution = Resolution(qname, rdtype)
+
+        name = qname
+        visited = set()
+        while name is not None and len(visited) <= MAX_CNAME_CHAIN:
+            zone = self.find_zone(name)
+            if zone is None:
+                if resolution.zone is None:
+                    resolution.rcode = rcode.REFUSED
+                break
+
+            if resolution.zone is None:
+                resolution.zone = zone
+
+            visited.add(name)
+            name = self.get_index(zone).lookup(name, rdtype, resolution)
+            if name in visited:
+                resolution.rcode = rcode.SERVFAIL
+                break
+
+        return resolution
+
+    def resolve_many(self, queries):
+        """Resolve an iterable of (name, type) queries"""
+        return [self.resolve(qname, rdtype) for qname, rdtype in queries]
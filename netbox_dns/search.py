@@ -0,0 +1,34 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from extras.models import CachedValue
+from netbox.search.backends import search_backend
+
+from netbox_dns.utilities import BATCH_SIZE, batched
+
+
+def uncache_objects(model, pks):
+    """Remove the cached search values of objects with a single query"""
+    CachedValue.objects.filter(
+        object_type=ContentType.objects.get_for_model(model), object_id__in=pks
+    ).delete()
+
+
+def cache_objects(queryset, pks, batch_size=BATCH_SIZE):
+    """
+    Update the cached search values of the objects in a queryset with the
+    given primary keys after bulk operations, which do not send the signals
+    the search backend relies on.
+
+    Each batch needs one query to remove the stale values, one to fetch the
+    objects and one bulk insert, instead of one delete query per object.
+    """
+    count = 0
+    for batch in batched(pks, batch_size):
+        with transaction.atomic():
+            uncache_objects(queryset.model, batch)
+            count += search_backend.cache(
+                queryset.filter(pk__in=batch), remove_existing=False
+            )
+
+    return count
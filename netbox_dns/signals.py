@@ -0,0 +1,115 @@
+from functools import partial
+from threading import local
+
+from netaddr import IPNetwork
+
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from extras.plugins import get_plugin_config
+from ipam.models import IPAddress
+
+from netbox_dns.ipam_sync import IPAMProvisioner, get_provisioning_state
+
+
+_local = local()
+
+
+def provisioning_enabled():
+    return get_plugin_config("netbox_dns", "feature_ipam_provisioning")
+
+
+def get_provisioner():
+    """
+    Return the provisioner collecting the IP address changes of the current
+    transaction or savepoint. A provisioner is reused only as long as its
+    on_commit callback is still pending for the current savepoint: Django
+    discards the callbacks of rolled back transactions and savepoints, so
+    after a rollback, or within a new savepoint, a new provisioner is
+    scheduled.
+    """
+    connection = transaction.get_connection()
+    callback = getattr(_local, "callback", None)
+    if callback is not None and connection.in_atomic_block:
+        savepoint_ids = set(connection.savepoint_ids)
+        for entry in connection.run_on_commit:
+            if entry[1] is callback and entry[0] == savepoint_ids:
+                return callback.args[0], None
+
+    provisioner = IPAMProvisioner()
+    _local.callback = partial(process_changes, provisioner)
+    return provisioner, _local.callback
+
+
+def process_changes(provisioner):
+    if getattr(_local, "callback", None) is not None and (
+        _local.callback.args[0] is provisioner
+    ):
+        _local.callback = None
+    provisioner.process()
+
+
+def queue_change(pk, old_state, new_state):
+    if old_state == new_state:
+        return
+
+    provisioner, callback = get_provisioner()
+    provisioner.add(pk, old_state, new_state)
+
+    if callback is not None:
+        transaction.on_commit(callback)
+
+
+@receiver(request_started)
+def reset_provisioner(**kwargs):
+    _local.callback = None
+
+
+@receiver(pre_save, sender=IPAddress)
+def ip_address_pre_save(instance, **kwargs):
+    if not provisioning_enabled():
+        return
+
+    instance._provisioning_state = None
+    if instance.pk is None:
+        return
+
+    snapshot = getattr(instance, "_prechange_snapshot", None)
+    if snapshot is not None:
+        instance._provisioning_state = (
+            snapshot.get("vrf"),
+            str(IPNetwork(snapshot["address"]).ip),
+            snapshot.get("dns_name"),
+            snapshot.get("status"),
+        )
+        return
+
+    old_state = (
+        IPAddress.objects.filter(pk=instance.pk)
+        .values_list("vrf_id", "address", "dns_name", "status")
+        .first()
+    )
+    if old_state is not None:
+        vrf_id, address, name, status = old_state
+        instance._provisioning_state = (vrf_id, str(address.ip), name, status)
+
+
+@receiver(post_save, sender=IPAddress)
+def ip_address_post_save(instance, **kwargs):
+    if not provisioning_enabled() or not hasattr(instance, "_provisioning_state"):
+        return
+
+    queue_change(
+        instance.pk, instance._provisioning_state, get_provisioning_state(instance)
+    )
+    del instance._provisioning_state
+
+
+@receiver(post_delete, sender=IPAddress)
+def ip_address_post_delete(instance, **kwargs):
+    if not provisioning_enabled():
+        return
+
+    queue_change(instance.pk, get_provisioning_state(instance), None)
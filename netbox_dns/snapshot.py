@@ -0,0 +1,494 @@
+import io
+import struct
+import zlib
+
+from collections import namedtuple
+
+from dns import name as dns_name
+from dns import rdatatype
+
+from django.db import transaction
+from django.utils import timezone
+
+from extras.choices import JournalEntryKindChoices
+from extras.models import JournalEntry
+from netbox.context import current_request
+
+from netbox_dns.bulk import update_ptr_records, update_serials
+from netbox_dns.models import Record, Zone, ZoneSnapshot
+from netbox_dns.search import cache_objects, uncache_objects
+from netbox_dns.utilities import BATCH_SIZE, batched
+
+SNAPSHOT_MAGIC = b"NBDNS\x01"
+
+HEADER = struct.Struct(">II")
+ENTRY = struct.Struct(">HIB")
+
+FLAG_TTL = 1
+FLAG_DISABLE_PTR = 2
+FLAG_MANAGED = 4
+
+RECORD_FIELDS = (
+    "name",
+    "type",
+    "ttl",
+    "value",
+    "canonical_value",
+    "status",
+    "disable_ptr",
+    "managed",
+    "description",
+)
+
+
+class SnapshotRecord(namedtuple("SnapshotRecord", RECORD_FIELDS)):
+    """The state of a record in a zone snapshot"""
+
+    __slots__ = ()
+
+    def get_key(self, origin):
+        """
+        Return the identity of the record, ordered in the canonical DNS
+        order of the owner name, the type and the canonical value. Records
+        of singleton types like SOA and CNAME are identified without their
+        value, so a changed value is an update of the record.
+        """
+        rdtype = rdatatype.from_text(self.type)
+
+        return (
+            dns_name.from_text(self.name, origin=origin),
+            rdtype,
+            b"" if rdatatype.is_singleton(rdtype) else self.canonical_value,
+        )
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "type": self.type,
+            "ttl": self.ttl,
+            "value": self.value,
+            "status": self.status,
+            "disable_ptr": self.disable_ptr,
+            "managed": self.managed,
+            "description": self.description,
+        }
+
+
+def get_origin(zone):
+    return dns_name.from_text(zone.name)
+
+
+def sort_records(origin, records):
+    return sorted(records, key=lambda record: (*record.get_key(origin), record.value))
+
+
+def to_snapshot_record(record):
+    return SnapshotRecord(
+        record.name,
+        record.type,
+        record.ttl,
+        record.value,
+        bytes(record.canonical_value) if record.canonical_value is not None else b"",
+        record.status,
+        record.disable_ptr,
+        record.managed,
+        record.description,
+    )
+
+
+def get_zone_records(zone):
+    """Return the current records of a zone as sorted SnapshotRecords"""
+    records = (
+        SnapshotRecord(
+            name,
+            record_type,
+            ttl,
+            value,
+            bytes(canonical_value) if canonical_value is not None else b"",
+            status,
+            disable_ptr,
+            managed,
+            description,
+        )
+        for (
+            name,
+            record_type,
+            ttl,
+            value,
+            canonical_value,
+            status,
+            disable_ptr,
+            managed,
+            description,
+        ) in Record.objects.filter(zone=zone)
+        .values_list(*RECORD_FIELDS)
+        .iterator()
+    )
+
+    return sort_records(get_origin(zone), records)
+
+
+def write_string(data, value, size=">H"):
+    encoded = value.encode() if isinstance(value, str) else value
+    data.write(struct.pack(size, len(encoded)))
+    data.write(encoded)
+
+
+def read_string(data, size=">H", decode=True):
+    (length,) = struct.unpack(size, data.read(struct.calcsize(size)))
+    value = data.read(length)
+    return value.decode() if decode else value
+
+
+def encode_snapshot(serial, records):
+    """
+    Encode sorted SnapshotRecords as a zlib compressed blob with the
+    canonical wire format of the record values
+    """
+    data = io.BytesIO()
+    data.write(SNAPSHOT_MAGIC)
+    data.write(HEADER.pack(serial, len(records)))
+
+    for record in records:
+        flags = (
+            (FLAG_TTL if record.ttl is not None else 0)
+            | (FLAG_DISABLE_PTR if record.disable_ptr else 0)
+            | (FLAG_MANAGED if record.managed else 0)
+        )
+        data.write(
+            ENTRY.pack(
+                rdatatype.from_text(record.type),
+                record.ttl if record.ttl is not None else 0,
+                flags,
+            )
+        )
+        write_string(data, record.name)
+        write_string(data, record.canonical_value)
+        write_string(data, record.value)
+        write_string(data, record.status, size=">B")
+        write_string(data, record.description)
+
+    return zlib.compress(data.getvalue())
+
+
+def decode_snapshot(blob):
+    """Return the serial and the SnapshotRecords of an encoded snapshot"""
+    data = io.BytesIO(zlib.decompress(bytes(blob)))
+    if data.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+        raise ValueError("Unsupported snapshot format")
+
+    serial, count = HEADER.unpack(data.read(HEADER.size))
+
+    records = []
+    for _ in range(count):
+        rdtype, ttl, flags = ENTRY.unpack(data.read(ENTRY.size))
+        name = read_string(data)
+        canonical_value = read_string(data, decode=False)
+        value = read_string(data)
+        status = read_string(data, size=">B")
+        description = read_string(data)
+
+        records.append(
+            SnapshotRecord(
+                name,
+                rdatatype.to_text(rdtype),
+                ttl if flags & FLAG_TTL else None,
+                value,
+                canonical_value,
+                status,
+                bool(flags & FLAG_DISABLE_PTR),
+                bool(flags & FLAG_MANAGED),
+                description,
+            )
+        )
+
+    return serial, records
+
+
+def create_snapshot(zone):
+    """
+    Store a snapshot of the records of a zone at its current SOA serial. An
+    existing snapshot at the same serial is replaced, as the records of zones
+    with a manual serial can change without a new serial.
+    """
+    records = get_zone_records(zone)
+
+    snapshot, _ = ZoneSnapshot.objects.update_or_create(
+        zone=zone,
+        serial=zone.soa_serial,
+        defaults={
+            "record_count": len(records),
+            "data": encode_snapshot(zone.soa_serial, records),
+        },
+    )
+
+    return snapshot
+
+
+def get_snapshot_records(snapshot):
+    _, records = decode_snapshot(snapshot.data)
+    return records
+
+
+def diff_records(origin, old_records, new_records):
+    """
+    Compare two sorted lists of SnapshotRecords in a single sorted merge.
+    Yields (old, new) pairs for the changed records, with old None for
+    created and new None for deleted records.
+    """
+    old_records = iter(old_records)
+    new_records = iter(new_records)
+
+    old = next(old_records, None)
+    new = next(new_records, None)
+    old_key = old.get_key(origin) if old is not None else None
+    new_key = new.get_key(origin) if new is not None else None
+
+    while old is not None or new is not None:
+        if new is None or (old is not None and old_key < new_key):
+            yield old, None
+            advance_old = True
+            advance_new = False
+        elif old is None or new_key < old_key:
+            yield None, new
+            advance_old = False
+            advance_new = True
+        else:
+            if old != new:
+                yield old, new
+            advance_old = advance_new = True
+
+        if advance_old:
+            old = next(old_records, None)
+            old_key = old.get_key(origin) if old is not None else None
+        if advance_new:
+            new = next(new_records, None)
+            new_key = new.get_key(origin) if new is not None else None
+
+
+class ZoneDiff:
+    """The differences between two states of the records of a zone"""
+
+    def __init__(self, zone, old_records, new_records):
+        self.created = []
+        self.deleted = []
+        self.updated = []
+
+        for old, new in diff_records(get_origin(zone), old_records, new_records):
+            if old is None:
+                self.created.append(new)
+            elif new is None:
+                self.deleted.append(old)
+            else:
+                self.updated.append((old, new))
+
+    def __bool__(self):
+        return bool(self.created or self.deleted or self.updated)
+
+    def to_dict(self):
+        return {
+            "created": [record.to_dict() for record in self.created],
+            "deleted": [record.to_dict() for record in self.deleted],
+            "updated": [
+                {"old": old.to_dict(), "new": new.to_dict()}
+                for old, new in self.updated
+            ],
+        }
+
+
+def diff_zone(zone, old_serial, new_serial=None):
+    """
+    Compare the snapshot of a zone at old_serial with the snapshot at
+    new_serial or, without new_serial, with the current records
+    """
+    snapshots = zone.snapshots.all()
+
+    old_records = get_snapshot_records(snapshots.get(serial=old_serial))
+    if new_serial is None:
+        new_records = get_zone_records(zone)
+    else:
+        new_records = get_snapshot_records(snapshots.get(serial=new_serial))
+
+    return ZoneDiff(zone, old_records, new_records)
+
+
+class SnapshotRestorer:
+    """
+    Restore the records of a zone to the state of a snapshot.
+
+    The current records are compared with the snapshot in one sorted merge,
+    and the differences are applied with bulk deletes, creates and updates
+    instead of saving each record. Managed records such as the SOA record,
+    the NS records of the zone's nameservers and PTR records are not
+    restored. The PTR records of all changed address records are reconciled
+    in one pass afterwards, and the SOA serial of the zone is updated once.
+    As the bulk operations write no change log entries, the restore is
+    recorded in a journal entry of the zone.
+    """
+
+    UPDATE_FIELDS = (
+        "ttl",
+        "value",
+        "canonical_value",
+        "status",
+        "disable_ptr",
+        "description",
+        "ip_address",
+        "last_updated",
+    )
+
+    def __init__(self, zone, batch_size=BATCH_SIZE):
+        self.zone = zone
+        self.batch_size = batch_size
+
+        self.created = 0
+        self.updated = 0
+        self.deleted = 0
+
+    def restore(self, serial):
+        """
+        Restore the zone to the snapshot at serial and return the ZoneDiff
+        from the current records to the snapshot. Raises
+        ZoneSnapshot.DoesNotExist if there is no snapshot at serial.
+        """
+        with transaction.atomic():
+            zone = Zone.objects.select_for_update().get(pk=self.zone.pk)
+            snapshot = zone.snapshots.get(serial=serial)
+            old_serial = zone.soa_serial
+            origin = get_origin(zone)
+
+            instances = {}
+            current_records = []
+            for record in Record.objects.filter(zone=zone, managed=False):
+                snapshot_record = to_snapshot_record(record)
+                instances.setdefault(snapshot_record, []).append(record)
+                current_records.append(snapshot_record)
+
+            snapshot_records = [
+                record
+                for record in get_snapshot_records(snapshot)
+                if not record.managed
+            ]
+
+            diff = ZoneDiff(
+                zone, sort_records(origin, current_records), snapshot_records
+            )
+            if not diff:
+                return diff
+
+            deleted_records = [instances[record].pop() for record in diff.deleted]
+            updated_records = [
+                self.update_record(instances[old].pop(), new)
+                for old, new in diff.updated
+            ]
+            created_records = [
+                self.create_record(zone, record) for record in diff.created
+            ]
+
+            changed_zone_ids = self.delete_records(deleted_records)
+
+            for batch in batched(updated_records, self.batch_size):
+                Record.objects.bulk_update(batch, self.UPDATE_FIELDS)
+            Record.objects.bulk_create(created_records, batch_size=self.batch_size)
+
+            changed_pks = [record.pk for record in updated_records + created_records]
+            update_ptr_records(
+                Record.objects.filter(pk__in=changed_pks), batch_size=self.batch_size
+            )
+
+            zone.update_serial()
+            update_serials(changed_zone_ids - {zone.pk})
+
+            cache_objects(
+                Record.objects.select_related("zone"),
+                changed_pks,
+                batch_size=self.batch_size,
+            )
+
+            self.created = len(created_records)
+            self.updated = len(updated_records)
+            self.deleted = len(deleted_records)
+            self.write_journal_entry(zone, serial, old_serial)
+
+        self.zone.soa_serial = zone.soa_serial
+
+        return diff
+
+    def write_journal_entry(self, zone, serial, old_serial):
+        request = current_request.get()
+        user = None
+        if request is not None and request.user.is_authenticated:
+            user = request.user
+
+        JournalEntry.objects.create(
+            assigned_object=zone,
+            created_by=user,
+            kind=JournalEntryKindChoices.KIND_INFO,
+            comments=(
+                f"Restored the records of the snapshot at serial {serial}, "
+                f"SOA serial {old_serial} to {zone.soa_serial}: "
+                f"{self.created} created, {self.updated} updated, "
+                f"{self.deleted} deleted"
+            ),
+        )
+
+    @staticmethod
+    def set_ip_address(record):
+        if record.is_address_record:
+            record.ip_address = record.value
+        elif record.is_ptr_record:
+            record.ip_address = record.address_from_name
+        else:
+            record.ip_address = None
+
+    def update_record(self, record, snapshot_record):
+        record.ttl = snapshot_record.ttl
+        record.value = snapshot_record.value
+        record.canonical_value = snapshot_record.canonical_value or None
+        record.status = snapshot_record.status
+        record.disable_ptr = snapshot_record.disable_ptr
+        record.description = snapshot_record.description
+        record.last_updated = timezone.now()
+        self.set_ip_address(record)
+
+        return record
+
+    def create_record(self, zone, snapshot_record):
+        record = Record(
+            zone=zone,
+            name=snapshot_record.name,
+            type=snapshot_record.type,
+            ttl=snapshot_record.ttl,
+            value=snapshot_record.value,
+            canonical_value=snapshot_record.canonical_value or None,
+            status=snapshot_record.status,
+            disable_ptr=snapshot_record.disable_ptr,
+            description=snapshot_record.description,
+        )
+        self.set_ip_address(record)
+
+        return record
+
+    def delete_records(self, records):
+        """
+        Delete records together with their PTR records and return the IDs
+        of the reverse zones the PTR records were deleted from
+        """
+        ptr_records = Record.objects.filter(
+            pk__in=[record.ptr_record_id for record in records if record.ptr_record_id]
+        )
+        changed_zone_ids = set(ptr_records.values_list("zone_id", flat=True))
+
+        deleted_pks = [record.pk for record in records] + list(
+            ptr_records.values_list("pk", flat=True)
+        )
+        for batch in batched(deleted_pks, self.batch_size):
+            Record.objects.filter(pk__in=batch).delete()
+        uncache_objects(Record, deleted_pks)
+
+        return changed_zone_ids
+
+
+def restore_snapshot(zone, serial, batch_size=BATCH_SIZE):
+    """Restore the records of a zone to the snapshot at serial"""
+    return SnapshotRestorer(zone, batch_size=batch_size).restore(serial)
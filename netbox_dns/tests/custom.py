@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from utilities.testing.api import APITestCase as NetBoxAPITestCase
@@ -31,3 +33,73 @@ class APITestCase(NetBoxAPITestCase):
     def _get_list_url(self):
         viewname = f"plugins-api:{self._get_view_namespace()}:{self.model._meta.model_name}-list"
         return reverse(viewname)
+
+
+class QueryCountTestMixin:
+    """
+    Assertions for the number of SQL queries needed by an operation
+    """
+
+    page_sizes = (1, 10, 50)
+
+    def setUp(self):
+        super().setUp()
+
+        self.user.is_superuser = True
+        self.user.save()
+
+    def count_queries(self, function, *args, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            function(*args, **kwargs)
+
+        return len(context.captured_queries)
+
+    def assertQueryBudget(self, budget, function, *args, **kwargs):
+        """
+        Assert that a function call does not need more queries than budget
+        """
+        count = self.count_queries(function, *args, **kwargs)
+        self.assertLessEqual(
+            count, budget, f"{count} queries exceed the budget of {budget} queries"
+        )
+
+        return count
+
+    def assertConstantQueries(self, function, values):
+        """
+        Assert that function(value) needs the same number of queries for all
+        values, i.e. that the number of queries does not grow with N
+        """
+        counts = {value: self.count_queries(function, value) for value in values}
+        self.assertEqual(
+            1, len(set(counts.values())), f"Query counts depend on N: {counts}"
+        )
+
+        return counts
+
+    def assertGetBudget(self, budget, url, **extra):
+        def get():
+            response = self.client.get(url, **extra)
+            self.assertEqual(200, response.status_code)
+
+        get()
+        return self.assertQueryBudget(budget, get)
+
+    def assertListBudget(self, budget, url, page_parameter="limit", **extra):
+        """
+        Assert that a list page does not need more queries than budget for
+        all page sizes, and that the number of queries does not depend on the
+        page size
+        """
+
+        def get(page_size):
+            response = self.client.get(f"{url}?{page_parameter}={page_size}", **extra)
+            self.assertEqual(200, response.status_code)
+
+        get(self.page_sizes[0])
+        counts = self.assertConstantQueries(get, self.page_sizes)
+        self.assertLessEqual(
+            max(counts.values()),
+            budget,
+            f"{max(counts.values())} queries exceed the budget of {budget} queries",
+        )
@@ -0,0 +1,75 @@
+from django.urls import reverse
+
+from netbox_dns.models import NameServer, View, Zone
+from netbox_dns.tests.custom import APITestCase, QueryCountTestMixin
+
+
+class NameServerQueryCountTest(QueryCountTestMixin, APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameservers = [
+            NameServer.objects.create(name=f"ns{index}.example.com")
+            for index in range(60)
+        ]
+        views = (View.objects.create(name="view1"), None)
+
+        for index in range(10):
+            zone = Zone.objects.create(
+                name=f"zone{index}.example.com",
+                **cls.zone_data,
+                soa_mname=cls.nameservers[0],
+                view=views[index % 2],
+            )
+            zone.set_nameservers(cls.nameservers[index : index + 10])
+
+        cls.nameserver = cls.nameservers[0]
+
+    def test_nameserver_save(self):
+        nameserver = NameServer(name="ns.example.com")
+        self.assertQueryBudget(10, nameserver.save)
+
+        nameserver.description = "test"
+        self.assertQueryBudget(10, nameserver.save)
+
+    def test_api_list(self):
+        self.assertListBudget(
+            20, reverse("plugins-api:netbox_dns-api:nameserver-list"), **self.header
+        )
+
+    def test_api_detail(self):
+        self.assertGetBudget(
+            20,
+            reverse(
+                "plugins-api:netbox_dns-api:nameserver-detail",
+                kwargs={"pk": self.nameserver.pk},
+            ),
+            **self.header,
+        )
+
+    def test_view_list(self):
+        self.client.force_login(self.user)
+
+        self.assertListBudget(
+            40,
+            reverse("plugins:netbox_dns:nameserver_list"),
+            page_parameter="per_page",
+        )
+
+    def test_view_detail(self):
+        self.client.force_login(self.user)
+
+        self.assertGetBudget(
+            40,
+            reverse("plugins:netbox_dns:nameserver", kwargs={"pk": self.nameserver.pk}),
+        )
@@ -0,0 +1,122 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from netbox_dns.importer import RecordImporter
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, View, Zone
+
+
+class RecordBulkImportTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+        cls.view = View.objects.create(name="view1")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=nameserver),
+            Zone(
+                name="zone1.example.com",
+                **cls.zone_data,
+                soa_mname=nameserver,
+                view=cls.view,
+            ),
+            Zone(name="0.0.10.in-addr.arpa", **cls.zone_data, soa_mname=nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+    def test_import_records(self):
+        rows = [
+            {
+                "zone": "zone1.example.com",
+                "name": f"name{index}",
+                "type": "a",
+                "value": f"10.0.0.{index}",
+                "ttl": "3600",
+            }
+            for index in range(1, 21)
+        ] + [
+            {
+                "zone": "zone1.example.com",
+                "view": "view1",
+                "name": "name1",
+                "type": "TXT",
+                "value": "test",
+                "disable_ptr": "true",
+            }
+        ]
+
+        records = RecordImporter().import_objects(rows)
+
+        self.assertEqual(21, len(records))
+
+        record = Record.objects.get(zone=self.zones[0], name="name1")
+        self.assertEqual(RecordTypeChoices.A, record.type)
+        self.assertEqual(3600, record.ttl)
+        self.assertEqual(str(record.ip_address), "10.0.0.1")
+        self.assertEqual(self.zones[2], record.ptr_record.zone)
+
+        record = Record.objects.get(zone=self.zones[1], name="name1")
+        self.assertEqual(RecordTypeChoices.TXT, record.type)
+        self.assertTrue(record.disable_ptr)
+
+    def test_import_invalid_rows(self):
+        rows = [
+            {"zone": "zone2.example.com", "name": "name1", "type": "A", "value": "x"},
+            {"zone": "zone1.example.com", "name": "name1", "type": "A", "value": "x"},
+            {"zone": "zone1.example.com", "name": "-", "type": "A", "value": "::1"},
+            {"zone": "zone1.example.com", "name": "n", "type": "XYZ", "value": "x"},
+        ]
+
+        importer = RecordImporter()
+        with self.assertRaises(ValidationError):
+            importer.import_objects(rows)
+
+        self.assertEqual([1, 2, 3, 4], [index for index, _, _ in importer.errors])
+        self.assertFalse(Record.objects.filter(name="name1").exists())
+
+    def test_import_cname_conflict(self):
+        Record.objects.create(
+            zone=self.zones[0],
+            name="name1",
+            type=RecordTypeChoices.A,
+            value="10.0.0.1",
+        )
+
+        rows = [
+            {
+                "zone": "zone1.example.com",
+                "name": "name1",
+                "type": "CNAME",
+                "value": "name2.zone1.example.com.",
+            },
+            {
+                "zone": "zone1.example.com",
+                "name": "name2",
+                "type": "CNAME",
+                "value": "name3.zone1.example.com.",
+            },
+            {
+                "zone": "zone1.example.com",
+                "name": "name2",
+                "type": "TXT",
+                "value": "test",
+            },
+        ]
+
+        importer = RecordImporter()
+        with self.assertRaises(ValidationError):
+            importer.import_objects(rows)
+
+        self.assertEqual([1, 3], [index for index, _, _ in importer.errors])
+        self.assertFalse(Record.objects.filter(type=RecordTypeChoices.CNAME).exists())
@@ -0,0 +1,188 @@
+import io
+
+from django.test import TestCase
+
+from netbox_dns.loader import RecordLoader, read_csv_records
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+from netbox_dns.utilities import canonical_value
+
+
+class CanonicalValueTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+        cls.zones = [
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(name="1.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver),
+        ]
+        for zone in cls.zones:
+            zone.save()
+
+    def get_canonical_value(self, record):
+        return bytes(Record.objects.get(pk=record.pk).canonical_value)
+
+    def test_canonical_value(self):
+        origin = "zone1.example.com"
+
+        value = canonical_value(RecordTypeChoices.CNAME, "mail", origin)
+        self.assertEqual(
+            value,
+            canonical_value(RecordTypeChoices.CNAME, "mail.zone1.example.com.", origin),
+        )
+        self.assertEqual(
+            value,
+            canonical_value(RecordTypeChoices.CNAME, "MAIL.Zone1.Example.COM.", origin),
+        )
+
+        self.assertEqual(
+            canonical_value(RecordTypeChoices.MX, "10 mail.zone1.example.com.", origin),
+            canonical_value(RecordTypeChoices.MX, "10   Mail", origin),
+        )
+
+        self.assertNotEqual(
+            canonical_value(RecordTypeChoices.TXT, '"Text"', origin),
+            canonical_value(RecordTypeChoices.TXT, '"text"', origin),
+        )
+
+    def test_canonical_value_on_save(self):
+        record = Record.objects.create(
+            zone=self.zones[0],
+            name="www",
+            type=RecordTypeChoices.CNAME,
+            value="Name1",
+        )
+
+        self.assertEqual(
+            canonical_value(
+                RecordTypeChoices.CNAME, "name1.zone1.example.com.", "zone1.example.com"
+            ),
+            self.get_canonical_value(record),
+        )
+
+        record.value = "name2"
+        record.save()
+
+        self.assertEqual(
+            canonical_value(
+                RecordTypeChoices.CNAME, "name2.zone1.example.com.", "zone1.example.com"
+            ),
+            self.get_canonical_value(record),
+        )
+
+    def test_canonical_value_ptr(self):
+        record = Record.objects.create(
+            zone=self.zones[0],
+            name="name1",
+            type=RecordTypeChoices.A,
+            value="10.0.1.42",
+        )
+        ptr_record = Record.objects.get(pk=record.ptr_record.pk)
+
+        self.assertEqual(
+            canonical_value(
+                RecordTypeChoices.PTR, "name1.zone1.example.com.", self.zones[1].name
+            ),
+            bytes(ptr_record.canonical_value),
+        )
+
+    def test_canonical_value_zone_rename(self):
+        zone = self.zones[0]
+        record = Record.objects.create(
+            zone=zone,
+            name="www",
+            type=RecordTypeChoices.CNAME,
+            value="name1",
+        )
+
+        zone.name = "zone2.example.com"
+        zone.save()
+
+        self.assertEqual(
+            canonical_value(
+                RecordTypeChoices.CNAME, "name1.zone2.example.com.", "zone2.example.com"
+            ),
+            self.get_canonical_value(record),
+        )
+
+    def test_canonical_value_zone_rename_invalid_value(self):
+        zone = self.zones[0]
+        records = (
+            Record.objects.create(
+                zone=zone,
+                name="mail",
+                type=RecordTypeChoices.MX,
+                value="10 mail",
+            ),
+            Record.objects.create(
+                zone=zone,
+                name="www",
+                type=RecordTypeChoices.CNAME,
+                value="name1",
+            ),
+        )
+        Record.objects.filter(pk=records[0].pk).update(value="invalid")
+
+        zone.name = "zone2.example.com"
+        zone.save()
+
+        self.assertEqual(
+            canonical_value(
+                RecordTypeChoices.CNAME, "name1.zone2.example.com.", "zone2.example.com"
+            ),
+            self.get_canonical_value(records[1]),
+        )
+        self.assertIsNone(Record.objects.get(pk=records[0].pk).canonical_value)
+
+    def test_ns_records_case(self):
+        zone = self.zones[0]
+        zone.nameservers.add(self.nameserver)
+        ns_record = zone.record_set.get(type=RecordTypeChoices.NS)
+        Record.objects.filter(pk=ns_record.pk).update(value="NS1.Example.COM.")
+
+        zone.update_ns_records()
+
+        self.assertEqual(
+            [ns_record.pk],
+            list(
+                zone.record_set.filter(type=RecordTypeChoices.NS).values_list(
+                    "pk", flat=True
+                )
+            ),
+        )
+
+    def test_loader_formatting(self):
+        Record.objects.create(
+            zone=self.zones[0],
+            name="@",
+            type=RecordTypeChoices.MX,
+            value="10 mail.zone1.example.com.",
+        )
+
+        loader = RecordLoader()
+        loader.load(
+            read_csv_records(
+                io.StringIO(
+                    "zone,view,name,type,value\n"
+                    "zone1.example.com,,@,MX,10 Mail\n"
+                    "zone1.example.com,,@,MX,10  mail.zone1.example.com.\n"
+                )
+            )
+        )
+
+        self.assertEqual(0, loader.created)
+        self.assertEqual(1, loader.updated)
+        self.assertEqual(
+            1,
+            self.zones[0].record_set.filter(type=RecordTypeChoices.MX).count(),
+        )
@@ -0,0 +1,209 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+
+from users.models import Token
+
+from netbox_dns.instrumentation import register_hook, span, unregister_hook
+from netbox_dns.metrics import get_object_counts
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, View, Zone
+
+
+class InstrumentationTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+        cls.view = View.objects.create(name="view1")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(name="zone2.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(
+                name="zone1.example.com",
+                view=cls.view,
+                **cls.zone_data,
+                soa_mname=cls.nameserver,
+            ),
+            Zone(name="0.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+            zone.nameservers.add(cls.nameserver)
+
+    def setUp(self):
+        self.spans = []
+        register_hook(self.hook)
+        self.addCleanup(unregister_hook, self.hook)
+
+    def hook(self, name, duration, labels):
+        self.assertGreaterEqual(duration, 0)
+        self.spans.append((name, labels))
+
+    def assertObjectCounts(self):
+        expected = [
+            (
+                None,
+                Zone.objects.filter(view__isnull=True).count(),
+                Record.objects.filter(zone__view__isnull=True).count(),
+            ),
+            (
+                self.view.name,
+                Zone.objects.filter(view=self.view).count(),
+                Record.objects.filter(zone__view=self.view).count(),
+            ),
+        ]
+        self.assertEqual(expected, get_object_counts())
+
+    def test_record_save_spans(self):
+        Record.objects.create(
+            zone=self.zones[0],
+            name="name1",
+            type=RecordTypeChoices.A,
+            value="10.0.0.1",
+        )
+
+        names = [name for name, _ in self.spans]
+        for name in (
+            "record.save.validate",
+            "record.update_ptr_record",
+            "record.ptr_zone",
+            "record.ptr_write",
+            "record.save.write",
+            "record.save.serial",
+            "zone.update_soa_record",
+        ):
+            self.assertIn(name, names)
+
+        self.assertEqual(("record.save", {"type": "A", "error": False}), self.spans[-1])
+
+    def test_zone_save_spans(self):
+        self.zones[1].nameservers.clear()
+
+        names = [name for name, _ in self.spans]
+        self.assertIn("zone.update_ns_records", names)
+
+        self.spans.clear()
+        self.zones[1].save()
+
+        names = [name for name, _ in self.spans]
+        for name in (
+            "zone.save.validate",
+            "zone.save.serial",
+            "zone.save.write",
+            "zone.save.ptr",
+            "zone.update_soa_record",
+        ):
+            self.assertIn(name, names)
+
+        self.assertEqual("zone.save", names[-1])
+
+    def test_span_error(self):
+        with self.assertRaises(ValidationError):
+            Record.objects.create(
+                zone=self.zones[0],
+                name="name1",
+                type=RecordTypeChoices.A,
+                value="10.0.0.256",
+            )
+
+        self.assertIn(
+            ("record.save.validate", {"type": "A", "error": True}), self.spans
+        )
+        self.assertEqual(("record.save", {"type": "A", "error": True}), self.spans[-1])
+
+    def test_span_without_hooks(self):
+        unregister_hook(self.hook)
+
+        self.assertIs(span("first"), span("second"))
+
+    def test_record_counters(self):
+        self.assertObjectCounts()
+
+        records = [
+            Record.objects.create(
+                zone=self.zones[0],
+                name=f"name{index}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.0.{index}",
+            )
+            for index in range(1, 5)
+        ]
+        Record.objects.bulk_create(
+            [
+                Record(
+                    zone=self.zones[2],
+                    name=f"name{index}",
+                    type=RecordTypeChoices.TXT,
+                    value="test",
+                )
+                for index in range(10)
+            ]
+        )
+        self.assertObjectCounts()
+
+        Record.objects.filter(zone=self.zones[2]).update(zone=self.zones[1])
+        self.assertObjectCounts()
+
+        records[0].delete()
+        self.zones[3].delete()
+        self.assertObjectCounts()
+
+    def test_metrics_view(self):
+        url = reverse("plugins:netbox_dns:metrics")
+
+        response = self.client.get(url)
+        self.assertEqual(404, response.status_code)
+
+        with self.settings(
+            PLUGINS_CONFIG={
+                "netbox_dns": {
+                    **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+                    "feature_metrics": True,
+                }
+            }
+        ):
+            Record.objects.create(
+                zone=self.zones[2],
+                name="name1",
+                type=RecordTypeChoices.TXT,
+                value="test",
+            )
+            response = self.client.get(url)
+            self.assertEqual(401, response.status_code)
+
+            response = self.client.get(url, HTTP_AUTHORIZATION="Token invalid")
+            self.assertEqual(401, response.status_code)
+
+            user = get_user_model().objects.create_user(username="metrics")
+            token = Token.objects.create(user=user)
+            response = self.client.get(url, HTTP_AUTHORIZATION=f"Token {token.key}")
+            self.assertEqual(200, response.status_code)
+
+            self.client.force_login(user)
+            response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+
+        content = response.content.decode()
+        record_count = Record.objects.filter(zone__view=self.view).count()
+        self.assertIn(f'netbox_dns_zones{{view="{self.view.name}"}} 1.0', content)
+        self.assertIn(
+            f'netbox_dns_records{{view="{self.view.name}"}} {record_count}.0', content
+        )
+        self.assertIn(
+            'netbox_dns_operation_duration_seconds_count{operation="record.save"}',
+            content,
+        )
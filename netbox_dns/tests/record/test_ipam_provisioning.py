@@ -0,0 +1,219 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import transaction
+from django.test import TestCase
+
+from netaddr import IPNetwork
+from ipam.choices import IPAddressStatusChoices
+from ipam.models import IPAddress
+
+from netbox_dns.models import (
+    NameServer,
+    Record,
+    RecordStatusChoices,
+    RecordTypeChoices,
+    Zone,
+)
+
+
+class IPAMProvisioningTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+        "soa_serial_auto": False,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(name="zone2.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(name="0.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+    def setUp(self):
+        plugin_config = {
+            **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+            "feature_ipam_provisioning": True,
+        }
+        self.settings_override = self.settings(
+            PLUGINS_CONFIG={"netbox_dns": plugin_config}
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+
+    def get_address_records(self):
+        return Record.objects.filter(
+            type__in=(RecordTypeChoices.A, RecordTypeChoices.AAAA)
+        )
+
+    def test_create_ip_address(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+
+        self.assertEqual(1, len(callbacks))
+
+        record = self.get_address_records().get()
+        self.assertEqual(self.zones[0], record.zone)
+        self.assertEqual("name1", record.name)
+        self.assertEqual("10.0.0.1", record.value)
+        self.assertEqual(self.zones[2], record.ptr_record.zone)
+
+    def test_bulk_create_ip_addresses(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for index in range(1, 21):
+                IPAddress.objects.create(
+                    address=IPNetwork(f"10.0.0.{index}/24"),
+                    dns_name=f"name{index}.zone{index % 2 + 1}.example.com",
+                )
+
+        self.assertEqual(1, len(callbacks))
+        self.assertEqual(20, self.get_address_records().count())
+        self.assertEqual(
+            20,
+            Record.objects.filter(
+                zone=self.zones[2], type=RecordTypeChoices.PTR
+            ).count(),
+        )
+
+    def test_create_ip_address_after_rollback(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+        request_started.send(sender=self.__class__)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.2/24"), dns_name="name2.zone1.example.com"
+            )
+
+        self.assertEqual(1, len(callbacks))
+        self.assertEqual(
+            ["name2"], list(self.get_address_records().values_list("name", flat=True))
+        )
+
+    def test_create_ip_address_after_savepoint_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    IPAddress.objects.create(
+                        address=IPNetwork("10.0.0.1/24"),
+                        dns_name="name1.zone1.example.com",
+                    )
+                    raise ValueError
+            except ValueError:
+                pass
+
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.2/24"), dns_name="name2.zone1.example.com"
+            )
+
+        self.assertEqual(1, len(callbacks))
+        self.assertEqual(
+            ["name2"], list(self.get_address_records().values_list("name", flat=True))
+        )
+
+    def test_create_ip_address_cname_conflict(self):
+        Record.objects.create(
+            zone=self.zones[0],
+            name="name1",
+            type=RecordTypeChoices.CNAME,
+            value="name2.zone1.example.com.",
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+
+        self.assertFalse(self.get_address_records().exists())
+
+    def test_create_duplicate_ip_addresses(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/16"), dns_name="name1.zone1.example.com"
+            )
+
+        self.assertEqual(1, self.get_address_records().count())
+
+    def test_change_ip_address(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ip_address = IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ip_address.dns_name = "name2.zone2.example.com"
+            ip_address.address = IPNetwork("10.0.0.2/24")
+            ip_address.status = IPAddressStatusChoices.STATUS_RESERVED
+            ip_address.save()
+
+        record = self.get_address_records().get()
+        self.assertEqual(self.zones[1], record.zone)
+        self.assertEqual("name2", record.name)
+        self.assertEqual("10.0.0.2", record.value)
+        self.assertEqual(RecordStatusChoices.STATUS_INACTIVE, record.status)
+        self.assertIsNone(record.ptr_record)
+
+    def test_delete_ip_address(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ip_address = IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ip_address.delete()
+
+        self.assertFalse(self.get_address_records().exists())
+        self.assertFalse(
+            Record.objects.filter(type=RecordTypeChoices.PTR, managed=True).exists()
+        )
+
+    def test_unrelated_records_not_deleted(self):
+        record = Record.objects.create(
+            zone=self.zones[0],
+            name="name2",
+            type=RecordTypeChoices.A,
+            value="10.0.0.1",
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ip_address = IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ip_address.delete()
+
+        self.assertEqual([record], list(self.get_address_records()))
+
+    def test_provisioning_disabled(self):
+        self.settings_override.disable()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            IPAddress.objects.create(
+                address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+            )
+
+        self.settings_override.enable()
+
+        self.assertEqual([], callbacks)
+        self.assertFalse(self.get_address_records().exists())
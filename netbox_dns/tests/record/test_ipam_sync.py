@@ -0,0 +1,214 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from netaddr import IPNetwork
+from extras.choices import ObjectChangeActionChoices
+from extras.models import ObjectChange
+from ipam.models import IPAddress, VRF
+
+from netbox_dns.ipam_sync import IPAMDNSSync
+from netbox_dns.models import View, Zone, NameServer, Record, RecordTypeChoices
+
+
+class IPAMDNSSyncTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+        cls.vrf = VRF.objects.create(name="vrf1")
+        cls.view = View.objects.create(name="view1")
+
+        cls.zones = (
+            Zone(name="example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(
+                name="zone1.example.com",
+                **cls.zone_data,
+                soa_mname=cls.nameserver,
+                view=cls.view,
+            ),
+            Zone(name="0.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+    def test_create_address_records(self):
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+        )
+        IPAddress.objects.create(
+            address=IPNetwork("fe80:dead:beef::1/64"), dns_name="name2.example.com"
+        )
+
+        sync = IPAMDNSSync()
+        with self.assertNumQueries(4):
+            diff = sync.diff_dns()
+
+        self.assertEqual(2, len(diff.create))
+        self.assertEqual([], diff.conflicts)
+
+        sync.apply_dns(diff)
+
+        record = Record.objects.get(type=RecordTypeChoices.A, ip_address="10.0.0.1")
+        self.assertEqual(self.zones[1], record.zone)
+        self.assertEqual("name1", record.name)
+        self.assertEqual("1", record.ptr_record.name)
+        self.assertEqual(self.zones[3], record.ptr_record.zone)
+
+        record = Record.objects.get(
+            type=RecordTypeChoices.AAAA, ip_address="fe80:dead:beef::1"
+        )
+        self.assertEqual(self.zones[0], record.zone)
+        self.assertEqual("name2", record.name)
+
+    def test_create_address_records_vrf_view(self):
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.1/24"),
+            dns_name="name1.zone1.example.com",
+            vrf=self.vrf,
+        )
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.2/24"), dns_name="name2.zone1.example.com"
+        )
+
+        sync = IPAMDNSSync(vrf=self.vrf, view=self.view)
+        sync.apply_dns(sync.diff_dns())
+
+        record = Record.objects.get(type=RecordTypeChoices.A, zone=self.zones[2])
+        self.assertEqual("name1", record.name)
+        self.assertFalse(
+            Record.objects.filter(
+                type=RecordTypeChoices.A, ip_address="10.0.0.2"
+            ).exists()
+        )
+
+    def test_create_duplicate_address_records(self):
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+        )
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.1/16"), dns_name="name1.zone1.example.com"
+        )
+
+        sync = IPAMDNSSync()
+        diff = sync.diff_dns()
+
+        self.assertEqual(1, len(diff.create))
+        self.assertEqual([], diff.conflicts)
+
+        sync.apply_dns(diff)
+
+        self.assertEqual(
+            1,
+            Record.objects.filter(
+                type=RecordTypeChoices.A, ip_address="10.0.0.1"
+            ).count(),
+        )
+
+    def test_cname_conflict(self):
+        Record.objects.create(
+            zone=self.zones[1],
+            name="name1",
+            type=RecordTypeChoices.CNAME,
+            value="name2.zone1.example.com.",
+        )
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.1/24"), dns_name="name1.zone1.example.com"
+        )
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.2/24"), dns_name="name2.zone1.example.com"
+        )
+
+        diff = IPAMDNSSync().diff_dns()
+
+        self.assertEqual(["name2"], [record.name for record, _ in diff.create])
+        self.assertEqual(1, len(diff.conflicts))
+        self.assertIn("CNAME", diff.conflicts[0])
+
+    def test_no_zone_conflict(self):
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.1/24"), dns_name="name1.example.org"
+        )
+
+        diff = IPAMDNSSync().diff_dns()
+
+        self.assertEqual([], diff.create)
+        self.assertEqual(1, len(diff.conflicts))
+
+    def test_update_address_record(self):
+        Record.objects.create(
+            zone=self.zones[0],
+            name="name1",
+            type=RecordTypeChoices.A,
+            value="10.0.0.1",
+        )
+        IPAddress.objects.create(
+            address=IPNetwork("10.0.0.1/24"), dns_name="name2.zone1.example.com"
+        )
+
+        diff = IPAMDNSSync().diff_dns()
+        self.assertEqual([], diff.update)
+        self.assertEqual(1, len(diff.conflicts))
+
+        sync = IPAMDNSSync(overwrite=True)
+        diff = sync.diff_dns()
+        self.assertEqual(1, len(diff.update))
+
+        sync.apply_dns(diff)
+
+        record = Record.objects.get(type=RecordTypeChoices.A, ip_address="10.0.0.1")
+        self.assertEqual(self.zones[1], record.zone)
+        self.assertEqual("name2", record.name)
+        self.assertEqual("name2.zone1.example.com.", record.ptr_record.value)
+
+    def test_update_dns_names(self):
+        Record.objects.create(
+            zone=self.zones[1],
+            name="name1",
+            type=RecordTypeChoices.A,
+            value="10.0.0.1",
+        )
+        Record.objects.create(
+            zone=self.zones[1],
+            name="name2",
+            type=RecordTypeChoices.A,
+            value="10.0.0.2",
+        )
+        ip_address1 = IPAddress.objects.create(address=IPNetwork("10.0.0.1/24"))
+        ip_address2 = IPAddress.objects.create(
+            address=IPNetwork("10.0.0.2/24"), dns_name="name3.example.com"
+        )
+
+        sync = IPAMDNSSync()
+        with self.assertNumQueries(2):
+            diff = sync.diff_ipam()
+
+        self.assertEqual(1, len(diff.update))
+        self.assertEqual(1, len(diff.conflicts))
+
+        sync.apply_ipam(diff)
+
+        ip_address1.refresh_from_db()
+        ip_address2.refresh_from_db()
+        self.assertEqual("name1.zone1.example.com", ip_address1.dns_name)
+        self.assertEqual("name3.example.com", ip_address2.dns_name)
+
+        object_change = ObjectChange.objects.get(
+            changed_object_type=ContentType.objects.get_for_model(IPAddress),
+            changed_object_id=ip_address1.pk,
+            action=ObjectChangeActionChoices.ACTION_UPDATE,
+        )
+        self.assertEqual("", object_change.prechange_data["dns_name"])
+        self.assertEqual(
+            "name1.zone1.example.com", object_change.postchange_data["dns_name"]
+        )
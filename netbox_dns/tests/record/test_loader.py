@@ -0,0 +1,178 @@
+import io
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from netbox_dns.loader import RecordLoader, read_csv_records
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+
+
+class RecordLoaderTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+        cls.zones = [
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(name="1.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver),
+        ]
+        for zone in cls.zones:
+            zone.save()
+
+    def load(self, csv_data, replace=False):
+        loader = RecordLoader(replace=replace)
+        loader.load(read_csv_records(io.StringIO(csv_data)))
+        return loader
+
+    def test_load_records(self):
+        loader = self.load(
+            "zone,view,name,type,value,ttl\n"
+            "zone1.example.com,,name1,A,10.0.1.42,\n"
+            "zone1.example.com,,name1,TXT,test,600\n"
+        )
+
+        self.assertEqual(2, loader.created)
+        record = Record.objects.get(zone=self.zones[0], name="name1", type="TXT")
+        self.assertEqual(600, record.ttl)
+
+    def test_load_records_empty_description(self):
+        self.load(
+            "zone,view,name,type,value,description\n"
+            "zone1.example.com,,name1,TXT,test,\n"
+            "zone1.example.com,,name2,TXT,test,Test record\n"
+        )
+
+        record = Record.objects.get(zone=self.zones[0], name="name1", type="TXT")
+        self.assertEqual("", record.description)
+        record = Record.objects.get(zone=self.zones[0], name="name2", type="TXT")
+        self.assertEqual("Test record", record.description)
+
+    def test_load_records_ptr(self):
+        self.load(
+            "zone,view,name,type,value\n" "zone1.example.com,,name1,A,10.0.1.42\n"
+        )
+
+        record = Record.objects.get(zone=self.zones[0], name="name1", type="A")
+        self.assertEqual("10.0.1.42", str(record.ip_address))
+        self.assertEqual(self.zones[1], record.ptr_record.zone)
+        self.assertEqual("42", record.ptr_record.name)
+        self.assertEqual("name1.zone1.example.com.", record.ptr_record.value)
+
+    def test_load_records_update(self):
+        self.load("zone,view,name,type,value\nzone1.example.com,,name1,TXT,test\n")
+        loader = self.load(
+            "zone,view,name,type,value,ttl\nzone1.example.com,,name1,TXT,test,600\n"
+        )
+
+        self.assertEqual(0, loader.created)
+        self.assertEqual(1, loader.updated)
+        record = Record.objects.get(zone=self.zones[0], name="name1", type="TXT")
+        self.assertEqual(600, record.ttl)
+
+    def test_load_records_replace(self):
+        self.load(
+            "zone,view,name,type,value\n"
+            "zone1.example.com,,name1,A,10.0.1.42\n"
+            "zone1.example.com,,name2,A,10.0.1.43\n"
+        )
+        loader = self.load(
+            "zone,view,name,type,value\nzone1.example.com,,name1,A,10.0.1.42\n",
+            replace=True,
+        )
+
+        self.assertEqual(1, loader.deleted)
+        self.assertFalse(
+            Record.objects.filter(zone=self.zones[0], name="name2").exists()
+        )
+        self.assertFalse(
+            Record.objects.filter(
+                zone=self.zones[1], type=RecordTypeChoices.PTR, name="43"
+            ).exists()
+        )
+
+    def test_load_records_serial(self):
+        zone = self.zones[0]
+        soa_serial = zone.soa_serial
+
+        self.load("zone,view,name,type,value\nzone1.example.com,,name1,TXT,test\n")
+        zone.refresh_from_db()
+
+        self.assertTrue(zone.soa_serial > soa_serial)
+
+    def test_load_invalid_record_fail(self):
+        with self.assertRaises(ValidationError):
+            self.load(
+                "zone,view,name,type,value\n"
+                "zone1.example.com,,name1,A,10.0.1.42\n"
+                "zone1.example.com,,name2,A,not-an-address\n"
+            )
+
+        self.assertFalse(
+            Record.objects.filter(zone=self.zones[0], name="name1").exists()
+        )
+
+    def test_load_cname_conflict_fail(self):
+        with self.assertRaisesRegex(ValidationError, "CNAME record for name name1"):
+            self.load(
+                "zone,view,name,type,value\n"
+                "zone1.example.com,,name1,CNAME,name2\n"
+                "zone1.example.com,,name1,TXT,test\n"
+            )
+
+        self.assertFalse(
+            Record.objects.filter(zone=self.zones[0], name="name1").exists()
+        )
+
+    def test_load_cname_conflict_existing_fail(self):
+        Record.objects.create(
+            zone=self.zones[0], name="name1", type=RecordTypeChoices.TXT, value="test"
+        )
+
+        with self.assertRaisesRegex(ValidationError, "CNAME is not allowed"):
+            self.load(
+                "zone,view,name,type,value\nzone1.example.com,,name1,CNAME,name2\n"
+            )
+
+    def test_load_cname_replace(self):
+        Record.objects.create(
+            zone=self.zones[0], name="name1", type=RecordTypeChoices.TXT, value="test"
+        )
+
+        self.load(
+            "zone,view,name,type,value\nzone1.example.com,,name1,CNAME,name2\n",
+            replace=True,
+        )
+
+        self.assertEqual(
+            [RecordTypeChoices.CNAME],
+            list(
+                Record.objects.filter(zone=self.zones[0], name="name1").values_list(
+                    "type", flat=True
+                )
+            ),
+        )
+
+    def test_load_ptr_records_changed_only(self):
+        self.load("zone,view,name,type,value\nzone1.example.com,,name1,A,10.0.1.42\n")
+        Record.objects.filter(type=RecordTypeChoices.PTR).delete()
+
+        self.load("zone,view,name,type,value\nzone1.example.com,,name2,A,10.0.1.43\n")
+
+        self.assertEqual(
+            ["43"],
+            list(
+                Record.objects.filter(type=RecordTypeChoices.PTR).values_list(
+                    "name", flat=True
+                )
+            ),
+        )
@@ -0,0 +1,170 @@
+import json
+
+from django.urls import reverse
+
+from netbox_dns.lookup import RecordLookup
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, View, Zone
+from netbox_dns.tests.custom import APITestCase
+
+
+class RecordLookupTest(APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.view = View.objects.create(name="internal")
+        cls.zones = [
+            Zone.objects.create(
+                name="zone1.example.com", **cls.zone_data, soa_mname=nameserver
+            ),
+            Zone.objects.create(
+                name="sub.zone1.example.com", **cls.zone_data, soa_mname=nameserver
+            ),
+            Zone.objects.create(
+                name="1.0.10.in-addr.arpa", **cls.zone_data, soa_mname=nameserver
+            ),
+            Zone.objects.create(
+                name="zone1.example.com",
+                view=cls.view,
+                **cls.zone_data,
+                soa_mname=nameserver,
+            ),
+        ]
+
+        for index in range(20):
+            Record.objects.create(
+                zone=cls.zones[0],
+                name=f"name{index}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.1.{index}",
+            )
+        Record.objects.create(
+            zone=cls.zones[1],
+            name="name1",
+            type=RecordTypeChoices.A,
+            value="10.0.2.1",
+        )
+        Record.objects.create(
+            zone=cls.zones[3],
+            name="name1",
+            type=RecordTypeChoices.A,
+            value="10.1.1.1",
+        )
+
+    def lookup(self, names=(), addresses=(), view=None):
+        lookup = RecordLookup(view=view)
+        return list(lookup.lookup_names(names)) + list(
+            lookup.lookup_addresses(addresses)
+        )
+
+    def test_lookup_name(self):
+        result = self.lookup(["name1.zone1.example.com."], view=self.view)[0]
+
+        self.assertIsNone(result.error)
+        self.assertEqual([self.zones[3]], result.zones)
+        self.assertEqual(["10.1.1.1"], [record.value for record in result.records])
+
+    def test_lookup_name_views(self):
+        result = self.lookup(["NAME1.zone1.example.com"])[0]
+
+        self.assertEqual({self.zones[0], self.zones[3]}, set(result.zones))
+        self.assertEqual(
+            {"10.0.1.1", "10.1.1.1"}, {record.value for record in result.records}
+        )
+        self.assertEqual(
+            ["1.1.0.10.in-addr.arpa."],
+            [record.fqdn for record in result.ptr_records],
+        )
+
+    def test_lookup_name_closest_zone(self):
+        result = self.lookup(["name1.sub.zone1.example.com"])[0]
+
+        self.assertEqual([self.zones[1]], result.zones)
+        self.assertEqual(["10.0.2.1"], [record.value for record in result.records])
+
+    def test_lookup_name_not_found(self):
+        results = self.lookup(["name99.zone1.example.com", "name1.example.org"])
+
+        self.assertEqual([self.zones[0]], results[0].zones)
+        self.assertEqual([], results[0].records)
+        self.assertEqual([], results[1].zones)
+
+    def test_lookup_address(self):
+        result = self.lookup(addresses=["10.0.1.1"])[0]
+
+        self.assertIsNone(result.error)
+        self.assertEqual([self.zones[2]], result.zones)
+        self.assertEqual(
+            ["name1.zone1.example.com."], [record.fqdn for record in result.records]
+        )
+        self.assertEqual(
+            ["1.1.0.10.in-addr.arpa."],
+            [record.fqdn for record in result.ptr_records],
+        )
+
+    def test_lookup_invalid(self):
+        results = self.lookup(["name1..zone1.example.com"], ["10.0.1.256"])
+
+        self.assertIsNotNone(results[0].error)
+        self.assertIsNotNone(results[1].error)
+
+    def test_lookup_queries(self):
+        names = [f"name{index}.zone1.example.com" for index in range(20)]
+        addresses = [f"10.0.1.{index}" for index in range(20)]
+
+        with self.assertNumQueries(5):
+            results = self.lookup(names, addresses)
+
+        self.assertEqual(40, len(results))
+        self.assertTrue(all(len(result.records) == 1 for result in results))
+
+    def test_lookup_api(self):
+        self.add_permissions("netbox_dns.view_zone", "netbox_dns.view_record")
+        url = reverse("plugins-api:netbox_dns-api:record-lookup")
+
+        response = self.client.post(
+            url,
+            {
+                "names": ["name1.zone1.example.com", "name1..zone1.example.com"],
+                "addresses": ["10.0.1.2"],
+            },
+            format="json",
+            **self.header,
+        )
+
+        self.assertEqual(200, response.status_code)
+        results = json.loads(b"".join(response.streaming_content))["results"]
+
+        self.assertEqual(
+            ["name1.zone1.example.com", "name1..zone1.example.com", "10.0.1.2"],
+            [result["query"] for result in results],
+        )
+        self.assertEqual(
+            ["name", "name", "address"], [result["type"] for result in results]
+        )
+        self.assertEqual(2, len(results[0]["records"]))
+        self.assertIn("error", results[1])
+        self.assertEqual(
+            ["name2"], [record["name"] for record in results[2]["records"]]
+        )
+        self.assertEqual(1, len(results[2]["ptr_records"]))
+
+    def test_lookup_api_permission(self):
+        url = reverse("plugins-api:netbox_dns-api:record-lookup")
+
+        response = self.client.post(
+            url, {"names": ["name1.zone1.example.com"]}, format="json", **self.header
+        )
+
+        self.assertEqual(403, response.status_code)
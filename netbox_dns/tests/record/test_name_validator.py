@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from netbox_dns.models import RecordTypeChoices
+from netbox_dns.validators import NameValidator, get_validator, validate_domain_name
+
+
+class NameValidatorTest(SimpleTestCase):
+    def test_validate_many(self):
+        validator = NameValidator()
+
+        names = [
+            "zone1.example.com",
+            "zone_1.example.com",
+            "xn--zone1.example.com",
+            "zo--ne1.example.com",
+            "zone1.example.com",
+            "zone_1.example.com",
+        ]
+        errors = validator.validate_many(names)
+
+        self.assertEqual([1, 3, 5], sorted(errors))
+        for exc in errors.values():
+            self.assertIsInstance(exc, ValidationError)
+
+    def test_validate_many_record_names(self):
+        validator = NameValidator(
+            tolerate_leading_underscore_types=("TXT",),
+            tolerate_non_rfc1035_types=("CNAME",),
+        )
+
+        names = [
+            ("_name1", RecordTypeChoices.TXT),
+            ("_name1", RecordTypeChoices.A),
+            ("name_1", RecordTypeChoices.CNAME),
+            ("name-1", RecordTypeChoices.A),
+            ("*", RecordTypeChoices.A),
+        ]
+        errors = validator.validate_many(names, validator.validate_record_name)
+
+        self.assertEqual([1], list(errors))
+
+    def test_validate_many_fqdn(self):
+        validator = NameValidator()
+
+        errors = validator.validate_many(
+            ["name1.example.com.", "name1", "name-.example.com"],
+            validator.validate_fqdn,
+        )
+
+        self.assertEqual([1, 2], sorted(errors))
+
+    def test_settings_change(self):
+        validator = get_validator()
+        self.assertIs(validator, get_validator())
+
+        with self.assertRaises(ValidationError):
+            validate_domain_name("zone_1.example.com")
+
+        with self.settings(
+            PLUGINS_CONFIG={
+                "netbox_dns": {
+                    **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+                    "tolerate_underscores_in_hostnames": True,
+                }
+            }
+        ):
+            self.assertIsNot(validator, get_validator())
+            validate_domain_name("zone_1.example.com")
+
+        with self.assertRaises(ValidationError):
+            validate_domain_name("zone_1.example.com")
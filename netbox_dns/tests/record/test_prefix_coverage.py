@@ -0,0 +1,93 @@
+from django.test import TestCase
+
+from netaddr import IPNetwork
+
+from netbox_dns.filters import RecordFilter
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+from netbox_dns.utilities import get_prefix_gaps
+
+
+class PrefixCoverageTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=nameserver),
+            Zone(name="1.0.10.in-addr.arpa", **cls.zone_data, soa_mname=nameserver),
+            Zone(name="4.0.10.in-addr.arpa", **cls.zone_data, soa_mname=nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+        for address in ("10.0.1.1", "10.0.1.2", "10.0.2.1", "10.1.0.1"):
+            Record.objects.create(
+                zone=cls.zones[0],
+                name=f"name-{address.replace('.', '-')}",
+                type=RecordTypeChoices.A,
+                value=address,
+            )
+
+    def test_filter_net_contained(self):
+        records = RecordFilter(
+            {"ip_address__net_contained": "10.0.0.0/16", "type": ["A"]},
+            Record.objects.all(),
+        ).qs
+
+        self.assertEqual(
+            {"10.0.1.1", "10.0.1.2", "10.0.2.1"},
+            {record.value for record in records},
+        )
+
+    def test_filter_net_contained_ptr(self):
+        records = RecordFilter(
+            {"ip_address__net_contained": "10.0.1.0/24", "type": ["PTR"]},
+            Record.objects.all(),
+        ).qs
+
+        self.assertEqual(2, records.count())
+        self.assertTrue(all(record.zone == self.zones[1] for record in records))
+
+    def test_filter_net_contained_or_equal(self):
+        records = RecordFilter(
+            {"ip_address__net_contained_or_equal": "10.1.0.1/32", "type": ["A"]},
+            Record.objects.all(),
+        ).qs
+
+        self.assertEqual(["10.1.0.1"], [record.value for record in records])
+
+    def test_filter_invalid_prefix(self):
+        records = RecordFilter(
+            {"ip_address__net_contained": "invalid"}, Record.objects.all()
+        ).qs
+
+        self.assertFalse(records.exists())
+
+    def test_prefix_gaps(self):
+        networks = [zone.arpa_network for zone in self.zones[1:]]
+
+        self.assertEqual(
+            [
+                IPNetwork("10.0.0.0/24"),
+                IPNetwork("10.0.2.0/23"),
+                IPNetwork("10.0.5.0/24"),
+                IPNetwork("10.0.6.0/23"),
+            ],
+            get_prefix_gaps(IPNetwork("10.0.0.0/21"), networks),
+        )
+
+    def test_prefix_gaps_covered(self):
+        networks = [zone.arpa_network for zone in self.zones[1:]]
+
+        self.assertEqual([], get_prefix_gaps(IPNetwork("10.0.1.128/25"), networks))
@@ -0,0 +1,166 @@
+from django.urls import reverse
+
+from netbox_dns.bulk import update_ptr_records
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, View, Zone
+from netbox_dns.tests.custom import APITestCase, QueryCountTestMixin
+
+
+class RecordQueryCountTest(QueryCountTestMixin, APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+        view = View.objects.create(name="view1")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(
+                name="zone1.example.com",
+                **cls.zone_data,
+                soa_mname=cls.nameserver,
+                view=view,
+            ),
+            Zone(name="0.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+        Record.objects.bulk_create(
+            [
+                Record(
+                    zone=cls.zones[index % 2],
+                    name=f"name{index}",
+                    type=RecordTypeChoices.A,
+                    value=f"10.0.0.{index}",
+                )
+                for index in range(1, 61)
+            ]
+        )
+        update_ptr_records(Record.objects.all())
+
+        cls.record = Record.objects.get(zone=cls.zones[0], name="name2")
+
+    def test_record_save(self):
+        # The budgets are ceilings for the complete save. Saving an A record
+        # also creates or updates its PTR record, so it needs the queries of
+        # a second record save. The other types must take the same path:
+        # CNAME, MX and TXT records need exactly the same queries, and an
+        # AAAA record without a reverse zone only one more to look it up.
+        counts = {}
+        for record_type, value, create_budget, update_budget in (
+            (RecordTypeChoices.A, "10.0.0.200", 39, 46),
+            (RecordTypeChoices.AAAA, "fe80::1", 19, 20),
+            (RecordTypeChoices.CNAME, "name2.zone1.example.com.", 18, 19),
+            (RecordTypeChoices.MX, "10 mx.example.com.", 18, 19),
+            (RecordTypeChoices.TXT, "test", 18, 19),
+        ):
+            with self.subTest(record_type=record_type):
+                record = Record(
+                    zone=self.zones[0],
+                    name=f"new-{record_type.lower()}",
+                    type=record_type,
+                    value=value,
+                )
+                create_count = self.assertQueryBudget(create_budget, record.save)
+
+                record.ttl = 3600
+                update_count = self.assertQueryBudget(update_budget, record.save)
+
+                counts[record_type] = (create_count, update_count)
+
+        self.assertEqual(counts[RecordTypeChoices.TXT], counts[RecordTypeChoices.MX])
+        self.assertEqual(counts[RecordTypeChoices.TXT], counts[RecordTypeChoices.CNAME])
+        self.assertEqual(
+            tuple(count + 1 for count in counts[RecordTypeChoices.TXT]),
+            counts[RecordTypeChoices.AAAA],
+        )
+
+    def test_ptr_record_save(self):
+        record = Record(
+            zone=self.zones[2],
+            name="250",
+            type=RecordTypeChoices.PTR,
+            value="name250.zone1.example.com.",
+        )
+        self.assertQueryBudget(18, record.save)
+
+    def test_record_save_constant(self):
+        zones = {}
+        for count in (1, 10, 50):
+            zone = Zone.objects.create(
+                name=f"zone-{count}.example.com",
+                **self.zone_data,
+                soa_mname=self.nameserver,
+            )
+            Record.objects.bulk_create(
+                [
+                    Record(
+                        zone=zone,
+                        name=f"name{index}",
+                        type=RecordTypeChoices.A,
+                        value=f"10.0.0.{index}",
+                    )
+                    for index in range(count)
+                ]
+            )
+            update_ptr_records(Record.objects.filter(zone=zone))
+            zones[count] = zone
+
+        self.assertConstantQueries(
+            lambda count: Record(
+                zone=zones[count],
+                name="new",
+                type=RecordTypeChoices.A,
+                value=f"10.0.0.{count + 100}",
+            ).save(),
+            zones,
+        )
+
+    def test_record_delete(self):
+        self.assertQueryBudget(40, self.record.delete)
+
+    def test_api_list(self):
+        self.assertListBudget(
+            20,
+            reverse("plugins-api:netbox_dns-api:record-list"),
+            **self.header,
+        )
+
+    def test_api_detail(self):
+        self.assertGetBudget(
+            20,
+            reverse(
+                "plugins-api:netbox_dns-api:record-detail",
+                kwargs={"pk": self.record.pk},
+            ),
+            **self.header,
+        )
+
+    def test_view_list(self):
+        self.client.force_login(self.user)
+
+        self.assertListBudget(
+            40, reverse("plugins:netbox_dns:record_list"), page_parameter="per_page"
+        )
+        self.assertListBudget(
+            40,
+            reverse("plugins:netbox_dns:managed_record_list"),
+            page_parameter="per_page",
+        )
+
+    def test_view_detail(self):
+        self.client.force_login(self.user)
+
+        self.assertGetBudget(
+            40, reverse("plugins:netbox_dns:record", kwargs={"pk": self.record.pk})
+        )
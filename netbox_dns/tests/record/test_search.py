@@ -0,0 +1,147 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import CharField
+from django.test import TestCase
+
+from extras.models import CachedValue
+
+from netbox_dns.bulk import update_ptr_records
+from netbox_dns.filters import RecordFilter, ZoneFilter
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+
+
+class SearchTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=nameserver),
+            Zone(name="zone2.example.com", **cls.zone_data, soa_mname=nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+        cls.records = (
+            Record(
+                zone=cls.zones[0],
+                name="Name1",
+                type=RecordTypeChoices.A,
+                value="10.0.0.1",
+            ),
+            Record(
+                zone=cls.zones[0],
+                name="name2",
+                type=RecordTypeChoices.TXT,
+                value="100% match",
+            ),
+            Record(
+                zone=cls.zones[1],
+                name="name3",
+                type=RecordTypeChoices.A,
+                value="10.0.0.3",
+            ),
+        )
+        for record in cls.records:
+            record.save()
+
+    def search_records(self, value):
+        return set(RecordFilter({"q": value}, Record.objects.filter(managed=False)).qs)
+
+    def test_search_record_name_case_insensitive(self):
+        self.assertEqual({self.records[0]}, self.search_records("NAME1"))
+
+    def test_search_record_value(self):
+        self.assertEqual(
+            {self.records[0], self.records[2]}, self.search_records("10.0.0.")
+        )
+
+    def test_search_record_zone_name(self):
+        self.assertEqual({self.records[2]}, self.search_records("zone2"))
+
+    def test_search_record_wildcards_escaped(self):
+        self.assertEqual({self.records[1]}, self.search_records("0%"))
+        self.assertEqual(set(), self.search_records("name_"))
+
+    def test_search_zone_name(self):
+        zones = ZoneFilter({"q": "ZONE1"}, Zone.objects.all()).qs
+
+        self.assertEqual([self.zones[0]], list(zones))
+
+    def test_ilike_contains_not_registered(self):
+        self.assertNotIn("ilike_contains", CharField.get_lookups())
+
+
+class SearchCacheTest(TestCase):
+    zone_data = SearchTest.zone_data
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=nameserver),
+            Zone(name="0.0.10.in-addr.arpa", **cls.zone_data, soa_mname=nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+    def get_cached_values(self, record):
+        return set(
+            CachedValue.objects.filter(
+                object_type=ContentType.objects.get_for_model(Record),
+                object_id=record.pk,
+            ).values_list("field", "value")
+        )
+
+    def test_bulk_ptr_records_cached(self):
+        Record.objects.bulk_create(
+            [
+                Record(
+                    zone=self.zones[0],
+                    name=f"name{index}",
+                    type=RecordTypeChoices.A,
+                    value=f"10.0.0.{index}",
+                )
+                for index in range(1, 11)
+            ]
+        )
+        update_ptr_records(Record.objects.filter(zone=self.zones[0]))
+
+        for ptr_record in Record.objects.filter(type=RecordTypeChoices.PTR):
+            self.assertIn(
+                ("value", ptr_record.value), self.get_cached_values(ptr_record)
+            )
+
+    def test_zone_rename_updates_records(self):
+        record = Record.objects.create(
+            zone=self.zones[0],
+            name="name1",
+            type=RecordTypeChoices.TXT,
+            value="test",
+        )
+
+        zone = self.zones[0]
+        zone.name = "zone2.example.com"
+        zone.save()
+
+        self.assertIn(("zone", "zone2.example.com"), self.get_cached_values(record))
+
+    def test_managed_ns_records_cached(self):
+        zone = self.zones[0]
+        zone.set_nameservers([NameServer.objects.create(name="ns2.example.com")])
+
+        ns_record = Record.objects.get(
+            zone=zone, type=RecordTypeChoices.NS, value="ns2.example.com."
+        )
+        self.assertIn(("value", "ns2.example.com."), self.get_cached_values(ns_record))
@@ -0,0 +1,31 @@
+from django.urls import reverse
+
+from netbox_dns.models import View
+from netbox_dns.tests.custom import APITestCase, QueryCountTestMixin
+
+
+class ViewQueryCountTest(QueryCountTestMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.views = View.objects.bulk_create(
+            [View(name=f"view{index}") for index in range(60)]
+        )
+
+    def test_api_list(self):
+        self.assertListBudget(
+            20, reverse("plugins-api:netbox_dns-api:view-list"), **self.header
+        )
+
+    def test_view_list(self):
+        self.client.force_login(self.user)
+
+        self.assertListBudget(
+            40, reverse("plugins:netbox_dns:view_list"), page_parameter="per_page"
+        )
+
+    def test_view_detail(self):
+        self.client.force_login(self.user)
+
+        self.assertGetBudget(
+            40, reverse("plugins:netbox_dns:view", kwargs={"pk": self.views[0].pk})
+        )
@@ -1,8 +1,16 @@
+import uuid
+
 from dns import rdata
 
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import RequestFactory, TestCase
 from django.db.models import ProtectedError
 
+from extras.choices import ObjectChangeActionChoices
+from extras.context_managers import change_logging
+from extras.models import ObjectChange
+
 from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
 
 
@@ -175,6 +183,79 @@ class AutoNSTest(TestCase):
         ns_values = [ns.value for ns in ns_records]
         self.assertEqual([f"{nameserver2.name}."], ns_values)
 
+    def test_zone_set_ns_replaces_ns_records(self):
+        zone = self.zone
+        nameserver1 = self.nameservers[0]
+        nameserver2 = self.nameservers[1]
+
+        zone.nameservers.add(nameserver1)
+        zone.set_nameservers([nameserver2])
+
+        ns_records = Record.objects.filter(
+            zone=zone, type=RecordTypeChoices.NS, managed=True, name="@"
+        )
+        ns_values = [ns.value for ns in ns_records]
+        self.assertEqual([f"{nameserver2.name}."], ns_values)
+
+    def test_zone_set_ns_no_duplicate_ns_records(self):
+        zone = self.zone
+        nameserver1 = self.nameservers[0]
+        nameserver2 = self.nameservers[1]
+
+        zone.set_nameservers([nameserver1, nameserver2])
+        zone.set_nameservers([nameserver1, nameserver2])
+        zone.update_ns_records()
+
+        ns_records = Record.objects.filter(
+            zone=zone, type=RecordTypeChoices.NS, managed=True, name="@"
+        )
+        self.assertEqual(2, len(ns_records))
+
+    def test_nameserver_add_zone_ns_record_added(self):
+        zone = self.zone
+        nameserver = self.nameservers[1]
+
+        nameserver.zones.add(zone)
+
+        ns_record = Record.objects.get(
+            name="@", zone=zone, type=RecordTypeChoices.NS, value=f"{nameserver.name}."
+        )
+        self.assertEqual(nameserver.name, ns_record.value.rstrip("."))
+
+    def test_nameserver_clear_zones_ns_record_removed(self):
+        zone = self.zone
+        nameserver = self.nameservers[1]
+
+        nameserver.zones.add(zone)
+        nameserver.zones.clear()
+
+        self.assertFalse(
+            Record.objects.filter(
+                zone=zone, type=RecordTypeChoices.NS, value=f"{nameserver.name}."
+            ).exists()
+        )
+
+    def test_zone_add_ns_ns_record_change_logged(self):
+        zone = self.zone
+        nameserver = self.nameservers[0]
+
+        request = RequestFactory().get("/")
+        request.id = uuid.uuid4()
+        request.user = get_user_model().objects.create(username="testuser")
+
+        with change_logging(request):
+            zone.nameservers.add(nameserver)
+
+        ns_record = Record.objects.get(
+            name="@", zone=zone, type=RecordTypeChoices.NS, value=f"{nameserver.name}."
+        )
+        object_change = ObjectChange.objects.get(
+            changed_object_type=ContentType.objects.get_for_model(Record),
+            changed_object_id=ns_record.pk,
+        )
+        self.assertEqual(ObjectChangeActionChoices.ACTION_CREATE, object_change.action)
+        self.assertEqual(request.id, object_change.request_id)
+
     def test_zone_add_ns_ns_record_added(self):
         zone = self.zone
         nameserver = self.nameservers[0]
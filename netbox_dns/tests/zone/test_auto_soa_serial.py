@@ -2,7 +2,9 @@ from time import time
 
 from unittest import skip
 
+from django.conf import settings
 from django.test import TestCase
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
@@ -61,6 +63,27 @@ class AutoSOASerialTest(TestCase):
 
         self.assertTrue(int(zone.soa_serial) >= self.start_time)
 
+    def test_soa_serial_auto_unchanged_zone(self):
+        zone = self.zones[0]
+        serial = zone.soa_serial
+
+        zone.description = "No change to the zone data"
+        zone.save()
+
+        self.assertEqual(zone.soa_serial, serial)
+
+    def test_soa_serial_auto_stale_instance(self):
+        zone = self.zones[0]
+        stale_zone = Zone.objects.get(pk=zone.pk)
+
+        zone.update_serial()
+        stale_zone.soa_refresh = 86400
+        stale_zone.save()
+
+        self.assertGreater(stale_zone.soa_serial, zone.soa_serial)
+        zone.refresh_from_db()
+        self.assertEqual(zone.soa_serial, stale_zone.soa_serial)
+
     def test_soa_serial_fixed(self):
         zone = self.zones[1]
         zone.save()
@@ -86,6 +109,59 @@ class AutoSOASerialTest(TestCase):
 
         self.assertEqual(zone.soa_serial, 42)
 
+    def test_record_change_updates_last_content_change(self):
+        zone = self.zones[0]
+
+        Record.objects.create(
+            zone=zone,
+            name="name1",
+            type=RecordTypeChoices.TXT,
+            value="test",
+        )
+        zone.refresh_from_db()
+
+        self.assertTrue(zone.last_content_change.timestamp() >= self.start_time)
+        self.assertTrue(int(zone.soa_serial) >= self.start_time)
+
+    def test_record_change_fixed_updates_last_content_change(self):
+        zone = self.zones[1]
+
+        Record.objects.create(
+            zone=zone,
+            name="name1",
+            type=RecordTypeChoices.TXT,
+            value="test",
+        )
+        zone.refresh_from_db()
+
+        self.assertTrue(zone.last_content_change.timestamp() >= self.start_time)
+        self.assertEqual(zone.soa_serial, 1)
+
+    def test_soa_serial_date_scheme(self):
+        zone = self.zones[1]
+        zone.soa_serial_auto = True
+
+        plugin_config = {
+            **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+            "zone_soa_serial_scheme": "date",
+        }
+        with self.settings(PLUGINS_CONFIG={"netbox_dns": plugin_config}):
+            zone.save()
+            first_serial = zone.soa_serial
+
+            Record.objects.create(
+                zone=zone,
+                name="name1",
+                type=RecordTypeChoices.TXT,
+                value="test",
+            )
+            zone.refresh_from_db()
+
+        date_serial = int(timezone.now().strftime("%Y%m%d")) * 100
+        self.assertTrue(first_serial >= date_serial)
+        self.assertTrue(first_serial < date_serial + 100)
+        self.assertEqual(zone.soa_serial, first_serial + 1)
+
     @skip("This test still has timing issues")
     def test_create_ptr_soa_serial_auto(self):
         f_zone = self.zones[0]
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from netbox_dns.importer import ZoneImporter
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, View, Zone
+
+
+class ZoneBulkImportTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameservers = (
+            NameServer(name="ns1.example.com"),
+            NameServer(name="ns2.example.com"),
+        )
+        NameServer.objects.bulk_create(cls.nameservers)
+        cls.view = View.objects.create(name="view1")
+
+        cls.zone = Zone.objects.create(
+            name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameservers[0]
+        )
+        cls.records = [
+            Record.objects.create(
+                zone=cls.zone,
+                name=f"name{index}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.{index}.1",
+            )
+            for index in range(4)
+        ]
+
+    def import_zones(self, rows, importer=None):
+        importer = importer or ZoneImporter()
+
+        with self.settings(
+            PLUGINS_CONFIG={
+                "netbox_dns": {
+                    **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+                    "zone_soa_mname": "ns1.example.com",
+                    "zone_soa_rname": "hostmaster.example.com",
+                }
+            }
+        ):
+            return importer.import_objects(rows)
+
+    def test_import_zones(self):
+        rows = [
+            {
+                "name": "zone2.example.com",
+                "nameservers": "ns2.example.com,ns1.example.com",
+            },
+            {
+                "name": "zone2.example.com",
+                "view": "view1",
+                "soa_mname": "ns2.example.com",
+                "soa_serial_auto": "false",
+                "soa_serial": "42",
+            },
+        ]
+
+        zones = self.import_zones(rows)
+        self.assertEqual(2, len(zones))
+
+        zone = Zone.objects.get(name="zone2.example.com", view__isnull=True)
+        self.assertEqual(self.nameservers[0], zone.soa_mname)
+        self.assertEqual(86400, zone.default_ttl)
+        self.assertEqual(
+            {"ns1.example.com.", "ns2.example.com."},
+            set(
+                zone.record_set.filter(type=RecordTypeChoices.NS).values_list(
+                    "value", flat=True
+                )
+            ),
+        )
+
+        zone = Zone.objects.get(name="zone2.example.com", view=self.view)
+        self.assertEqual(self.nameservers[1], zone.soa_mname)
+        self.assertEqual(42, zone.soa_serial)
+
+        soa_record = zone.record_set.get(type=RecordTypeChoices.SOA)
+        self.assertEqual(zone.soa_value, soa_record.value)
+        self.assertTrue(soa_record.managed)
+
+    def test_import_reverse_zones(self):
+        rows = [{"name": f"{index}.0.10.in-addr.arpa"} for index in range(256)]
+
+        zones = self.import_zones(rows)
+        self.assertEqual(256, len(zones))
+
+        for index, record in enumerate(self.records):
+            record.refresh_from_db()
+            self.assertEqual(f"{index}.0.10.in-addr.arpa", record.ptr_record.zone.name)
+            self.assertEqual(record.ptr_record.zone.arpa_network.prefixlen, 24)
+
+    def test_import_invalid_rows(self):
+        rows = [
+            {"name": "zone1.example.com"},
+            {"name": "zone2.example.com", "view": "view2"},
+            {"name": "zone3.example.com", "soa_mname": "ns3.example.com"},
+            {"name": "zone4.example.com", "nameservers": "ns3.example.com"},
+            {"name": "zone5..example.com"},
+            {"name": "zone6.example.com", "default_ttl": "x"},
+            {"name": "zone7.example.com"},
+            {"name": "zone7.example.com"},
+        ]
+
+        importer = ZoneImporter()
+        with self.assertRaises(ValidationError):
+            self.import_zones(rows, importer)
+
+        self.assertEqual([2, 3, 4, 5, 6], [index for index, _, _ in importer.errors])
+        self.assertFalse(Zone.objects.exclude(pk=self.zone.pk).exists())
@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.urls import reverse
+
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+from netbox_dns.tests.custom import APITestCase
+
+
+class ProfilingTest(APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zone = Zone.objects.create(
+            name="zone1.example.com", **cls.zone_data, soa_mname=nameserver
+        )
+        for index in range(10):
+            Record.objects.create(
+                zone=cls.zone,
+                name=f"name{index}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.0.{index}",
+            )
+
+    def setUp(self):
+        super().setUp()
+
+        self.user.is_staff = True
+        self.user.is_superuser = True
+        self.user.save()
+
+    def profiling_settings(self, **options):
+        return self.settings(
+            PLUGINS_CONFIG={
+                "netbox_dns": {
+                    **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+                    "feature_profiling": True,
+                    **options,
+                }
+            }
+        )
+
+    def assertReport(self, report):
+        self.assertEqual(200, report["status_code"])
+        self.assertGreater(report["queries"]["count"], 0)
+        self.assertGreater(report["queries"]["time"], 0)
+        self.assertTrue(report["functions"])
+        for query in report["queries"]["duplicates"]:
+            self.assertGreater(query["count"], 1)
+
+    def test_profile_view(self):
+        url = reverse("plugins:netbox_dns:zone", kwargs={"pk": self.zone.pk})
+
+        with self.profiling_settings():
+            response = self.client.get(url, HTTP_X_NETBOX_DNS_PROFILE="1")
+
+        self.assertEqual("application/json", response["Content-Type"])
+        self.assertReport(response.json())
+
+    def test_profile_api(self):
+        url = reverse("plugins-api:netbox_dns-api:record-list")
+
+        self.client.logout()
+        with self.profiling_settings():
+            response = self.client.get(f"{url}?dns_profile=1", **self.header)
+
+        report = response.json()
+        self.assertReport(report)
+        self.assertEqual(f"{url}?dns_profile=1", report["path"])
+
+    def test_profile_store(self):
+        url = reverse("plugins:netbox_dns:zone_records", kwargs={"pk": self.zone.pk})
+
+        with tempfile.TemporaryDirectory() as profiling_dir:
+            with self.profiling_settings(profiling_dir=profiling_dir):
+                response = self.client.get(f"{url}?dns_profile=1")
+
+            self.assertEqual(200, response.status_code)
+            self.assertIn("text/html", response["Content-Type"])
+
+            filename = response["X-NetBox-DNS-Profile"]
+            self.assertEqual(profiling_dir, os.path.dirname(filename))
+            with open(filename) as report_file:
+                self.assertReport(json.load(report_file))
+            self.assertTrue(os.path.exists(filename.replace(".json", ".prof")))
+
+    def test_profile_not_staff(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        url = reverse("plugins:netbox_dns:zone", kwargs={"pk": self.zone.pk})
+
+        with self.profiling_settings():
+            response = self.client.get(url, HTTP_X_NETBOX_DNS_PROFILE="1")
+
+        self.assertIn("text/html", response["Content-Type"])
+
+        url = reverse("plugins-api:netbox_dns-api:record-list")
+
+        self.client.logout()
+        with self.profiling_settings():
+            response = self.client.get(f"{url}?dns_profile=1", **self.header)
+
+        self.assertIn("results", response.json())
+
+    def test_profile_invalid_token(self):
+        url = reverse("plugins-api:netbox_dns-api:record-list")
+
+        self.client.logout()
+        with self.profiling_settings():
+            response = self.client.get(
+                f"{url}?dns_profile=1", HTTP_AUTHORIZATION="Token invalid"
+            )
+
+        self.assertIn("detail", response.json())
+        self.assertNotIn("queries", response.json())
+
+    def test_profile_disabled(self):
+        url = reverse("plugins:netbox_dns:zone", kwargs={"pk": self.zone.pk})
+
+        response = self.client.get(url, HTTP_X_NETBOX_DNS_PROFILE="1")
+
+        self.assertIn("text/html", response["Content-Type"])
@@ -0,0 +1,123 @@
+from django.urls import reverse
+
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, View, Zone
+from netbox_dns.tests.custom import APITestCase, QueryCountTestMixin
+
+
+class ZoneQueryCountTest(QueryCountTestMixin, APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameservers = [
+            NameServer.objects.create(name=f"ns{index}.example.com")
+            for index in range(1, 6)
+        ]
+        views = (View.objects.create(name="view1"), None)
+
+        cls.zones = [
+            Zone.objects.create(
+                name=f"zone{index}.example.com",
+                **cls.zone_data,
+                soa_mname=cls.nameservers[index % 5],
+                view=views[index % 2],
+            )
+            for index in range(60)
+        ]
+        for zone in cls.zones:
+            zone.set_nameservers(cls.nameservers[:2])
+
+        cls.zone = cls.zones[0]
+
+    def create_zone(self, name, **kwargs):
+        return Zone(
+            name=name, **self.zone_data, soa_mname=self.nameservers[0], **kwargs
+        )
+
+    def test_zone_save(self):
+        zone = self.create_zone("zone.example.com")
+        self.assertQueryBudget(30, zone.save)
+
+        zone.description = "test"
+        self.assertQueryBudget(30, zone.save)
+
+    def test_reverse_zone_save(self):
+        zone = self.create_zone("0.0.10.in-addr.arpa")
+        self.assertQueryBudget(30, zone.save)
+
+        zone.description = "test"
+        self.assertQueryBudget(30, zone.save)
+
+    def test_zone_save_constant(self):
+        zones = {}
+        for count in (1, 10, 50):
+            zone = self.create_zone(f"zone-{count}.example.com")
+            zone.save()
+            Record.objects.bulk_create(
+                [
+                    Record(
+                        zone=zone,
+                        name=f"name{index}",
+                        type=RecordTypeChoices.TXT,
+                        value="test",
+                    )
+                    for index in range(count)
+                ]
+            )
+            zones[count] = zone
+
+        def save(count):
+            zone = zones[count]
+            zone.description = "test"
+            zone.save()
+
+        self.assertConstantQueries(save, zones)
+
+    def test_set_nameservers_constant(self):
+        zones = {}
+        for count in (1, 3, 5):
+            zone = self.create_zone(f"zone-{count}.example.com")
+            zone.save()
+            zones[count] = zone
+
+        self.assertConstantQueries(
+            lambda count: zones[count].set_nameservers(self.nameservers[:count]),
+            zones,
+        )
+
+    def test_api_list(self):
+        self.assertListBudget(
+            20, reverse("plugins-api:netbox_dns-api:zone-list"), **self.header
+        )
+
+    def test_api_detail(self):
+        self.assertGetBudget(
+            20,
+            reverse(
+                "plugins-api:netbox_dns-api:zone-detail", kwargs={"pk": self.zone.pk}
+            ),
+            **self.header,
+        )
+
+    def test_view_list(self):
+        self.client.force_login(self.user)
+
+        self.assertListBudget(
+            40, reverse("plugins:netbox_dns:zone_list"), page_parameter="per_page"
+        )
+
+    def test_view_detail(self):
+        self.client.force_login(self.user)
+
+        self.assertGetBudget(
+            40, reverse("plugins:netbox_dns:zone", kwargs={"pk": self.zone.pk})
+        )
@@ -0,0 +1,134 @@
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from netbox_dns.cache import get_record_count, get_record_table_key
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+from netbox_dns.tests.custom import APITestCase
+
+
+class RecordCacheTest(APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zone = Zone.objects.create(
+            name="zone1.example.com", **cls.zone_data, soa_mname=nameserver
+        )
+        for index in range(10):
+            Record.objects.create(
+                zone=cls.zone,
+                name=f"name{index}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.0.{index}",
+            )
+
+    def setUp(self):
+        super().setUp()
+
+        self.user.is_superuser = True
+        self.user.save()
+
+    def get_zone(self):
+        return Zone.objects.get(pk=self.zone.pk)
+
+    def get_table(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_HX_REQUEST="true")
+
+        self.assertEqual(200, response.status_code)
+        return response.content.decode(), len(context.captured_queries)
+
+    def test_record_count(self):
+        zone = self.get_zone()
+        self.assertEqual(10, get_record_count(zone))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(10, get_record_count(zone))
+
+        Record.objects.create(
+            zone=zone,
+            name="name10",
+            type=RecordTypeChoices.A,
+            value="10.0.0.10",
+        )
+
+        self.assertEqual(11, get_record_count(self.get_zone()))
+
+    def test_record_count_disabled(self):
+        zone = self.get_zone()
+
+        with self.settings(
+            PLUGINS_CONFIG={
+                "netbox_dns": {
+                    **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+                    "zone_cache_timeout": 0,
+                }
+            }
+        ):
+            get_record_count(zone)
+            with self.assertNumQueries(1):
+                self.assertEqual(10, get_record_count(zone))
+
+    def test_record_table(self):
+        url = reverse("plugins:netbox_dns:zone_records", kwargs={"pk": self.zone.pk})
+
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        self.assertIn("name9", response.content.decode())
+
+        content, _ = self.get_table(url)
+        self.assertIn("name9", content)
+
+        cached_content, queries = self.get_table(url)
+        self.assertEqual(content, cached_content)
+        self.assertLess(queries, 10)
+
+        Record.objects.filter(name="name9").update(name="renamed9")
+        cached_content, _ = self.get_table(url)
+        self.assertIn("name9", cached_content)
+
+        Record.objects.create(
+            zone=self.zone,
+            name="name10",
+            type=RecordTypeChoices.A,
+            value="10.0.0.10",
+        )
+        content, _ = self.get_table(url)
+        self.assertIn("renamed9", content)
+        self.assertIn("name10", content)
+
+        content, _ = self.get_table(f"{url}?sort=-name")
+        self.assertIn("renamed9", content)
+
+    def test_record_table_key(self):
+        request = self.client.get(
+            reverse("plugins:netbox_dns:zone_records", kwargs={"pk": self.zone.pk})
+        ).wsgi_request
+        request.user = self.user
+        zone = self.get_zone()
+        key = get_record_table_key(request, zone, "RecordTable")
+
+        self.assertEqual(key, get_record_table_key(request, zone, "RecordTable"))
+        self.assertNotEqual(
+            key, get_record_table_key(request, zone, "ManagedRecordTable")
+        )
+
+        zone.update_serial()
+        self.assertNotEqual(key, get_record_table_key(request, zone, "RecordTable"))
+        key = get_record_table_key(request, zone, "RecordTable")
+
+        self.user.is_superuser = False
+        self.assertNotEqual(key, get_record_table_key(request, zone, "RecordTable"))
@@ -0,0 +1,263 @@
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+
+from users.models import ObjectPermission
+
+from netbox_dns.models import (
+    NameServer,
+    Record,
+    RecordStatusChoices,
+    RecordTypeChoices,
+    View,
+    Zone,
+)
+from netbox_dns.resolver import Resolver, index_cache
+from netbox_dns.tests.custom import APITestCase
+
+
+class ResolverTest(APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.view = View.objects.create(name="internal")
+        cls.zone = Zone.objects.create(
+            name="zone1.example.com", **cls.zone_data, soa_mname=nameserver
+        )
+        cls.view_zone = Zone.objects.create(
+            name="zone1.example.com",
+            view=cls.view,
+            **cls.zone_data,
+            soa_mname=nameserver,
+        )
+
+        records = (
+            ("name1", RecordTypeChoices.A, "10.0.1.1"),
+            ("www", RecordTypeChoices.CNAME, "name1"),
+            ("*.wildcard", RecordTypeChoices.A, "10.0.1.2"),
+            ("a.b", RecordTypeChoices.A, "10.0.1.3"),
+            ("sub", RecordTypeChoices.NS, "ns1.sub"),
+            ("ns1.sub", RecordTypeChoices.A, "10.0.1.4"),
+            ("external", RecordTypeChoices.CNAME, "www.example.org."),
+        )
+        for name, record_type, value in records:
+            Record.objects.create(
+                zone=cls.zone, name=name, type=record_type, value=value
+            )
+
+        Record.objects.create(
+            zone=cls.view_zone, name="name1", type=RecordTypeChoices.A, value="10.1.1.1"
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        index_cache.clear()
+
+    def resolve(self, name, rdtype="A", view=None):
+        return Resolver(view=view).resolve(name, rdtype).to_dict()
+
+    def test_resolve(self):
+        result = self.resolve("name1.zone1.example.com")
+
+        self.assertEqual("NOERROR", result["rcode"])
+        self.assertEqual("zone1.example.com", result["zone"])
+        self.assertEqual(
+            [
+                {
+                    "name": "name1.zone1.example.com.",
+                    "ttl": 86400,
+                    "type": "A",
+                    "value": "10.0.1.1",
+                }
+            ],
+            result["answer"],
+        )
+
+    def test_resolve_view(self):
+        result = self.resolve("name1.zone1.example.com", view=self.view)
+
+        self.assertEqual(["10.1.1.1"], [rr["value"] for rr in result["answer"]])
+
+    def test_resolve_cname(self):
+        result = self.resolve("www.zone1.example.com")
+
+        self.assertEqual(
+            [("CNAME", "name1.zone1.example.com."), ("A", "10.0.1.1")],
+            [(rr["type"], rr["value"]) for rr in result["answer"]],
+        )
+
+        result = self.resolve("external.zone1.example.com")
+
+        self.assertEqual("NOERROR", result["rcode"])
+        self.assertEqual(
+            [("CNAME", "www.example.org.")],
+            [(rr["type"], rr["value"]) for rr in result["answer"]],
+        )
+
+    def test_resolve_nodata(self):
+        result = self.resolve("name1.zone1.example.com", "MX")
+
+        self.assertEqual("NOERROR", result["rcode"])
+        self.assertEqual([], result["answer"])
+        self.assertEqual(["SOA"], [rr["type"] for rr in result["authority"]])
+
+        result = self.resolve("b.zone1.example.com")
+
+        self.assertEqual("NOERROR", result["rcode"])
+        self.assertEqual([], result["answer"])
+
+    def test_resolve_nxdomain(self):
+        result = self.resolve("name2.zone1.example.com")
+
+        self.assertEqual("NXDOMAIN", result["rcode"])
+        self.assertEqual(["SOA"], [rr["type"] for rr in result["authority"]])
+
+    def test_resolve_wildcard(self):
+        result = self.resolve("name.wildcard.zone1.example.com")
+
+        self.assertEqual(
+            [("name.wildcard.zone1.example.com.", "10.0.1.2")],
+            [(rr["name"], rr["value"]) for rr in result["answer"]],
+        )
+
+    def test_resolve_delegation(self):
+        result = self.resolve("name.sub.zone1.example.com")
+
+        self.assertEqual("NOERROR", result["rcode"])
+        self.assertEqual([], result["answer"])
+        self.assertEqual(
+            [("NS", "ns1.sub.zone1.example.com.")],
+            [(rr["type"], rr["value"]) for rr in result["authority"]],
+        )
+        self.assertEqual(["10.0.1.4"], [rr["value"] for rr in result["additional"]])
+
+    def test_resolve_not_authoritative(self):
+        result = self.resolve("www.example.org")
+
+        self.assertEqual("REFUSED", result["rcode"])
+        self.assertIsNone(result["zone"])
+
+    def test_resolve_inactive(self):
+        Record.objects.filter(zone=self.zone, name="name1").update(
+            status=RecordStatusChoices.STATUS_INACTIVE
+        )
+        self.zone.update_serial()
+
+        result = self.resolve("name1.zone1.example.com")
+
+        self.assertEqual("NXDOMAIN", result["rcode"])
+
+    def test_index_cache(self):
+        self.resolve("name1.zone1.example.com")
+
+        with self.assertNumQueries(1):
+            self.resolve("name1.zone1.example.com")
+
+        record = Record.objects.get(zone=self.zone, name="name1")
+        record.value = "10.0.1.42"
+        record.save()
+
+        result = self.resolve("name1.zone1.example.com")
+
+        self.assertEqual(["10.0.1.42"], [rr["value"] for rr in result["answer"]])
+
+    def test_resolve_many(self):
+        resolutions = Resolver().resolve_many(
+            [(f"name{index}.zone1.example.com", "A") for index in range(1000)]
+        )
+
+        self.assertEqual(1000, len(resolutions))
+        self.assertEqual(
+            ["NXDOMAIN", "NOERROR"],
+            [resolution.to_dict()["rcode"] for resolution in resolutions[:2]],
+        )
+        self.assertEqual(
+            {"NXDOMAIN"},
+            {resolution.to_dict()["rcode"] for resolution in resolutions[2:]},
+        )
+
+    def test_resolve_api(self):
+        self.add_permissions("netbox_dns.view_zone", "netbox_dns.view_record")
+        url = reverse("plugins-api:netbox_dns-api:zone-resolve")
+
+        response = self.client.post(
+            url,
+            {
+                "view": self.view.pk,
+                "queries": [
+                    {"name": "name1.zone1.example.com"},
+                    {"name": "name1.zone1.example.com", "type": "AAAA"},
+                ],
+            },
+            format="json",
+            **self.header,
+        )
+
+        self.assertEqual(200, response.status_code)
+        results = response.json()["results"]
+        self.assertEqual(["A", "AAAA"], [result["type"] for result in results])
+        self.assertEqual(["10.1.1.1"], [rr["value"] for rr in results[0]["answer"]])
+        self.assertEqual([], results[1]["answer"])
+
+    def test_resolve_api_restricted(self):
+        self.add_permissions("netbox_dns.view_zone")
+        permission = ObjectPermission.objects.create(
+            name="View www records",
+            actions=["view"],
+            constraints={"name": "www"},
+        )
+        permission.object_types.add(ContentType.objects.get_for_model(Record))
+        permission.users.add(self.user)
+        url = reverse("plugins-api:netbox_dns-api:zone-resolve")
+
+        response = self.client.post(
+            url,
+            {"queries": [{"name": "www.zone1.example.com"}]},
+            format="json",
+            **self.header,
+        )
+
+        self.assertEqual(200, response.status_code)
+        result = response.json()["results"][0]
+        self.assertEqual(["CNAME"], [rr["type"] for rr in result["answer"]])
+        self.assertEqual([], result["authority"])
+
+        result = self.resolve("www.zone1.example.com")
+        self.assertEqual(["CNAME", "A"], [rr["type"] for rr in result["answer"]])
+
+    def test_resolve_api_invalid(self):
+        self.add_permissions("netbox_dns.view_zone", "netbox_dns.view_record")
+        url = reverse("plugins-api:netbox_dns-api:zone-resolve")
+
+        response = self.client.post(
+            url,
+            {"queries": [{"name": "name1.zone1.example.com", "type": "NOTATYPE"}]},
+            format="json",
+            **self.header,
+        )
+
+        self.assertEqual(400, response.status_code)
+
+    def test_resolve_api_permission(self):
+        url = reverse("plugins-api:netbox_dns-api:zone-resolve")
+
+        response = self.client.post(
+            url,
+            {"queries": [{"name": "name1.zone1.example.com"}]},
+            format="json",
+            **self.header,
+        )
+
+        self.assertEqual(403, response.status_code)
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from netaddr import IPNetwork
+
+from netbox_dns.importer import create_reverse_zones
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+from netbox_dns.utilities import arpa_to_prefix, prefix_to_arpa_names
+
+
+class ReverseZonesTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zones = (
+            Zone(name="zone1.example.com", **cls.zone_data, soa_mname=cls.nameserver),
+            Zone(name="5.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver),
+        )
+        for zone in cls.zones:
+            zone.save()
+
+        for address in ("10.0.1.1", "10.0.5.1", "10.0.255.1", "10.1.0.1"):
+            Record.objects.create(
+                zone=cls.zones[0],
+                name=f"name-{address.replace('.', '-')}",
+                type=RecordTypeChoices.A,
+                value=address,
+            )
+
+    def create_reverse_zones(self, *args, **kwargs):
+        with self.settings(
+            PLUGINS_CONFIG={
+                "netbox_dns": {
+                    **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+                    "zone_soa_mname": "ns1.example.com",
+                    "zone_soa_rname": "hostmaster.example.com",
+                    "zone_nameservers": ["ns1.example.com"],
+                }
+            }
+        ):
+            return create_reverse_zones(*args, **kwargs)
+
+    def test_arpa_to_prefix(self):
+        for name, prefix in (
+            ("0.0.10.in-addr.arpa", "10.0.0.0/24"),
+            ("1.0.0.10.in-addr.arpa.", "10.0.0.1/32"),
+            ("10.in-addr.arpa", "10.0.0.0/8"),
+            ("8.b.d.0.1.0.0.2.ip6.arpa", "2001:db8::/32"),
+        ):
+            self.assertEqual(IPNetwork(prefix), arpa_to_prefix(name))
+
+        for name in (
+            "in-addr.arpa",
+            "256.in-addr.arpa",
+            "0-25.0.0.10.in-addr.arpa",
+            "1.2.3.4.5.in-addr.arpa",
+            "db8.ip6.arpa",
+            "zone1.example.com",
+        ):
+            self.assertIsNone(arpa_to_prefix(name))
+
+    def test_prefix_to_arpa_names(self):
+        self.assertEqual(
+            ["0.0.10.in-addr.arpa", "1.0.10.in-addr.arpa"],
+            prefix_to_arpa_names(IPNetwork("10.0.0.0/23")),
+        )
+        self.assertEqual(
+            ["8.b.d.0.1.0.0.2.ip6.arpa"],
+            prefix_to_arpa_names(IPNetwork("2001:db8::/32")),
+        )
+
+        names = prefix_to_arpa_names(IPNetwork("10.0.0.0/16"), 24)
+        self.assertEqual(256, len(names))
+        for name in names:
+            self.assertIn(arpa_to_prefix(name), IPNetwork("10.0.0.0/16"))
+
+    def test_create_reverse_zones(self):
+        zones = self.create_reverse_zones(IPNetwork("10.0.0.0/16"), prefixlen=24)
+
+        self.assertEqual(255, len(zones))
+        self.assertEqual(256, Zone.objects.filter(name__endswith=".arpa").count())
+
+        zone = Zone.objects.get(name="1.0.10.in-addr.arpa")
+        self.assertEqual(IPNetwork("10.0.1.0/24"), zone.arpa_network)
+        self.assertEqual([self.nameserver], list(zone.nameservers.all()))
+
+        for address, zone_name in (
+            ("10.0.1.1", "1.0.10.in-addr.arpa"),
+            ("10.0.5.1", "5.0.10.in-addr.arpa"),
+            ("10.0.255.1", "255.0.10.in-addr.arpa"),
+        ):
+            record = Record.objects.get(type=RecordTypeChoices.A, value=address)
+            self.assertEqual(zone_name, record.ptr_record.zone.name)
+
+        record = Record.objects.get(type=RecordTypeChoices.A, value="10.1.0.1")
+        self.assertIsNone(record.ptr_record)
+
+        self.assertEqual([], self.create_reverse_zones(IPNetwork("10.0.0.0/16"), 24))
+
+    def test_create_reverse_zones_limit(self):
+        with self.assertRaises(ValidationError):
+            self.create_reverse_zones(IPNetwork("2001:db8::/32"), prefixlen=64)
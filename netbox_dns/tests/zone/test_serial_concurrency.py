@@ -0,0 +1,152 @@
+import logging
+
+from threading import Thread, Barrier
+from time import monotonic
+
+from dns import rdata
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+
+
+logger = logging.getLogger("netbox_dns")
+
+
+class SerialConcurrencyTest(TransactionTestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+        "soa_serial_auto": True,
+    }
+
+    threads = 8
+    updates_per_thread = 25
+
+    def setUp(self):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+        self.zone = Zone.objects.create(
+            name="zone1.example.com", **self.zone_data, soa_mname=nameserver
+        )
+
+    def test_concurrent_serial_updates_monotonic(self):
+        barrier = Barrier(self.threads)
+        serials = [[] for _ in range(self.threads)]
+        errors = []
+
+        def update_serials(index):
+            try:
+                zone = Zone.objects.get(pk=self.zone.pk)
+                barrier.wait()
+                for _ in range(self.updates_per_thread):
+                    zone.update_serial()
+                    serials[index].append(zone.soa_serial)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        workers = [
+            Thread(target=update_serials, args=(index,))
+            for index in range(self.threads)
+        ]
+
+        start = monotonic()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = monotonic() - start
+
+        self.assertEqual([], errors)
+
+        updates = self.threads * self.updates_per_thread
+        logger.info(
+            f"{updates} concurrent serial updates in {elapsed:.3f}s "
+            f"({updates / elapsed:.0f} updates/s)"
+        )
+
+        all_serials = [
+            serial for thread_serials in serials for serial in thread_serials
+        ]
+        self.assertEqual(updates, len(set(all_serials)))
+
+        for thread_serials in serials:
+            self.assertEqual(sorted(thread_serials), thread_serials)
+
+        self.zone.refresh_from_db()
+        self.assertEqual(max(all_serials), self.zone.soa_serial)
+
+        soa_record = Record.objects.get(zone=self.zone, type=RecordTypeChoices.SOA)
+        soa_rdata = rdata.from_text("IN", "SOA", soa_record.value)
+        self.assertEqual(self.zone.soa_serial, soa_rdata.serial)
+
+    def test_concurrent_zone_and_record_saves(self):
+        barrier = Barrier(2)
+        serials = [[], []]
+        errors = []
+
+        def save_zone():
+            try:
+                zone = Zone.objects.get(pk=self.zone.pk)
+                barrier.wait()
+                for index in range(self.updates_per_thread):
+                    zone.description = f"Description {index}"
+                    zone.save()
+                    serials[0].append(zone.soa_serial)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        def save_records():
+            try:
+                zone = Zone.objects.get(pk=self.zone.pk)
+                barrier.wait()
+                for index in range(self.updates_per_thread):
+                    record = Record.objects.create(
+                        zone=zone,
+                        name=f"name{index}",
+                        type=RecordTypeChoices.A,
+                        value=f"10.0.0.{index + 1}",
+                    )
+                    record.ttl = 300
+                    record.save()
+                    zone.refresh_from_db()
+                    serials[1].append(zone.soa_serial)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        workers = [Thread(target=save_zone), Thread(target=save_records)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual([], errors)
+
+        for thread_serials in serials:
+            self.assertEqual(sorted(thread_serials), thread_serials)
+
+        self.zone.refresh_from_db()
+        self.assertEqual(
+            max(serial for thread_serials in serials for serial in thread_serials),
+            self.zone.soa_serial,
+        )
+        self.assertEqual(
+            self.updates_per_thread,
+            Record.objects.filter(zone=self.zone, type=RecordTypeChoices.A).count(),
+        )
+
+        soa_record = Record.objects.get(zone=self.zone, type=RecordTypeChoices.SOA)
+        soa_rdata = rdata.from_text("IN", "SOA", soa_record.value)
+        self.assertEqual(self.zone.soa_serial, soa_rdata.serial)
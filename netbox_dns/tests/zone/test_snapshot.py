@@ -0,0 +1,201 @@
+from django.urls import reverse
+
+from users.models import Token
+
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+from netbox_dns.snapshot import (
+    create_snapshot,
+    decode_snapshot,
+    diff_zone,
+    encode_snapshot,
+    get_zone_records,
+)
+from netbox_dns.tests.custom import APITestCase
+
+
+class ZoneSnapshotTest(APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+        "soa_serial_auto": False,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zone = Zone.objects.create(
+            name="zone1.example.com", **cls.zone_data, soa_mname=nameserver
+        )
+
+        for index in range(1, 4):
+            Record.objects.create(
+                zone=cls.zone,
+                name=f"name{index}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.1.{index}",
+            )
+        Record.objects.create(
+            zone=cls.zone,
+            name="www",
+            type=RecordTypeChoices.CNAME,
+            value="name1",
+            ttl=600,
+            description="Web server",
+        )
+
+    def set_serial(self, serial):
+        self.zone.soa_serial = serial
+        self.zone.save()
+
+    def test_encode_decode(self):
+        records = get_zone_records(self.zone)
+
+        serial, decoded = decode_snapshot(encode_snapshot(42, records))
+
+        self.assertEqual(42, serial)
+        self.assertEqual(records, decoded)
+
+    def test_create_snapshot(self):
+        snapshot = create_snapshot(self.zone)
+
+        self.assertEqual(1, snapshot.serial)
+        self.assertEqual(
+            Record.objects.filter(zone=self.zone).count(), snapshot.record_count
+        )
+
+        Record.objects.filter(zone=self.zone, name="name3").delete()
+        snapshot = create_snapshot(self.zone)
+
+        self.assertEqual(1, self.zone.snapshots.count())
+        self.assertEqual(
+            Record.objects.filter(zone=self.zone).count(), snapshot.record_count
+        )
+
+    def test_diff_unchanged(self):
+        create_snapshot(self.zone)
+
+        self.assertFalse(diff_zone(self.zone, 1))
+
+    def test_diff_zone(self):
+        create_snapshot(self.zone)
+
+        Record.objects.create(
+            zone=self.zone,
+            name="name4",
+            type=RecordTypeChoices.A,
+            value="10.0.1.4",
+        )
+        Record.objects.get(zone=self.zone, name="name2").delete()
+        record = Record.objects.get(zone=self.zone, name="www")
+        record.value = "name3"
+        record.save()
+        self.set_serial(2)
+
+        diff = diff_zone(self.zone, 1)
+
+        self.assertEqual(["name4"], [record.name for record in diff.created])
+        self.assertEqual(["name2"], [record.name for record in diff.deleted])
+        self.assertEqual(
+            [("@", "SOA"), ("www", "CNAME")],
+            [(new.name, new.type) for _, new in diff.updated],
+        )
+        self.assertEqual("name3", diff.updated[1][1].value)
+
+    def test_diff_snapshots(self):
+        create_snapshot(self.zone)
+
+        Record.objects.get(zone=self.zone, name="name1").delete()
+        self.set_serial(2)
+        create_snapshot(self.zone)
+
+        Record.objects.get(zone=self.zone, name="name3").delete()
+
+        diff = diff_zone(self.zone, 1, 2)
+
+        self.assertEqual([], diff.created)
+        self.assertEqual(["name1"], [record.name for record in diff.deleted])
+        self.assertEqual(1, len(diff.updated))
+
+    def test_snapshot_api(self):
+        self.add_permissions(
+            "netbox_dns.view_zone",
+            "netbox_dns.change_zone",
+            "netbox_dns.add_zonesnapshot",
+        )
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-snapshots", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.post(url, **self.header)
+
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(1, response.data["serial"])
+
+        response = self.client.get(url, **self.header)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([1], [snapshot["serial"] for snapshot in response.data])
+
+    def test_snapshot_api_permission(self):
+        self.add_permissions("netbox_dns.view_zone")
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-snapshots", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.post(url, **self.header)
+
+        self.assertEqual(403, response.status_code)
+
+        self.add_permissions("netbox_dns.change_zone")
+        response = self.client.post(url, **self.header)
+
+        self.assertEqual(403, response.status_code)
+        self.assertFalse(self.zone.snapshots.exists())
+
+    def test_snapshot_api_read_only_token(self):
+        self.add_permissions(
+            "netbox_dns.view_zone",
+            "netbox_dns.change_zone",
+            "netbox_dns.add_zonesnapshot",
+        )
+        token = Token.objects.create(user=self.user, write_enabled=False)
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-snapshots", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.post(url, HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        self.assertEqual(403, response.status_code)
+        self.assertFalse(self.zone.snapshots.exists())
+
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        self.assertEqual(200, response.status_code)
+
+    def test_diff_api(self):
+        self.add_permissions("netbox_dns.view_zone")
+        create_snapshot(self.zone)
+        Record.objects.get(zone=self.zone, name="name1").delete()
+
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-diff", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.get(f"{url}?old_serial=1", **self.header)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([], response.data["created"])
+        self.assertEqual(
+            ["name1"], [record["name"] for record in response.data["deleted"]]
+        )
+
+        response = self.client.get(f"{url}?old_serial=2", **self.header)
+
+        self.assertEqual(404, response.status_code)
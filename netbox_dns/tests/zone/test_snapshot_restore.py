@@ -0,0 +1,245 @@
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+
+from extras.models import JournalEntry
+from users.models import Token
+
+from netbox_dns.models import (
+    NameServer,
+    Record,
+    RecordStatusChoices,
+    RecordTypeChoices,
+    Zone,
+    ZoneSnapshot,
+)
+from netbox_dns.snapshot import (
+    SnapshotRestorer,
+    create_snapshot,
+    get_zone_records,
+    restore_snapshot,
+)
+from netbox_dns.tests.custom import APITestCase
+
+
+class ZoneSnapshotRestoreTest(APITestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+        "soa_serial_auto": False,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nameserver = NameServer.objects.create(name="ns1.example.com")
+
+        cls.zone = Zone.objects.create(
+            name="zone1.example.com", **cls.zone_data, soa_mname=nameserver
+        )
+        cls.zone.nameservers.add(nameserver)
+        cls.reverse_zone = Zone.objects.create(
+            name="1.0.10.in-addr.arpa", **cls.zone_data, soa_mname=nameserver
+        )
+
+        for index in range(1, 4):
+            Record.objects.create(
+                zone=cls.zone,
+                name=f"name{index}",
+                type=RecordTypeChoices.A,
+                value=f"10.0.1.{index}",
+            )
+        Record.objects.create(
+            zone=cls.zone,
+            name="www",
+            type=RecordTypeChoices.CNAME,
+            value="name1",
+        )
+
+    def unmanaged_records(self):
+        return [record for record in get_zone_records(self.zone) if not record.managed]
+
+    def ptr_names(self):
+        return sorted(
+            Record.objects.filter(
+                zone=self.reverse_zone, type=RecordTypeChoices.PTR
+            ).values_list("name", flat=True)
+        )
+
+    def change_records(self):
+        Record.objects.create(
+            zone=self.zone,
+            name="name4",
+            type=RecordTypeChoices.A,
+            value="10.0.1.4",
+        )
+        Record.objects.get(zone=self.zone, name="name2").delete()
+
+        record = Record.objects.get(zone=self.zone, name="name3")
+        record.ttl = 300
+        record.status = RecordStatusChoices.STATUS_INACTIVE
+        record.save()
+
+        record = Record.objects.get(zone=self.zone, name="www")
+        record.value = "name3"
+        record.save()
+
+    def test_restore(self):
+        create_snapshot(self.zone)
+        records = self.unmanaged_records()
+
+        self.change_records()
+        self.assertEqual(["1", "4"], self.ptr_names())
+
+        restorer = SnapshotRestorer(self.zone)
+        restorer.restore(1)
+
+        self.assertEqual(1, restorer.created)
+        self.assertEqual(2, restorer.updated)
+        self.assertEqual(1, restorer.deleted)
+        self.assertEqual(records, self.unmanaged_records())
+        self.assertEqual(["1", "2", "3"], self.ptr_names())
+
+        ptr_record = Record.objects.get(zone=self.zone, name="name2").ptr_record
+        self.assertEqual("name2.zone1.example.com.", ptr_record.value)
+
+        journal_entry = JournalEntry.objects.get(
+            assigned_object_type=ContentType.objects.get_for_model(Zone),
+            assigned_object_id=self.zone.pk,
+        )
+        self.assertIn("snapshot at serial 1", journal_entry.comments)
+        self.assertIn("1 created, 2 updated, 1 deleted", journal_entry.comments)
+
+    def test_restore_keeps_managed_records(self):
+        create_snapshot(self.zone)
+        self.change_records()
+
+        ns_records = list(
+            Record.objects.filter(zone=self.zone, type=RecordTypeChoices.NS)
+        )
+
+        restore_snapshot(self.zone, 1)
+
+        self.assertEqual(
+            ns_records,
+            list(Record.objects.filter(zone=self.zone, type=RecordTypeChoices.NS)),
+        )
+        self.assertEqual(
+            1,
+            Record.objects.filter(zone=self.zone, type=RecordTypeChoices.SOA).count(),
+        )
+
+    def test_restore_unchanged(self):
+        create_snapshot(self.zone)
+
+        diff = restore_snapshot(self.zone, 1)
+
+        self.assertFalse(diff)
+        self.zone.refresh_from_db()
+        self.assertEqual(1, self.zone.soa_serial)
+
+    def test_restore_serial(self):
+        self.zone.soa_serial_auto = True
+        self.zone.save()
+        self.zone.refresh_from_db()
+        create_snapshot(self.zone)
+        serial = self.zone.soa_serial
+
+        self.change_records()
+        self.zone.refresh_from_db()
+        changed_serial = self.zone.soa_serial
+
+        restore_snapshot(self.zone, serial)
+
+        self.zone.refresh_from_db()
+        self.assertGreater(self.zone.soa_serial, changed_serial)
+        soa_record = Record.objects.get(zone=self.zone, type=RecordTypeChoices.SOA)
+        self.assertEqual(self.zone.soa_serial, int(soa_record.value.split()[2]))
+
+    def test_restore_unknown_serial(self):
+        with self.assertRaises(ZoneSnapshot.DoesNotExist):
+            restore_snapshot(self.zone, 2)
+
+    def test_restore_api(self):
+        self.add_permissions(
+            "netbox_dns.change_zone",
+            "netbox_dns.add_record",
+            "netbox_dns.change_record",
+            "netbox_dns.delete_record",
+        )
+        create_snapshot(self.zone)
+        self.change_records()
+
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-restore", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.post(url, {"serial": 1}, format="json", **self.header)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {"created": 1, "updated": 2, "deleted": 1},
+            {key: response.data[key] for key in ("created", "updated", "deleted")},
+        )
+
+        response = self.client.post(url, {"serial": 2}, format="json", **self.header)
+
+        self.assertEqual(404, response.status_code)
+
+    def test_restore_api_permission(self):
+        self.add_permissions("netbox_dns.change_zone", "netbox_dns.add_record")
+        create_snapshot(self.zone)
+        self.change_records()
+
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-restore", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.post(url, {"serial": 1}, format="json", **self.header)
+
+        self.assertEqual(403, response.status_code)
+        self.assertTrue(Record.objects.filter(zone=self.zone, name="name4").exists())
+
+    def test_restore_api_read_only_token(self):
+        self.add_permissions(
+            "netbox_dns.change_zone",
+            "netbox_dns.add_record",
+            "netbox_dns.change_record",
+            "netbox_dns.delete_record",
+        )
+        token = Token.objects.create(user=self.user, write_enabled=False)
+        create_snapshot(self.zone)
+        self.change_records()
+
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-restore", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.post(
+            url, {"serial": 1}, format="json", HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+
+        self.assertEqual(403, response.status_code)
+        self.assertTrue(Record.objects.filter(zone=self.zone, name="name4").exists())
+
+    def test_restore_api_zone_permission(self):
+        self.add_permissions(
+            "netbox_dns.add_record",
+            "netbox_dns.change_record",
+            "netbox_dns.delete_record",
+        )
+        create_snapshot(self.zone)
+        self.change_records()
+
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-restore", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.post(url, {"serial": 1}, format="json", **self.header)
+
+        self.assertEqual(403, response.status_code)
+        self.assertTrue(Record.objects.filter(zone=self.zone, name="name4").exists())
@@ -0,0 +1,98 @@
+from django.urls import reverse
+
+from netbox_dns.models import Record, RecordStatusChoices
+from netbox_dns.tests.custom import APITestCase
+from netbox_dns.zonefile import ZoneFileExporter, ZoneFileImporter
+
+
+ZONEFILE = """
+$ORIGIN zone1.example.com.
+$TTL 3600
+@       86400 IN SOA ns1.example.com. hostmaster.example.com. (
+                     42 172800 7200 2592000 300 )
+        IN NS   ns1.example.com.
+        IN MX   10 mail
+www     IN CNAME name1
+name1   IN A    10.0.1.43
+name1   IN A    10.0.1.42
+mail    600 IN A 10.0.1.44
+"""
+
+
+class ZoneFileExportTest(APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.user.is_superuser = True
+        self.user.save()
+
+        self.zone = ZoneFileImporter().import_zonefile(ZONEFILE)
+
+    def test_export_zone(self):
+        lines = ZoneFileExporter(self.zone).to_text().splitlines()
+
+        self.assertEqual(["$ORIGIN zone1.example.com.", "$TTL 3600"], lines[:2])
+        self.assertTrue(lines[2].startswith("@ 86400 IN SOA ns1.example.com. "))
+        self.assertEqual(
+            [
+                "@ 3600 IN NS ns1.example.com.",
+                "@ 3600 IN MX 10 mail",
+                "mail 600 IN A 10.0.1.44",
+                "name1 3600 IN A 10.0.1.42",
+                "name1 3600 IN A 10.0.1.43",
+                "www 3600 IN CNAME name1",
+            ],
+            lines[3:],
+        )
+
+    def test_export_inactive(self):
+        Record.objects.filter(zone=self.zone, name="www").update(
+            status=RecordStatusChoices.STATUS_INACTIVE
+        )
+
+        self.assertNotIn("CNAME", ZoneFileExporter(self.zone).to_text())
+
+    def test_export_round_trip(self):
+        zonefile = ZoneFileExporter(self.zone).to_text()
+        self.zone.delete()
+
+        zone = ZoneFileImporter().import_zonefile(zonefile)
+
+        self.assertEqual(
+            zonefile.splitlines()[3:],
+            ZoneFileExporter(zone).to_text().splitlines()[3:],
+        )
+
+    def test_export_api(self):
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-zonefile", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.get(url, **self.header)
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn("text/dns", response["Content-Type"])
+        self.assertEqual(
+            ZoneFileExporter(self.zone).to_text(), response.content.decode()
+        )
+
+    def test_export_api_restricted(self):
+        self.user.is_superuser = False
+        self.user.save()
+        self.add_permissions("netbox_dns.view_zone")
+
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-zonefile", kwargs={"pk": self.zone.pk}
+        )
+
+        response = self.client.get(url, **self.header)
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn("10.0.1.42", response.content.decode())
+
+    def test_export_api_unknown_zone(self):
+        url = reverse("plugins-api:netbox_dns-api:zone-zonefile", kwargs={"pk": 0})
+
+        response = self.client.get(url, **self.header)
+
+        self.assertEqual(404, response.status_code)
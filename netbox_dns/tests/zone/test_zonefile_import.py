@@ -0,0 +1,126 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from netbox_dns.models import NameServer, Record, RecordTypeChoices, Zone
+from netbox_dns.zonefile import ZoneFileImporter
+
+
+ZONEFILE = """
+$ORIGIN zone1.example.com.
+$TTL 3600
+@       86400 IN SOA ns1.example.com. hostmaster.example.com. (
+                     42 172800 7200 2592000 300 )
+        IN NS   ns1.example.com.
+        IN NS   ns2.example.com.
+        IN MX   10 mail
+name1   IN A    10.0.1.42
+name1   IN AAAA fe80:dead:beef:1::42
+mail    600 IN A 10.0.1.43
+www     IN CNAME name1
+sub     IN NS   ns1.sub
+ns1.sub IN A    10.0.1.44
+"""
+
+
+class ZoneFileImportTest(TestCase):
+    zone_data = {
+        "default_ttl": 86400,
+        "soa_rname": "hostmaster.example.com",
+        "soa_refresh": 172800,
+        "soa_retry": 7200,
+        "soa_expire": 2592000,
+        "soa_ttl": 86400,
+        "soa_minimum": 3600,
+        "soa_serial": 1,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.nameserver = NameServer.objects.create(name="ns1.example.com")
+        cls.reverse_zone = Zone.objects.create(
+            name="1.0.10.in-addr.arpa", **cls.zone_data, soa_mname=cls.nameserver
+        )
+
+    def test_import_zone(self):
+        zone = ZoneFileImporter().import_zonefile(ZONEFILE)
+
+        self.assertEqual(zone.name, "zone1.example.com")
+        self.assertEqual(zone.default_ttl, 3600)
+        self.assertEqual(zone.soa_ttl, 86400)
+        self.assertEqual(zone.soa_mname, self.nameserver)
+        self.assertEqual(zone.soa_rname, "hostmaster.example.com")
+        self.assertEqual(zone.soa_minimum, 300)
+        self.assertTrue(zone.soa_serial > 42)
+
+    def test_import_zone_nameservers(self):
+        zone = ZoneFileImporter().import_zonefile(ZONEFILE)
+
+        self.assertEqual(
+            ["ns1.example.com", "ns2.example.com"],
+            sorted(ns.name for ns in zone.nameservers.all()),
+        )
+        ns_records = Record.objects.filter(
+            zone=zone, type=RecordTypeChoices.NS, managed=True
+        )
+        self.assertEqual(2, len(ns_records))
+
+    def test_import_zone_records(self):
+        zone = ZoneFileImporter().import_zonefile(ZONEFILE)
+
+        records = Record.objects.filter(zone=zone, managed=False)
+        self.assertEqual(7, len(records))
+
+        mail = records.get(name="mail", type=RecordTypeChoices.A)
+        self.assertEqual(mail.ttl, 600)
+        self.assertEqual(str(mail.ip_address), "10.0.1.43")
+
+        mx = records.get(name="@", type=RecordTypeChoices.MX)
+        self.assertEqual(mx.value, "10 mail.zone1.example.com.")
+
+        delegation = records.get(name="sub", type=RecordTypeChoices.NS)
+        self.assertEqual(delegation.value, "ns1.sub.zone1.example.com.")
+
+    def test_import_zone_ptr_records(self):
+        zone = ZoneFileImporter().import_zonefile(ZONEFILE)
+
+        record = Record.objects.get(zone=zone, name="name1", type=RecordTypeChoices.A)
+        ptr_record = Record.objects.get(
+            zone=self.reverse_zone, type=RecordTypeChoices.PTR, name="42"
+        )
+
+        self.assertEqual(record.ptr_record, ptr_record)
+        self.assertEqual(ptr_record.value, "name1.zone1.example.com.")
+
+    def test_import_zone_origin_argument(self):
+        zonefile = "\n".join(
+            line for line in ZONEFILE.splitlines() if not line.startswith("$ORIGIN")
+        )
+        zone = ZoneFileImporter(origin="zone1.example.com").import_zonefile(zonefile)
+
+        self.assertEqual(zone.name, "zone1.example.com")
+
+    def test_import_existing_zone_fail(self):
+        ZoneFileImporter().import_zonefile(ZONEFILE)
+
+        with self.assertRaises(ValidationError):
+            ZoneFileImporter().import_zonefile(ZONEFILE)
+
+    def test_import_invalid_record_fail(self):
+        with self.assertRaises(ValidationError):
+            ZoneFileImporter().import_zonefile(ZONEFILE + "bad_name IN A 10.0.1.45\n")
+
+        self.assertFalse(Zone.objects.filter(name="zone1.example.com").exists())
+
+    def test_import_cname_conflict_fail(self):
+        with self.assertRaisesRegex(ValidationError, "CNAME record for name www"):
+            ZoneFileImporter().import_zonefile(ZONEFILE + "www IN A 10.0.1.45\n")
+
+        self.assertFalse(Zone.objects.filter(name="zone1.example.com").exists())
+
+    def test_import_cname_conflict_across_batches_fail(self):
+        with self.assertRaisesRegex(ValidationError, "CNAME is not allowed"):
+            ZoneFileImporter(batch_size=1).import_zonefile(
+                ZONEFILE + "mail IN CNAME name1\n"
+            )
+
+        self.assertFalse(Zone.objects.filter(name="zone1.example.com").exists())
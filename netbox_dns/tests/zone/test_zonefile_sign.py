@@ -0,0 +1,205 @@
+import os
+import tempfile
+
+import dns.dnssec
+import dns.zone
+from dns import name as dns_name
+from dns import rdatatype
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from netbox_dns.dnssec import ZoneSigner
+from netbox_dns.models import Record, RecordTypeChoices
+from netbox_dns.tests.custom import APITestCase
+from netbox_dns.zonefile import ZoneFileExporter, ZoneFileImporter
+
+
+ZONEFILE = """
+$ORIGIN zone1.example.com.
+$TTL 3600
+@       86400 IN SOA ns1.example.com. hostmaster.example.com. (
+                     42 172800 7200 2592000 300 )
+        IN NS   ns1.example.com.
+        IN MX   10 mail
+www     IN CNAME name1
+name1   IN A    10.0.1.42
+mail    600 IN A 10.0.1.44
+sub     IN NS   ns.sub
+ns.sub  IN A    10.0.2.1
+"""
+
+
+class ZoneFileSignTest(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.key_dir = tempfile.TemporaryDirectory()
+        cls.keys = []
+        for name, ksk in (("ksk", True), ("zsk", False)):
+            private_key = ec.generate_private_key(ec.SECP256R1())
+            key_file = os.path.join(cls.key_dir.name, f"{name}.pem")
+            with open(key_file, "wb") as pem_file:
+                pem_file.write(
+                    private_key.private_bytes(
+                        serialization.Encoding.PEM,
+                        serialization.PrivateFormat.PKCS8,
+                        serialization.NoEncryption(),
+                    )
+                )
+            cls.keys.append(
+                {"key_file": key_file, "algorithm": "ECDSAP256SHA256", "ksk": ksk}
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.key_dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+
+        self.user.is_superuser = True
+        self.user.save()
+
+        cache.clear()
+
+        self.zone = ZoneFileImporter().import_zonefile(ZONEFILE)
+        self.origin = dns_name.from_text(self.zone.name)
+
+    def dnssec_settings(self, keys=None):
+        return self.settings(
+            PLUGINS_CONFIG={
+                "netbox_dns": {
+                    **settings.PLUGINS_CONFIG.get("netbox_dns", {}),
+                    "dnssec_keys": {
+                        self.zone.name: keys if keys is not None else self.keys
+                    },
+                }
+            }
+        )
+
+    def sign(self):
+        signer = ZoneSigner(self.zone)
+        zonefile = ZoneFileExporter(self.zone, signer=signer).to_text()
+
+        return signer, dns.zone.from_text(zonefile, relativize=False)
+
+    def test_sign_zone(self):
+        with self.dnssec_settings():
+            _, zone = self.sign()
+
+        dnskey = zone.get_rrset(self.origin, rdatatype.DNSKEY)
+        self.assertEqual(2, len(dnskey))
+
+        keys = {self.origin: dnskey}
+        delegation = dns_name.from_text("sub", origin=self.origin)
+        for name, node in zone.nodes.items():
+            for rdataset in node.rdatasets:
+                if rdataset.rdtype == rdatatype.RRSIG:
+                    continue
+
+                rrsig = node.get_rdataset(
+                    rdataset.rdclass, rdatatype.RRSIG, rdataset.rdtype
+                )
+                if (name == delegation and rdataset.rdtype == rdatatype.NS) or (
+                    name != delegation and name.is_subdomain(delegation)
+                ):
+                    self.assertIsNone(rrsig)
+                    continue
+
+                dns.dnssec.validate_rrsig((name, rdataset), rrsig[0], keys)
+
+    def test_sign_nsec_chain(self):
+        with self.dnssec_settings():
+            _, zone = self.sign()
+
+        nsec = {
+            name.relativize(self.origin).to_text(): rdataset[0]
+            for name, node in zone.nodes.items()
+            for rdataset in node.rdatasets
+            if rdataset.rdtype == rdatatype.NSEC
+        }
+
+        self.assertEqual(
+            {"@": "mail", "mail": "name1", "name1": "sub", "sub": "www", "www": "@"},
+            {
+                name: value.next.relativize(self.origin).to_text()
+                for name, value in nsec.items()
+            },
+        )
+        self.assertEqual(
+            "www.zone1.example.com. NS RRSIG NSEC",
+            nsec["sub"].to_text(),
+        )
+
+    def test_sign_changes(self):
+        with self.dnssec_settings():
+            signer, _ = self.sign()
+            self.assertEqual(0, signer.cached)
+            signed = signer.signed
+
+            signer, _ = self.sign()
+            self.assertEqual(0, signer.signed)
+            self.assertEqual(signed, signer.cached)
+
+            Record.objects.create(
+                zone=self.zone,
+                name="name2",
+                type=RecordTypeChoices.A,
+                value="10.0.1.43",
+            )
+            self.zone.refresh_from_db()
+
+            signer, _ = self.sign()
+
+        # SOA, the new A RRset, its NSEC and the NSEC of the previous name
+        self.assertEqual(4, signer.signed)
+
+    def test_sign_api(self):
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-zonefile", kwargs={"pk": self.zone.pk}
+        )
+
+        with self.dnssec_settings():
+            response = self.client.get(f"{url}?sign=true", **self.header)
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn(" IN RRSIG SOA ", response.content.decode())
+
+        response = self.client.get(url, **self.header)
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn("RRSIG", response.content.decode())
+
+    def test_sign_api_without_keys(self):
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-zonefile", kwargs={"pk": self.zone.pk}
+        )
+
+        with self.dnssec_settings(keys=[]):
+            response = self.client.get(f"{url}?sign=true", **self.header)
+
+        self.assertEqual(400, response.status_code)
+
+    def test_sign_api_invalid_key(self):
+        url = reverse(
+            "plugins-api:netbox_dns-api:zone-zonefile", kwargs={"pk": self.zone.pk}
+        )
+        keys = [
+            {
+                "key_file": os.path.join(self.key_dir.name, "missing.pem"),
+                "algorithm": "ECDSAP256SHA256",
+            }
+        ]
+
+        with self.dnssec_settings(keys=keys):
+            response = self.client.get(f"{url}?sign=true", **self.header)
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn("sign", response.json())
@@ -43,6 +43,8 @@ from netbox_dns.views import (
     ViewBulkEditView,
     ViewBulkDeleteView,
     ViewZoneListView,
+    # metrics
+    MetricsView,
 )
 
 app_name = "netbox_dns"
@@ -156,4 +158,8 @@ urlpatterns = [
         name="view_changelog",
         kwargs={"model": View},
     ),
+    #
+    # Metrics
+    #
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
@@ -1,40 +1,156 @@
 import re
 
+from functools import lru_cache
+from itertools import islice
+
 from dns import name as dns_name
+from dns import rdata, rdataclass
 from dns.exception import DNSException
-from netaddr import IPNetwork, AddrFormatError
+from netaddr import IPAddress, IPNetwork, AddrFormatError, iprange_to_cidrs
+
+
+BATCH_SIZE = 1000
 
 
 class NameFormatError(Exception):
     pass
 
 
+def batched(iterable, batch_size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+ARPA_SUFFIXES = {
+    4: ("in-addr", "arpa"),
+    6: ("ip6", "arpa"),
+}
+ARPA_LABEL_BITS = {4: 8, 6: 4}
+ARPA_ADDRESS_BITS = {4: 32, 6: 128}
+
+
 def arpa_to_prefix(arpa_name):
-    name = arpa_name.rstrip(".")
+    """
+    Return the network for a name below in-addr.arpa or ip6.arpa, or None if
+    the name is not a valid reverse name.
+
+    The labels are accumulated into an integer instead of being joined into
+    an address string that is parsed again.
+    """
+    labels = arpa_name.rstrip(".").lower().split(".")
+    suffix = tuple(labels[-2:])
+
+    for version, arpa_suffix in ARPA_SUFFIXES.items():
+        if suffix == arpa_suffix:
+            break
+    else:
+        return None
 
-    if name.endswith(".in-addr.arpa"):
-        address = ".".join(reversed(name.replace(".in-addr.arpa", "").split(".")))
-        mask = len(address.split(".")) * 8
+    labels = labels[-3::-1]
+    label_bits = ARPA_LABEL_BITS[version]
+    address_bits = ARPA_ADDRESS_BITS[version]
+    prefixlen = len(labels) * label_bits
 
-        try:
-            return IPNetwork(f"{address}/{mask}")
-        except AddrFormatError:
-            return None
+    if not labels or prefixlen > address_bits:
+        return None
 
-    elif name.endswith("ip6.arpa"):
-        address = "".join(reversed(name.replace(".ip6.arpa", "").split(".")))
-        mask = len(address)
-        address = address + "0" * (32 - mask)
+    value = 0
+    for label in labels:
+        if not label.isascii() or not label.isalnum():
+            return None
 
         try:
-            return IPNetwork(
-                f"{':'.join([(address[i:i+4]) for i in range(0, 32, 4)])}/{mask*4}"
-            )
-        except AddrFormatError:
+            label_value = int(label, 10 if version == 4 else 16)
+        except ValueError:
             return None
 
-    else:
-        return None
+        if (version == 6 and len(label) != 1) or label_value >> label_bits:
+            return None
+
+        value = value << label_bits | label_value
+
+    return IPNetwork((value << address_bits - prefixlen, prefixlen), version=version)
+
+
+def get_arpa_prefixlen(prefix, prefixlen=None):
+    """
+    Return the smallest prefix length on an octet (IPv4) or nibble (IPv6)
+    boundary that is at least the prefix length of the prefix and prefixlen
+    """
+    label_bits = ARPA_LABEL_BITS[prefix.version]
+    prefixlen = max(prefix.prefixlen, prefixlen or 0)
+
+    return -(-prefixlen // label_bits) * label_bits
+
+
+def prefix_to_arpa_names(prefix, prefixlen=None):
+    """
+    Return the names of the reverse zones with the prefix length returned by
+    get_arpa_prefixlen() that together cover a prefix
+    """
+    version = prefix.version
+    label_bits = ARPA_LABEL_BITS[version]
+    address_bits = ARPA_ADDRESS_BITS[version]
+    suffix = ".".join(ARPA_SUFFIXES[version])
+
+    prefixlen = get_arpa_prefixlen(prefix, prefixlen)
+    host_bits = address_bits - prefixlen
+    label_count = prefixlen // label_bits
+    label_mask = (1 << label_bits) - 1
+    label_format = "d" if version == 4 else "x"
+
+    first = prefix.first >> host_bits
+    last = prefix.last >> host_bits
+
+    names = []
+    for value in range(first, last + 1):
+        labels = []
+        for _ in range(label_count):
+            labels.append(format(value & label_mask, label_format))
+            value >>= label_bits
+        labels.append(suffix)
+
+        names.append(".".join(labels))
+
+    return names
+
+
+def get_prefix_gaps(prefix, networks):
+    """
+    Return the parts of a prefix that are not covered by any of the networks
+    as list of CIDR networks.
+
+    The networks are converted to integer intervals, clipped to the prefix
+    and sorted, so the gaps are found in a single pass.
+    """
+    first, last = prefix.first, prefix.last
+
+    intervals = sorted(
+        (max(network.first, first), min(network.last, last))
+        for network in networks
+        if network.version == prefix.version
+        and network.first <= last
+        and network.last >= first
+    )
+
+    gaps = []
+    position = first
+    for start, end in intervals:
+        if start > position:
+            gaps.append((position, start - 1))
+        position = max(position, end + 1)
+
+    if position <= last:
+        gaps.append((position, last))
+
+    return [
+        cidr
+        for start, end in gaps
+        for cidr in iprange_to_cidrs(
+            IPAddress(start, prefix.version), IPAddress(end, prefix.version)
+        )
+    ]
 
 
 def name_to_unicode(name):
@@ -63,3 +179,25 @@ def normalize_name(name):
 
     except DNSException as exc:
         raise NameFormatError from exc
+
+
+@lru_cache(maxsize=4096)
+def parse_rdata(rdtype, value):
+    """
+    Parse a record value, caching the result. Rdata objects are immutable,
+    so the same object can be shared between records.
+    """
+    return rdata.from_text(rdataclass.IN, rdtype, value)
+
+
+def canonical_value(rdtype, value, origin):
+    """
+    Return a record value as RDATA in the canonical wire format defined in
+    RFC 4034, section 6.2, with relative names made absolute in the origin
+    and all names in lower case. Values that only differ in formatting or in
+    the case of names have the same canonical value.
+    """
+    if isinstance(origin, str):
+        origin = dns_name.from_text(origin, origin=dns_name.root)
+
+    return parse_rdata(rdtype, value).to_digestable(origin)
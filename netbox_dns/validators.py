@@ -1,6 +1,8 @@
 import re
 
 from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 from extras.plugins import get_plugin_config
 
@@ -8,49 +10,130 @@ LABEL = r"[a-z0-9][a-z0-9-]*(?<!-)"
 UNDERSCORE_LABEL = r"[a-z0-9][a-z0-9-_]*(?<![-_])"
 LEADING_UNDERSCORE_LABEL = r"[a-z0-9_][a-z0-9-]*(?<!-)"
 
+DOUBLE_DASH = r"\b(?!xn)..--"
+NO_DOUBLE_DASH = rf"(?!.*{DOUBLE_DASH})"
 
-def has_invalid_double_dash(name):
-    return bool(re.findall(r"\b(?!xn)..--", name, re.IGNORECASE))
 
+class NameValidator:
+    """
+    Validator for DNS names with the regular expressions compiled once for
+    a configuration. The check for invalid double dashes is part of the
+    expressions, so each name is matched only once.
+    """
 
-LABEL = r"[a-z0-9][a-z0-9-]*(?<!-)"
-UNDERSCORE_LABEL = r"[a-z0-9][a-z0-9-_]*(?<![-_])"
-LEADING_UNDERSCORE_LABEL = r"[a-z0-9_][a-z0-9-]*(?<!-)"
+    def __init__(
+        self,
+        tolerate_underscores_in_hostnames=False,
+        tolerate_leading_underscore_types=(),
+        tolerate_non_rfc1035_types=(),
+    ):
+        label = UNDERSCORE_LABEL if tolerate_underscores_in_hostnames else LABEL
 
+        self.tolerate_leading_underscore_types = set(
+            tolerate_leading_underscore_types or ()
+        )
+        self.tolerate_non_rfc1035_types = set(tolerate_non_rfc1035_types or ())
 
-def has_invalid_double_dash(name):
-    return bool(re.findall(r"\b(?!xn)..--", name, re.IGNORECASE))
+        self.fqdn = self.compile(rf"{label}(\.{label})+\.?")
+        self.domain_name = self.compile(rf"{label}(\.{label})*\.?")
+        self.hostname = self.compile(rf"([*@]|{label}(\.{label})*\.?)")
+        self.leading_underscore_hostname = self.compile(
+            rf"([*@]|{LEADING_UNDERSCORE_LABEL}(\.{LEADING_UNDERSCORE_LABEL})*\.?)"
+        )
 
+    @staticmethod
+    def compile(regex):
+        return re.compile(rf"^{NO_DOUBLE_DASH}{regex}$", flags=re.IGNORECASE)
 
-def validate_fqdn(name):
-    if get_plugin_config("netbox_dns", "tolerate_underscores_in_hostnames"):
-        regex = rf"^{UNDERSCORE_LABEL}(\.{UNDERSCORE_LABEL})+\.?$"
-    else:
-        regex = rf"^{LABEL}(\.{LABEL})+\.?$"
+    def validate_fqdn(self, name):
+        if not self.fqdn.match(name):
+            raise ValidationError("Not a valid fully qualified DNS host name")
 
-    if not re.match(regex, name, flags=re.IGNORECASE) or has_invalid_double_dash(name):
-        raise ValidationError(f"Not a valid fully qualified DNS host name")
+    def validate_domain_name(self, name):
+        if not self.domain_name.match(name):
+            raise ValidationError("Not a valid DNS domain name")
 
+    def validate_extended_hostname(self, name, tolerate_leading_underscores=False):
+        if tolerate_leading_underscores:
+            regex = self.leading_underscore_hostname
+        else:
+            regex = self.hostname
 
-def validate_extended_hostname(name, tolerate_leading_underscores=False):
-    if tolerate_leading_underscores:
-        regex = (
-            rf"^([*@]|{LEADING_UNDERSCORE_LABEL}(\.{LEADING_UNDERSCORE_LABEL})*\.?)$"
+        if not regex.match(name):
+            raise ValidationError("Not a valid DNS host name")
+
+    def validate_record_name(self, name, record_type):
+        if record_type in self.tolerate_non_rfc1035_types:
+            return
+
+        self.validate_extended_hostname(
+            name, record_type in self.tolerate_leading_underscore_types
         )
-    elif get_plugin_config("netbox_dns", "tolerate_underscores_in_hostnames"):
-        regex = rf"^([*@]|{UNDERSCORE_LABEL}(\.{UNDERSCORE_LABEL})*\.?)$"
-    else:
-        regex = rf"^([*@]|{LABEL}(\.{LABEL})*\.?)$"
 
-    if not re.match(regex, name, flags=re.IGNORECASE) or has_invalid_double_dash(name):
-        raise ValidationError(f"Not a valid DNS host name")
+    def validate_many(self, names, validate=None):
+        """
+        Validate a batch of names, by default as domain names. A name can be
+        a tuple of arguments for the validation method, e.g. (name, type) for
+        validate_record_name. Each distinct name is validated only once.
 
+        Returns a dictionary of the ValidationError for the index of each
+        invalid name.
+        """
+        validate = validate or self.validate_domain_name
 
-def validate_domain_name(name):
-    if get_plugin_config("netbox_dns", "tolerate_underscores_in_hostnames"):
-        regex = rf"^{UNDERSCORE_LABEL}(\.{UNDERSCORE_LABEL})*\.?$"
-    else:
-        regex = rf"^{LABEL}(\.{LABEL})*\.?$"
+        results = {}
+        errors = {}
+        for index, name in enumerate(names):
+            if name not in results:
+                arguments = name if isinstance(name, tuple) else (name,)
+                try:
+                    validate(*arguments)
+                    results[name] = None
+                except ValidationError as exc:
+                    results[name] = exc
+
+            if results[name] is not None:
+                errors[index] = results[name]
+
+        return errors
+
+
+_validator = None
+
+
+def get_validator():
+    """Return the name validator for the current plugin configuration"""
+    global _validator
 
-    if not re.match(regex, name, flags=re.IGNORECASE) or has_invalid_double_dash(name):
-        raise ValidationError(f"Not a valid DNS domain name")
+    if _validator is None:
+        _validator = NameValidator(
+            get_plugin_config("netbox_dns", "tolerate_underscores_in_hostnames"),
+            get_plugin_config("netbox_dns", "tolerate_leading_underscore_types"),
+            get_plugin_config("netbox_dns", "tolerate_non_rfc1035_types"),
+        )
+
+    return _validator
+
+
+@receiver(setting_changed)
+def reset_validator(setting, **kwargs):
+    global _validator
+
+    if setting == "PLUGINS_CONFIG":
+        _validator = None
+
+
+def has_invalid_double_dash(name):
+    return bool(re.search(DOUBLE_DASH, name, re.IGNORECASE))
+
+
+def validate_fqdn(name):
+    get_validator().validate_fqdn(name)
+
+
+def validate_extended_hostname(name, tolerate_leading_underscores=False):
+    get_validator().validate_extended_hostname(name, tolerate_leading_underscores)
+
+
+def validate_domain_name(name):
+    get_validator().validate_domain_name(name)
@@ -2,3 +2,4 @@ from .view import *
 from .zone import *
 from .nameserver import *
 from .record import *
+from .metrics import *
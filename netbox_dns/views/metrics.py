@@ -0,0 +1,22 @@
+from django.http import Http404, HttpResponse
+from django.views.generic import View as BaseView
+
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from extras.plugins import get_plugin_config
+
+from netbox_dns.authentication import get_user
+from netbox_dns.metrics import get_metrics
+
+
+class MetricsView(BaseView):
+    def get(self, request):
+        if not get_plugin_config("netbox_dns", "feature_metrics"):
+            raise Http404
+
+        if get_user(request) is None:
+            response = HttpResponse("Authentication required", status=401)
+            response["WWW-Authenticate"] = "Token"
+            return response
+
+        return HttpResponse(get_metrics(), content_type=CONTENT_TYPE_LATEST)
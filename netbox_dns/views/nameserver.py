@@ -16,7 +16,7 @@ from utilities.views import ViewTab, register_model_view
 
 
 class NameServerListView(generic.ObjectListView):
-    queryset = NameServer.objects.all()
+    queryset = NameServer.objects.all().prefetch_related("tags")
     filterset = NameServerFilter
     filterset_form = NameServerFilterForm
     table = NameServerTable
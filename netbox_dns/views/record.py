@@ -9,6 +9,7 @@ from netbox_dns.forms import (
     RecordForm,
     RecordBulkEditForm,
 )
+from netbox_dns.importer import BulkImportViewMixin, RecordImporter
 from netbox_dns.models import Record
 from netbox_dns.tables import RecordTable, ManagedRecordTable
 from netbox_dns.utilities import value_to_unicode
@@ -16,7 +17,7 @@ from netbox_dns.utilities import value_to_unicode
 
 class RecordListView(generic.ObjectListView):
     queryset = Record.objects.filter(managed=False).prefetch_related(
-        "zone", "ptr_record"
+        "zone__view", "ptr_record__zone__view", "tags"
     )
     filterset = RecordFilter
     filterset_form = RecordFilterForm
@@ -25,7 +26,7 @@ class RecordListView(generic.ObjectListView):
 
 class ManagedRecordListView(generic.ObjectListView):
     queryset = Record.objects.filter(managed=True).prefetch_related(
-        "zone", "address_record"
+        "zone__view", "address_record__zone__view"
     )
     filterset = RecordFilter
     filterset_form = RecordFilterForm
@@ -66,13 +67,14 @@ class RecordDeleteView(generic.ObjectDeleteView):
     default_return_url = "plugins:netbox_dns:record_list"
 
 
-class RecordBulkImportView(generic.BulkImportView):
+class RecordBulkImportView(BulkImportViewMixin, generic.BulkImportView):
     queryset = Record.objects.filter(managed=False).prefetch_related(
         "zone", "ptr_record"
     )
     model_form = RecordImportForm
     table = RecordTable
     default_return_url = "plugins:netbox_dns:record_list"
+    importer = RecordImporter
 
 
 class RecordBulkEditView(generic.BulkEditView):
@@ -13,7 +13,7 @@ class ViewView(generic.ObjectView):
 
 
 class ViewListView(generic.ObjectListView):
-    queryset = View.objects.all()
+    queryset = View.objects.all().prefetch_related("tags")
     table = ViewTable
     filterset = ViewFilter
     filterset_form = ViewFilterForm
@@ -1,10 +1,20 @@
 from dns import name as dns_name
 
+from django.http import HttpResponse
 from django.urls import reverse
 
 from netbox.views import generic
+from utilities.htmx import is_htmx
 from utilities.views import ViewTab, register_model_view
 
+from netbox_dns.cache import (
+    get_cache_timeout,
+    get_fragment_cache,
+    get_record_count,
+    get_record_table_fragment_key,
+    get_record_table_key,
+)
+
 from netbox_dns.filters import ZoneFilter, RecordFilter
 from netbox_dns.forms import (
     ZoneImportForm,
@@ -12,6 +22,7 @@ from netbox_dns.forms import (
     ZoneFilterForm,
     ZoneBulkEditForm,
 )
+from netbox_dns.importer import BulkImportViewMixin, ZoneImporter
 from netbox_dns.models import Record, Zone
 from netbox_dns.tables import (
     ZoneTable,
@@ -21,7 +32,7 @@ from netbox_dns.tables import (
 
 
 class ZoneListView(generic.ObjectListView):
-    queryset = Zone.objects.all().prefetch_related("view", "tags")
+    queryset = Zone.objects.all().prefetch_related("view", "tags", "soa_mname")
     filterset = ZoneFilter
     filterset_form = ZoneFilterForm
     table = ZoneTable
@@ -64,13 +75,14 @@ class ZoneDeleteView(generic.ObjectDeleteView):
     default_return_url = "plugins:netbox_dns:zone_list"
 
 
-class ZoneBulkImportView(generic.BulkImportView):
+class ZoneBulkImportView(BulkImportViewMixin, generic.BulkImportView):
     queryset = Zone.objects.all().prefetch_related(
         "view", "tags", "nameservers", "soa_mname"
     )
     model_form = ZoneImportForm
     table = ZoneTable
     default_return_url = "plugins:netbox_dns:zone_list"
+    importer = ZoneImporter
 
 
 class ZoneBulkEditView(generic.BulkEditView):
@@ -88,8 +100,50 @@ class ZoneBulkDeleteView(generic.BulkDeleteView):
     table = ZoneTable
 
 
+class CachedRecordTableMixin:
+    """
+    Cache the rendered record table of a zone until the zone changes. The
+    templates render the table in a {% cache %} block, and HTMX requests for
+    the table alone are answered from the same cache entry without building
+    the table at all.
+    """
+
+    def get_extra_context(self, request, instance):
+        context = super().get_extra_context(request, instance)
+
+        timeout = get_cache_timeout()
+        if timeout:
+            context["table_cache_timeout"] = timeout
+            context["table_cache_key"] = get_record_table_key(
+                request, instance, self.table.__name__
+            )
+
+        return context
+
+    def get(self, request, *args, **kwargs):
+        timeout = get_cache_timeout()
+        if not timeout or not is_htmx(request):
+            return super().get(request, *args, **kwargs)
+
+        instance = self.get_object(**kwargs)
+        fragment_cache = get_fragment_cache()
+        fragment_key = get_record_table_fragment_key(
+            request, instance, self.table.__name__
+        )
+
+        content = fragment_cache.get(fragment_key)
+        if content is not None:
+            return HttpResponse(content)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            fragment_cache.set(fragment_key, response.content.decode(), timeout)
+
+        return response
+
+
 @register_model_view(Zone, "records")
-class ZoneRecordListView(generic.ObjectChildrenView):
+class ZoneRecordListView(CachedRecordTableMixin, generic.ObjectChildrenView):
     queryset = Zone.objects.all()
     child_model = Record
     table = RecordTable
@@ -100,7 +154,7 @@ class ZoneRecordListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label="Records",
         permission="netbox_dns.view_record",
-        badge=lambda obj: obj.record_count(managed=False),
+        badge=lambda obj: get_record_count(obj, managed=False),
         hide_if_empty=True,
     )
 
@@ -111,7 +165,7 @@ class ZoneRecordListView(generic.ObjectChildrenView):
 
 
 @register_model_view(Zone, "managed_records")
-class ZoneManagedRecordListView(generic.ObjectChildrenView):
+class ZoneManagedRecordListView(CachedRecordTableMixin, generic.ObjectChildrenView):
     queryset = Zone.objects.all()
     child_model = Record
     table = ManagedRecordTable
@@ -122,7 +176,7 @@ class ZoneManagedRecordListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label="Managed Records",
         permission="netbox_dns.view_record",
-        badge=lambda obj: obj.record_count(managed=True),
+        badge=lambda obj: get_record_count(obj, managed=True),
         hide_if_empty=True,
     )
 
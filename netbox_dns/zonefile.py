@@ -0,0 +1,318 @@
+import dns
+from dns import name as dns_name
+from dns import rdata, rdataclass, rdatatype, tokenizer, transaction as dns_transaction
+from dns import rrset as dns_rrset
+from dns.zonefile import Reader
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from extras.plugins import get_plugin_config
+
+from netbox_dns.bulk import BATCH_SIZE, check_conflicts, update_ptr_records
+from netbox_dns.models import NameServer, Record, Zone
+from netbox_dns.search import cache_objects
+from netbox_dns.utilities import arpa_to_prefix
+from netbox_dns.validators import get_validator
+
+
+class ZoneFileTransaction(dns_transaction.Transaction):
+    """
+    Write-only dnspython transaction that hands every record to the importer
+    as soon as it has been parsed instead of building the zone in memory
+    """
+
+    def _get_rdataset(self, name, rdtype, covers):
+        return None
+
+    def _get_node(self, name):
+        return None
+
+    def _put_rdataset(self, name, rdataset):
+        self.manager.add_rdataset(name, rdataset)
+
+    def _delete_name(self, name):
+        raise dns.exception.DNSException(
+            f"Cannot delete {name}, records can only be added by a zone file import"
+        )
+
+    def _delete_rdataset(self, name, rdtype, covers):
+        raise dns.exception.DNSException(
+            f"Cannot delete {name} {rdatatype.to_text(rdtype)}, records can only be added by a zone file import"
+        )
+
+    def _name_exists(self, name):
+        return False
+
+    def _changed(self):
+        return True
+
+    def _end_transaction(self, commit):
+        if commit:
+            self.manager.flush()
+
+    def _set_origin(self, origin):
+        self.manager.set_origin(origin)
+
+
+class ZoneFileImporter(dns_transaction.TransactionManager):
+    """
+    Import a zone from a master file, creating the zone from the SOA record,
+    the nameservers from the NS records at the zone apex and all other records
+    in batches with bulk_create
+    """
+
+    def __init__(self, origin=None, view=None, batch_size=BATCH_SIZE):
+        if isinstance(origin, str):
+            origin = dns_name.from_text(origin)
+
+        self.origin = origin
+        self.view = view
+        self.batch_size = batch_size
+
+        self.reader = None
+        self.zone = None
+        self.nameservers = []
+        self.records = []
+        self.record_count = 0
+        self.errors = []
+
+    def writer(self, replacement=False):
+        return ZoneFileTransaction(self, replacement, False)
+
+    def get_class(self):
+        return rdataclass.IN
+
+    def origin_information(self):
+        return (self.origin, True, dns_name.empty)
+
+    def set_origin(self, origin):
+        if self.origin is None:
+            self.origin = origin
+
+    def import_zonefile(self, zonefile):
+        """Parse and import a zone file, given as string or file object"""
+        with transaction.atomic():
+            with self.writer() as txn:
+                self.reader = Reader(
+                    tokenizer.Tokenizer(zonefile),
+                    rdataclass.IN,
+                    txn,
+                    allow_include=False,
+                )
+                try:
+                    self.reader.read()
+                except dns.exception.DNSException as exc:
+                    raise ValidationError(f"Error parsing zone file: {exc}") from None
+
+            if self.zone is None:
+                raise ValidationError("No SOA record found at the zone origin")
+
+            if self.errors:
+                raise ValidationError(self.errors)
+
+            self.zone.set_nameservers(self.nameservers)
+
+            update_ptr_records(self.zone.record_set.all(), batch_size=self.batch_size)
+
+            self.zone.update_serial()
+
+        return self.zone
+
+    def add_rdataset(self, name, rdataset):
+        for rdata in rdataset:
+            if rdataset.rdtype == rdatatype.SOA and name == dns_name.empty:
+                self.create_zone(rdataset.ttl, rdata)
+
+            elif rdataset.rdtype == rdatatype.NS and name == dns_name.empty:
+                self.nameservers.append(self.get_nameserver(rdata.target))
+
+            else:
+                self.records.append(self.create_record(name, rdataset, rdata))
+
+        if self.zone is not None and len(self.records) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.zone is None or not self.records:
+            return
+
+        records = self.validate_records(self.records)
+        if not self.errors:
+            Record.objects.bulk_create(records)
+            cache_objects(
+                Record.objects.select_related("zone"),
+                [record.pk for record in records],
+            )
+            self.record_count += len(records)
+
+        self.records = []
+
+    def validate_records(self, records):
+        validator = get_validator()
+        errors = {}
+
+        for position, record in enumerate(records):
+            record.zone = self.zone
+
+            try:
+                record.validate_name(validate_hostname=False)
+            except ValidationError as exc:
+                errors[position] = exc
+
+        for position, exc in validator.validate_many(
+            [(record.name, record.type) for record in records],
+            validator.validate_record_name,
+        ).items():
+            errors.setdefault(position, exc)
+
+        ptr_records = [
+            position for position, record in enumerate(records) if record.is_ptr_record
+        ]
+        for position, exc in validator.validate_many(
+            [records[position].value for position in ptr_records],
+            validator.validate_fqdn,
+        ).items():
+            errors.setdefault(ptr_records[position], exc)
+
+        for position, message in check_conflicts(records).items():
+            errors.setdefault(position, ValidationError(message))
+
+        valid_records = []
+        for position, record in enumerate(records):
+            if position in errors:
+                self.errors.append(
+                    f"{record.name} {record.type}: {errors[position].messages[0]}"
+                )
+                continue
+
+            if record.is_address_record:
+                record.ip_address = record.value
+            elif record.is_ptr_record:
+                prefix = arpa_to_prefix(record.fqdn)
+                record.ip_address = prefix.ip if prefix is not None else None
+
+            valid_records.append(record)
+
+        return valid_records
+
+    def create_zone(self, ttl, soa):
+        if self.zone is not None:
+            raise ValidationError("More than one SOA record found in zone file")
+
+        zone_name = self.origin.to_text(omit_final_dot=True)
+        if Zone.objects.filter(view=self.view, name=zone_name).exists():
+            raise ValidationError(f"Zone {zone_name} already exists")
+
+        default_ttl = (
+            self.reader.default_ttl if self.reader.default_ttl_known else soa.minimum
+        )
+
+        self.zone = Zone(
+            name=zone_name,
+            view=self.view,
+            default_ttl=default_ttl,
+            soa_ttl=ttl,
+            soa_mname=self.get_nameserver(soa.mname),
+            soa_rname=soa.rname.derelativize(self.origin).to_text(omit_final_dot=True),
+            soa_serial=soa.serial,
+            soa_serial_auto=get_plugin_config("netbox_dns", "zone_soa_serial_auto"),
+            soa_refresh=soa.refresh,
+            soa_retry=soa.retry,
+            soa_expire=soa.expire,
+            soa_minimum=soa.minimum,
+        )
+        self.zone.save()
+
+    def create_record(self, name, rdataset, rdata):
+        return Record(
+            name=name.to_text(),
+            type=rdatatype.to_text(rdataset.rdtype),
+            value=rdata.to_text(origin=self.origin, relativize=False),
+            canonical_value=rdata.to_digestable(self.origin),
+            ttl=rdataset.ttl,
+        )
+
+    def get_nameserver(self, name):
+        nameserver_name = name.derelativize(self.origin).to_text(omit_final_dot=True)
+
+        try:
+            return NameServer.objects.get(name=nameserver_name)
+        except NameServer.DoesNotExist:
+            return NameServer.objects.create(name=nameserver_name)
+
+
+class ZoneFileExporter:
+    """
+    Export the active records of a zone as RRsets in canonical order, with
+    the SOA RRset first. The RRsets are built from the canonical wire format
+    of the record values, so no values need to be parsed from text. With a
+    ZoneSigner, the zone is signed before it is written. With a user, only
+    the records the user is permitted to view are exported.
+    """
+
+    def __init__(self, zone, signer=None, user=None):
+        self.zone = zone
+        self.origin = dns_name.from_text(zone.name)
+        self.signer = signer
+        self.user = user
+
+    def get_records(self):
+        records = Record.objects.all()
+        if self.user is not None:
+            records = records.restrict(self.user, "view")
+
+        return (
+            records.filter(zone=self.zone, active=True)
+            .select_related("zone")
+            .only("name", "type", "value", "canonical_value", "ttl", "zone__name")
+        )
+
+    def get_rdata(self, record):
+        rdtype = rdatatype.from_text(record.type)
+
+        if record.canonical_value is None:
+            return rdtype, rdata.from_text(
+                rdataclass.IN, rdtype, record.value, origin=self.origin
+            )
+
+        wire = bytes(record.canonical_value)
+        return rdtype, rdata.from_wire(rdataclass.IN, rdtype, wire, 0, len(wire))
+
+    def get_rrsets(self):
+        rrsets = {}
+        for record in self.get_records():
+            name = dns_name.from_text(record.name, origin=self.origin)
+            rdtype, value = self.get_rdata(record)
+            ttl = record.ttl if record.ttl is not None else self.zone.default_ttl
+
+            rrset = rrsets.get((name, rdtype))
+            if rrset is None:
+                rrset = rrsets[(name, rdtype)] = dns_rrset.RRset(
+                    name, rdataclass.IN, rdtype
+                )
+            rrset.add(value, ttl)
+
+        return [
+            rrsets[key]
+            for key in sorted(
+                rrsets, key=lambda key: (key[0], key[1] != rdatatype.SOA, key[1])
+            )
+        ]
+
+    def to_text(self):
+        rrsets = self.get_rrsets()
+        if self.signer is not None:
+            rrsets = self.signer.sign(rrsets)
+
+        lines = [f"$ORIGIN {self.origin}", f"$TTL {self.zone.default_ttl}"]
+        for rrset in rrsets:
+            name = rrset.name.relativize(self.origin)
+            rdtype = rdatatype.to_text(rrset.rdtype)
+            for value in sorted(rrset, key=lambda value: value.to_digestable()):
+                lines.append(
+                    f"{name} {rrset.ttl} IN {rdtype} "
+                    f"{value.to_text(origin=self.origin, relativize=True)}"
+                )
+
+        return "\n".join(lines) + "\n"